@@ -1 +1,9 @@
-from .components import * 
\ No newline at end of file
+import importlib
+
+
+def __getattr__(name):
+    # Expose the components lazily (formerly `from .components import *`)
+    components = importlib.import_module(".components", __name__)
+    if name == "components":
+        return components
+    return getattr(components, name)
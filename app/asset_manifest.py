@@ -0,0 +1,68 @@
+"""
+Asset Manifest for the FIFA World Cup 2022 Visualization Dashboard
+
+The asset build step (scripts/build_assets.py) writes resized/WebP images and
+local copies of the external stylesheets into app/assets with content-hashed
+filenames, and records them in app/assets/build/manifest.json. This module
+reads that manifest so the app serves the local copies when they exist and
+falls back to the CDNs otherwise.
+"""
+
+import json
+import os
+import re
+
+import dash_bootstrap_components as dbc
+
+ASSETS_FOLDER = os.path.join(os.path.dirname(__file__), "assets")
+MANIFEST_PATH = os.path.join(ASSETS_FOLDER, "build", "manifest.json")
+
+# External stylesheets used when no local copy has been built
+CDN_STYLESHEETS = {
+    "bootstrap.css": dbc.themes.BOOTSTRAP,
+    "fontawesome.css": "https://use.fontawesome.com/releases/v5.15.4/css/all.css",
+}
+
+# Local stylesheet copies are linked explicitly (in CDN order), so Dash must not
+# auto-include them after custom.css
+VENDOR_CSS_IGNORE = r"\.vendor\.css$"
+
+# Content-hashed filenames (name.<10 hex chars>.ext) can be cached forever
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{10}\.")
+
+
+def load_manifest():
+    """Load the asset manifest, or an empty one if the build step has not run"""
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_path(name, manifest=None):
+    """Get the built (hashed) path of an asset relative to app/assets, if any"""
+    manifest = load_manifest() if manifest is None else manifest
+    return manifest.get(name)
+
+
+def image_srcset(stem, ext, manifest=None):
+    """Get the srcset of the built width variants of an image ("" if not built)"""
+    manifest = load_manifest() if manifest is None else manifest
+    variant = re.compile(rf"^{re.escape(stem)}-(\d+)\.{re.escape(ext)}$")
+    widths = sorted(
+        (int(match.group(1)), name)
+        for name in manifest
+        for match in [variant.match(name)] if match
+    )
+    return ", ".join(f"/assets/{asset_path(name, manifest)} {width}w" for width, name in widths)
+
+
+def stylesheets():
+    """Get the stylesheet URLs for the app, preferring locally built copies"""
+    manifest = load_manifest()
+    urls = []
+    for name, cdn_url in CDN_STYLESHEETS.items():
+        local = asset_path(name, manifest)
+        urls.append(f"/assets/{local}" if local else cdn_url)
+    return urls
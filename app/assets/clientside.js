@@ -45,6 +45,38 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
+    // ---------------------------------------------
+    // Lazy sections: open a section when it scrolls into view
+    // (layout.lazy_section renders a placeholder with a "Load section"
+    // button; clicking it mounts the real content)
+    // ---------------------------------------------
+    const lazyObserver = ('IntersectionObserver' in window) ? new IntersectionObserver((entries, observer) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                const trigger = entry.target.querySelector('.lazy-section-trigger');
+                if (trigger) {
+                    trigger.click();
+                }
+            }
+        });
+    }, { rootMargin: '200px 0px' }) : null;
+
+    function observeLazySections() {
+        document.querySelectorAll('.lazy-section:not([data-lazy-observed])').forEach(section => {
+            section.setAttribute('data-lazy-observed', 'true');
+            if (lazyObserver) {
+                lazyObserver.observe(section);
+            }
+        });
+    }
+
+    // Dash renders the layout after DOMContentLoaded, so watch for placeholders
+    if (lazyObserver) {
+        new MutationObserver(observeLazySections).observe(document.body, { childList: true, subtree: true });
+        observeLazySections();
+    }
+    
     // Add smooth hover effects to graphs
     const graphContainers = document.querySelectorAll('.dash-graph');
     graphContainers.forEach(container => {
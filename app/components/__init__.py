@@ -1,4 +1,21 @@
-from . import x_axis_dropdown, y_axis_dropdown, filter, search_bar, scatter_plot
-from . import pcp, teams_dropdown, pcp_explanation, stats_summary
-from . import player_radar_task2, team_radar_task2
-from . import ids 
\ No newline at end of file
+"""
+Dashboard components. Submodules are imported lazily on first attribute access
+(PEP 562), so importing the package does not import every component.
+"""
+
+import importlib
+
+_SUBMODULES = (
+    "x_axis_dropdown", "y_axis_dropdown", "filter", "search_bar", "scatter_plot",
+    "pcp", "teams_dropdown", "pcp_explanation", "stats_summary", "timeline_slider",
+    "player_radar_task2", "team_radar_task2", "goalkeeper_radar", "team_similarity_view",
+    "correlation_view", "style_map_view", "ids",
+)
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+"""
+Bootstrap Confidence Bands for FIFA Visual Analysis
+
+Radar scores are point estimates, however few minutes a player played. This
+module resamples the metrics behind a score definition and reports a
+confidence interval per radar dimension.
+
+Each count and per-90 metric is treated as a Poisson rate per 90 minutes
+over the playing time (`minutes_90s`), with a Gamma prior at the pooled rate
+of all rows worth PRIOR_90S matches: the rate is redrawn from its Gamma
+posterior, so players with little (or no) playing time get the widest
+bands. Replicates move the observed value by the draw's deviation from the
+posterior mean, with count metrics scaled by the median playing time so
+their spread follows how well the rate is known, not the size of the total.
+Percentages, averages and ages are kept fixed, since their attempt counts
+are not in the data. Every replicate is normalized with the bounds
+of the real data and scored like scoring.category_scores, with all
+replicates computed as one (resamples x rows x metrics) array per chunk.
+
+Bands are returned as offsets from the bootstrap point estimate, so they can
+be drawn around scores read from the score CSVs. They are cached per score
+definition and dataset version.
+"""
+
+import os
+import warnings
+
+import numpy as np
+
+from . import figure_cache
+from . import scoring
+
+BOOTSTRAP_RESAMPLES = int(os.environ.get("FIFA_BOOTSTRAP_RESAMPLES", 200))
+BOOTSTRAP_SEED = 0
+RESAMPLE_CHUNK = 50  # Replicates drawn per array batch (bounds memory)
+CONFIDENCE = 0.9
+PRIOR_90S = 1.0  # Weight of the pooled rate prior, in 90-minute units
+
+# Playing time behind each score kind: (metric, divisor giving 90-minute units)
+EXPOSURE_METRICS = {
+    "team": ("minutes_90s", 1.0),
+    "player": ("minutes_90s", 1.0),
+    "player_position": ("minutes_90s", 1.0),
+    "goalkeeper": ("gk_minutes", 90.0),
+}
+
+# Metrics that are not counts over the playing time
+FIXED_METRICS = {'age', 'avg_age', 'possession', 'minutes_90s', 'gk_minutes'}
+
+
+def metric_types(metrics):
+    """Get boolean (rates, counts) masks over metric names; the rest are kept fixed"""
+    fixed = np.array([m in FIXED_METRICS or 'pct' in m or 'avg' in m for m in metrics], dtype=bool)
+    rates = np.array([m.endswith('_per90') for m in metrics], dtype=bool) & ~fixed
+    return rates, ~rates & ~fixed
+
+
+def resample_values(values, exposure, metrics, resamples, rng):
+    """Draw a (resamples, rows, metrics) array of Gamma-Poisson bootstrap replicates of a metric matrix"""
+    rates, counts = metric_types(metrics)
+    exposure = np.clip(np.nan_to_num(exposure), 0, None)
+    # Count deviations are taken at the typical playing time
+    played = exposure[exposure > 0]
+    reference = float(np.median(played)) if played.size else 1.0
+    exposure = exposure[:, None]
+
+    # Signed totals (e.g. xG net) resample their magnitude
+    totals = np.abs(np.where(rates, values * exposure, values))
+    known = ~np.isnan(totals)
+    totals = np.nan_to_num(totals)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pooled = np.nan_to_num(totals.sum(axis=0) / np.where(known, exposure, 0).sum(axis=0))
+
+    # Gamma posterior of the rate per 90 minutes
+    shape = PRIOR_90S * pooled + totals
+    rate = PRIOR_90S + exposure
+    draws = rng.gamma(shape, 1 / rate, size=(resamples,) + values.shape)
+    deviation = (draws - shape / rate) * np.where(rates, 1.0, reference)
+    replicates = values + np.where(values < 0, -1.0, 1.0) * deviation
+
+    resampled = (rates | counts) & known
+    return np.where(resampled, replicates, values)
+
+
+def _normalize(values, mins, spans):
+    """Min-max normalize with fixed bounds, clipped to [0, 1] and keeping NaNs"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normalized = np.where(spans > 0, np.clip((values - mins) / spans, 0, 1), 0.5)
+    return np.where(np.isnan(values), np.nan, normalized)
+
+
+@figure_cache.per_version(maxsize=32)
+def _band_offsets(kind, weights, resamples):
+    keys, metrics, values, groups = scoring.metric_pool(kind)
+    used = list(dict.fromkeys(metric for _, members in weights for metric, _ in members))
+    subset = values[:, [metrics.index(metric) for metric in used]]
+    mins, spans = scoring.normalization_bounds(subset, groups)
+    weight_matrix = scoring.weight_matrix(weights, used)
+
+    exposure_metric, divisor = EXPOSURE_METRICS[kind]
+    exposure = values[:, metrics.index(exposure_metric)] / divisor
+
+    point = scoring.category_scores(_normalize(subset, mins, spans), weight_matrix)
+    rng = np.random.default_rng(BOOTSTRAP_SEED)
+    replicates = []
+    for start in range(0, resamples, RESAMPLE_CHUNK):
+        sampled = resample_values(subset, exposure, used, min(RESAMPLE_CHUNK, resamples - start), rng)
+        replicates.append(scoring.category_scores(_normalize(sampled, mins, spans), weight_matrix))
+
+    alpha = (1 - CONFIDENCE) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # rows without any data
+        lower, upper = np.nanquantile(np.concatenate(replicates), [alpha, 1 - alpha], axis=0)
+
+    # Rows are keyed by (key, team); a team's key is the team itself
+    key_column = 'team' if kind == "team" else 'player'
+    pairs = zip(keys[key_column].astype(str), keys['team'].astype(str))
+    return {pair: (lower[i] - point[i], upper[i] - point[i]) for i, pair in enumerate(pairs)}
+
+
+def band_offsets(kind, weights, resamples=BOOTSTRAP_RESAMPLES):
+    """Get {(key, team): (lower, upper)} confidence band offsets over the score dimensions
+
+    `weights` is a weights tuple (see scoring.parse_weights); the offsets
+    follow its category order. The mapping is shared and must not be modified.
+    """
+    return _band_offsets(kind, weights, resamples)
@@ -0,0 +1,143 @@
+"""
+Metric Correlation View Component
+
+This component shows the precomputed Pearson or Spearman correlations of the
+team metrics as a heatmap, with the metrics in the same correlation order
+the PCP can use, and lists the most strongly related pairs.
+"""
+
+from dash import Dash, dcc, html, Input, Output
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+
+from . import ids
+from . import correlations
+from . import data_utils
+from . import figure_cache
+from . import single_flight
+
+# Metrics offered in the dropdown (every metric with a friendly label)
+CORRELATION_METRICS = list(data_utils.get_attribute_labels())
+
+
+def render(app: Dash) -> html.Div:
+    """Create the metric correlation heatmap component"""
+    labels = data_utils.get_attribute_labels()
+
+    layout = html.Div([
+        html.H4("Metric Correlations", className="text-center mb-3"),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Metrics:", className="fw-bold mb-1"),
+                dcc.Dropdown(
+                    id=ids.CORRELATION_METRICS,
+                    options=[{'label': labels.get(m, m), 'value': m} for m in CORRELATION_METRICS],
+                    value=data_utils.get_pcp_attributes(),
+                    multi=True,
+                    style={'font-size': '14px'}
+                ),
+                dbc.Switch(
+                    id=ids.CORRELATION_ALL_METRICS,
+                    label="Use every numeric team metric",
+                    value=False,
+                    className="small mt-1"
+                )
+            ], md=8),
+            dbc.Col([
+                html.Label("Method:", className="fw-bold mb-1"),
+                dcc.RadioItems(
+                    id=ids.CORRELATION_METHOD,
+                    options=[{'label': label, 'value': method} for method, label in correlations.METHODS.items()],
+                    value="pearson",
+                    inline=True,
+                    inputClassName="me-1",
+                    labelClassName="me-3"
+                )
+            ], md=4),
+        ], className="mb-2 px-2"),
+        html.Div(id=ids.CORRELATION_PAIRS, className="small text-muted px-2 mb-2"),
+        dbc.Spinner(
+            dcc.Graph(
+                id=ids.CORRELATION_CHART,
+                config={'displayModeBar': True},
+                className="border rounded"
+            ),
+            color="primary",
+            type="grow",
+            size="sm"
+        )
+    ])
+
+    def selected_metrics(metrics, use_all, method):
+        """Get the metrics to show, in correlation order"""
+        if use_all:
+            metrics = list(correlations.get_correlations(method).index)
+        return correlations.axis_order(metrics or [], method)
+
+    @app.callback(
+        Output(ids.CORRELATION_CHART, 'figure'),
+        [
+            Input(ids.CORRELATION_METRICS, 'value'),
+            Input(ids.CORRELATION_ALL_METRICS, 'value'),
+            Input(ids.CORRELATION_METHOD, 'value')
+        ]
+    )
+    @single_flight.single_flight("correlations")
+    @figure_cache.cached("correlations")
+    def update_correlation_chart(metrics, use_all, method):
+        ordered = selected_metrics(metrics, use_all, method)
+        known, matrix = correlations.correlation_submatrix(ordered, method)
+        if len(known) < 2:
+            fig = go.Figure()
+            fig.update_layout(
+                title="Select at least two metrics to compare",
+                title_x=0.5,
+                paper_bgcolor='rgba(250, 250, 250, 0.9)',
+                height=500
+            )
+            return fig
+
+        names = [labels.get(m, m) for m in known]
+        positions = list(range(len(known)))
+        fig = go.Figure(go.Heatmap(
+            x=positions, y=positions,
+            z=matrix.round(3),
+            text=[[f"{names[r]} vs {names[c]}<br>r = {matrix[r, c]:.2f}" for c in positions] for r in positions],
+            hoverinfo='text',
+            colorscale='RdBu',
+            zmin=-1, zmax=1,
+            colorbar=dict(title="r")
+        ))
+
+        # Tick labels get unreadable for the full metric set
+        tick_font = dict(size=10 if len(known) <= 40 else 6)
+        fig.update_xaxes(tickvals=positions, ticktext=names, tickangle=-60, tickfont=tick_font)
+        fig.update_yaxes(tickvals=positions, ticktext=names, autorange='reversed', tickfont=tick_font)
+        fig.update_layout(
+            title=f"{correlations.METHODS[method]} Correlation of Team Metrics",
+            title_x=0.5,
+            title_font=dict(size=15),
+            margin=dict(t=50, l=160, r=40, b=160),
+            height=750,
+            paper_bgcolor='rgba(250, 250, 250, 0.9)',
+            plot_bgcolor='rgba(255, 255, 255, 1)'
+        )
+        return fig
+
+    @app.callback(
+        Output(ids.CORRELATION_PAIRS, 'children'),
+        [
+            Input(ids.CORRELATION_METRICS, 'value'),
+            Input(ids.CORRELATION_ALL_METRICS, 'value'),
+            Input(ids.CORRELATION_METHOD, 'value')
+        ]
+    )
+    def update_strongest_pairs(metrics, use_all, method):
+        pairs = correlations.strongest_pairs(selected_metrics(metrics, use_all, method), method)
+        if not pairs:
+            return "Select at least two metrics to list their strongest relationships"
+        return "Strongest relationships: " + "; ".join(
+            f"{labels.get(a, a)} / {labels.get(b, b)} ({r:+.2f})" for a, b, r in pairs
+        )
+
+    return layout
@@ -0,0 +1,129 @@
+"""
+Metric Correlations for FIFA Visual Analysis
+
+This module precomputes the Pearson and Spearman correlation matrices of
+every numeric team metric (about 190 columns) once per dataset version, so
+views only slice them.
+
+It also orders PCP axes so that adjacent axes are as strongly related as
+possible: the order is the Hamiltonian path maximizing the summed |r| of
+adjacent pairs, solved exactly with the Held-Karp dynamic program for up to
+MAX_EXACT_AXES axes (O(2^n n^2), vectorized over the previous axis) and
+greedily beyond. Orders are cached per metric subset, method and dataset
+version.
+"""
+
+import numpy as np
+
+from . import data_utils
+from . import figure_cache
+
+METHODS = {"pearson": "Pearson", "spearman": "Spearman"}
+
+# Held-Karp is exact but exponential; larger subsets use a greedy path
+MAX_EXACT_AXES = 14
+
+
+@figure_cache.per_version()
+def _correlations():
+    frame = data_utils.get_dataset("team_data").drop(columns=["stage"], errors="ignore")
+    numeric = frame.select_dtypes(include="number")
+    # Constant columns have no defined correlation
+    numeric = numeric.loc[:, numeric.nunique() > 1]
+    return {
+        "pearson": numeric.corr(method="pearson"),
+        # Spearman = Pearson over the ranks (average ranks for ties)
+        "spearman": numeric.rank().corr(method="pearson"),
+    }
+
+
+def get_correlations(method="pearson"):
+    """Get the metrics x metrics correlation frame of a method (shared, read-only)"""
+    return _correlations()[method]
+
+
+def correlation_submatrix(metrics, method="pearson"):
+    """Get the correlation matrix of a metric subset, in the given order (unknown metrics skipped)"""
+    correlations = get_correlations(method)
+    known = [m for m in metrics if m in correlations.index]
+    return known, correlations.loc[known, known].to_numpy()
+
+
+def best_path(weights):
+    """Get the order of the rows visiting each once that maximizes the summed adjacent weights"""
+    n = len(weights)
+    if n <= 2:
+        return list(range(n))
+    if n > MAX_EXACT_AXES:
+        return _greedy_path(weights)
+
+    # best[mask, j] = best weight of a path over the axes in mask ending at j
+    best = np.full((1 << n, n), -np.inf)
+    parent = np.full((1 << n, n), -1, dtype=int)
+    for j in range(n):
+        best[1 << j, j] = 0.0
+
+    for mask in range(1, 1 << n):
+        ends = [j for j in range(n) if mask >> j & 1]
+        if len(ends) < 2:
+            continue
+        for j in ends:
+            previous = mask ^ (1 << j)
+            candidates = best[previous] + weights[:, j]
+            i = int(np.argmax(candidates))
+            best[mask, j] = candidates[i]
+            parent[mask, j] = i
+
+    # Walk back from the best end of the full path
+    mask = (1 << n) - 1
+    j = int(np.argmax(best[mask]))
+    order = []
+    while j >= 0:
+        order.append(j)
+        mask, j = mask ^ (1 << j), parent[mask, j]
+    return order[::-1]
+
+
+def _greedy_path(weights):
+    """Extend a path from the strongest pair with the strongest remaining neighbor of either end"""
+    n = len(weights)
+    masked = weights.astype(float).copy()
+    np.fill_diagonal(masked, -np.inf)
+    i, j = np.unravel_index(np.argmax(masked), masked.shape)
+    order = [int(i), int(j)]
+    remaining = set(range(n)) - set(order)
+    while remaining:
+        rest = sorted(remaining)
+        head = masked[order[0], rest]
+        tail = masked[order[-1], rest]
+        if head.max() > tail.max():
+            pick = rest[int(np.argmax(head))]
+            order.insert(0, pick)
+        else:
+            pick = rest[int(np.argmax(tail))]
+            order.append(pick)
+        remaining.discard(pick)
+    return order
+
+
+@figure_cache.per_version(maxsize=64)
+def _axis_order(metrics, method):
+    known, matrix = correlation_submatrix(metrics, method)
+    weights = np.nan_to_num(np.abs(matrix))
+    order = [known[i] for i in best_path(weights)]
+    # Metrics without correlations keep their place at the end
+    return tuple(order + [m for m in metrics if m not in known])
+
+
+def axis_order(metrics, method="pearson"):
+    """Order metrics so adjacent ones are maximally correlated or anti-correlated"""
+    return list(_axis_order(tuple(metrics), method))
+
+
+def strongest_pairs(metrics, method="pearson", limit=5):
+    """Get the (metric, metric, r) pairs of a subset with the largest |r|"""
+    known, matrix = correlation_submatrix(metrics, method)
+    rows, cols = np.triu_indices(len(known), k=1)
+    values = matrix[rows, cols]
+    top = np.argsort(-np.nan_to_num(np.abs(values)), kind="stable")[:limit]
+    return [(known[rows[k]], known[cols[k]], float(values[k])) for k in top if not np.isnan(values[k])]
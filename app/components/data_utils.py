@@ -2,12 +2,18 @@
 Data Utilities for FIFA Visual Analysis
 
 This module provides utility functions for loading and processing data.
+Datasets are loaded on first use through a shared store (`get_dataset`), so
+importing the components and registering their callbacks does not read any
+CSV file.
 """
 
 import pandas as pd
 import numpy as np
 import os
 import colorsys
+import threading
+
+from . import figure_cache
 
 # Define the data path relative to the app root
 DATA_PATH = os.path.join('data', 'cleaned')  # Path to the cleaned data folder
@@ -185,6 +191,130 @@ def load_match_data():
         print(f"Error loading match data: {e}")
         return None
         
+def load_team_scores():
+    """
+    Load team radar scores from CSV file
+    """
+    try:
+        file_path = os.path.join(DATA_PATH, "team_performance_scores.csv")
+        return pd.read_csv(file_path)
+    except Exception as e:
+        print(f"Error loading team scores: {e}")
+        return None
+
+# Team names spelled differently in some source files -> name used everywhere else
+TEAM_NAME_ALIASES = {
+    'IR Iran': 'Iran',
+}
+
+def load_player_scores():
+    """
+    Load player radar scores from CSV file
+    """
+    try:
+        file_path = os.path.join(DATA_PATH, "player_performance_scores.csv")
+        df = pd.read_csv(file_path)
+        df['team'] = df['team'].replace(TEAM_NAME_ALIASES)
+        return df
+    except Exception as e:
+        print(f"Error loading player scores: {e}")
+        return None
+
+# -----------------------------------------------------------------------------
+# Tournament stage reached by each team. The stage values correspond to the
+# dropdown in `filter.py`:
+#   1 = Group Stage (all teams)
+#   2 = Round of 16
+#   3 = Quarter Finals
+#   4 = Semi Finals
+#   5 = Third Place
+#   6 = Finals
+# We derive the stage reached for each team based on the number of games played
+# (and a small manual mapping for the last four teams that all played 7 games).
+# -----------------------------------------------------------------------------
+FINALS_TEAMS = {"Argentina", "France"}
+THIRD_PLACE_TEAMS = {"Croatia", "Morocco"}
+
+def add_stage(df):
+    """
+    Add the tournament stage column if it is missing
+    """
+    if "stage" in df.columns:
+        return df
+    games = df["games"].astype(int)
+    df["stage"] = np.select(
+        [
+            df["team"].isin(FINALS_TEAMS),       # Finals (Champion / Runner-up)
+            df["team"].isin(THIRD_PLACE_TEAMS),  # Third-place match contestants
+            games >= 6,                          # Safety fallback - should not happen for 2022 data
+            games == 5,                          # Quarter Finals
+            games == 4,                          # Round of 16
+        ],
+        [6, 5, 4, 3, 2],
+        default=1                                # Eliminated in the group stage
+    )
+    return df
+
+def _load_team_data_with_stage():
+    df = load_team_data()
+    return add_stage(df) if df is not None else None
+
+# Shared dataset store: name -> loader. Datasets are read on first use and
+# shared by every component; they are read again when the cleaned CSV files
+# change (see figure_cache.dataset_hash). Callers must treat them as read-only.
+DATASET_LOADERS = {
+    "team_data": _load_team_data_with_stage,
+    "team_scores": load_team_scores,
+    "player_data": load_player_data,
+    "player_scores": load_player_scores,
+    "match_data": load_match_data,
+}
+_datasets = {}
+_datasets_version = {"version": None}
+_datasets_lock = threading.Lock()
+
+def get_dataset(name):
+    """
+    Get a shared dataset, loading it on first use (and again after the CSVs change)
+    """
+    version = figure_cache.dataset_hash()
+    if _datasets_version["version"] != version:
+        with _datasets_lock:
+            if _datasets_version["version"] != version:
+                _datasets.clear()
+                _datasets_version["version"] = version
+    dataset = _datasets.get(name)
+    if dataset is None:
+        with _datasets_lock:
+            dataset = _datasets.get(name)
+            if dataset is None:
+                dataset = DATASET_LOADERS[name]()
+                if dataset is not None:
+                    _datasets[name] = dataset
+    return dataset
+
+def preload_datasets():
+    """
+    Load every dataset up front (e.g. before gunicorn forks its workers)
+    """
+    for name in DATASET_LOADERS:
+        get_dataset(name)
+
+def loaded_datasets():
+    """
+    Get the names of the datasets loaded so far
+    """
+    return sorted(_datasets)
+
+def get_team_names():
+    """
+    Get the sorted list of team names
+    """
+    df = get_dataset("team_data")
+    if df is None:
+        return []
+    return sorted(df["team"].unique().tolist())
+
 def get_attribute_range(df, attribute):
     """
     Get the min and max values for an attribute
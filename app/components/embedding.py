@@ -0,0 +1,205 @@
+"""
+Style Map Projection for FIFA Visual Analysis
+
+This module places every player and every team on a 2-D "style map": the
+first two principal components of their standardized per-90 metrics.
+
+A projection is fitted once with NumPy's SVD and persisted as an .npz file
+in the cache directory (FIFA_CACHE_DIR), so restarted or additional workers
+load it instead of refitting. It is kept across dataset versions: new or
+changed rows are projected with the stored mean/std/components, so the map
+axes stay put. Refit explicitly with `python -m app.components.embedding
+--refit` (or `refit()`); a projection is only refitted on its own when the
+feature columns change.
+
+Players are fitted on those with at least FIT_MIN_MINUTES_90S full
+matches; everyone else is projected onto the fitted map. Players with less
+than one full match get their rates over one match, and players without any
+minutes sit at the mean.
+"""
+
+import argparse
+import functools
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import data_utils
+from . import figure_cache
+from . import similarity
+
+KINDS = {"player": "Players", "team": "Teams"}
+
+# Players with fewer full matches are projected onto the fitted map, not fitted
+FIT_MIN_MINUTES_90S = 3.0
+
+COMPONENTS = 2
+
+_save_lock = threading.Lock()
+
+
+class Projection:
+    """Standardization and principal axes of a feature matrix"""
+
+    def __init__(self, features, mean, std, components, explained):
+        self.features = list(features)
+        self.mean = mean
+        self.std = std
+        self.components = components  # (COMPONENTS, features)
+        self.explained = explained  # Share of the variance per component
+
+    @classmethod
+    def fit(cls, features, values):
+        """Fit the principal axes of a (rows x features) matrix"""
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[~(std > 0)] = 1.0  # constant columns carry no information
+        standardized = np.nan_to_num((values - mean) / std)
+
+        _, singular, vt = np.linalg.svd(standardized, full_matrices=False)
+        components = vt[:COMPONENTS]
+        # Fix the SVD sign ambiguity: the largest loading of each axis is positive
+        signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+        components = components * signs[:, None]
+        variance = singular ** 2
+        explained = variance[:COMPONENTS] / variance.sum() if variance.sum() > 0 else np.zeros(COMPONENTS)
+        return cls(features, mean, std, components, explained)
+
+    def transform(self, values):
+        """Project rows (in feature order) onto the fitted axes; missing values sit at the mean"""
+        return np.nan_to_num((values - self.mean) / self.std) @ self.components.T
+
+    def top_loadings(self, axis, limit=3):
+        """Get the features weighing most on an axis, as (feature, loading) pairs"""
+        loadings = self.components[axis]
+        top = np.argsort(-np.abs(loadings), kind="stable")[:limit]
+        return [(self.features[i], float(loadings[i])) for i in top]
+
+    def save(self, path):
+        """Persist the projection as an .npz file (written atomically)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(
+            temp_path,
+            features=np.array(self.features),
+            mean=self.mean, std=self.std,
+            components=self.components, explained=self.explained
+        )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a projection saved with `save`"""
+        with np.load(path) as data:
+            return cls(data["features"].tolist(), data["mean"], data["std"], data["components"], data["explained"])
+
+
+def player_frame():
+    """Get every player with per-90 rates (position and minutes included)"""
+    return similarity.load_player_profiles(minutes_floor=similarity.MIN_MINUTES_90S).reset_index(drop=True)
+
+
+def team_frame():
+    """Get the teams with their per-90 metrics"""
+    return data_utils.get_dataset("team_data")
+
+
+def feature_columns(kind, frame):
+    """Get the per-90 feature columns of a kind"""
+    if kind == "player":
+        return list(similarity.PER90_METRICS)
+    return [c for c in frame.columns if c.endswith('_per90') and pd.api.types.is_numeric_dtype(frame[c])]
+
+
+def projection_path(kind):
+    """Get the path of the persisted projection of a kind"""
+    return os.path.join(figure_cache.CACHE_DIR, f"projection-{kind}.npz")
+
+
+def fit_projection(kind):
+    """Fit the projection of a kind on the current data and persist it"""
+    frame = player_frame() if kind == "player" else team_frame()
+    features = feature_columns(kind, frame)
+    fit_rows = frame
+    if kind == "player":
+        fit_rows = frame[frame['minutes_90s'] >= FIT_MIN_MINUTES_90S]
+    projection = Projection.fit(features, fit_rows[features].to_numpy(dtype=float))
+    path = projection_path(kind)
+    try:
+        with _save_lock:
+            projection.save(path)
+    except OSError as e:
+        print(f"Error saving projection {path}: {e}")
+    return projection
+
+
+@functools.lru_cache(maxsize=None)
+def get_projection(kind):
+    """Get the persisted projection of "player" or "team", fitting it if there is none
+
+    The projection is kept across dataset versions (see `refit`).
+    """
+    path = projection_path(kind)
+    if os.path.exists(path):
+        try:
+            projection = Projection.load(path)
+            frame = player_frame() if kind == "player" else team_frame()
+            if projection.features == feature_columns(kind, frame):
+                return projection
+        except Exception as e:
+            print(f"Error loading projection {path}: {e}")
+    return fit_projection(kind)
+
+
+def refit(kinds=KINDS):
+    """Refit and persist the projections of the given kinds on the current data
+
+    Other running workers keep the projection they loaded until restarted.
+    """
+    for kind in kinds:
+        fit_projection(kind)
+    get_projection.cache_clear()
+    get_coordinates.cache_clear()
+    # Cached style map figures were drawn on the old axes
+    figure_cache.clear()
+
+
+def project(kind, frame):
+    """Project rows of a frame holding the kind's features onto its fitted map (no refit)"""
+    projection = get_projection(kind)
+    values = frame.reindex(columns=projection.features).to_numpy(dtype=float)
+    return projection.transform(values)
+
+
+@figure_cache.per_version(maxsize=4)
+def get_coordinates(kind):
+    """Get the style map coordinates of every player or team (shared, read-only)"""
+    frame = player_frame() if kind == "player" else team_frame()
+    coordinates = project(kind, frame)
+    columns = ['player', 'team', 'position', 'minutes_90s'] if kind == "player" else ['team', 'stage']
+    result = frame[[c for c in columns if c in frame.columns]].reset_index(drop=True).copy()
+    result['x'] = coordinates[:, 0]
+    result['y'] = coordinates[:, 1]
+    if kind == "player":
+        result['fitted'] = (result['minutes_90s'] >= FIT_MIN_MINUTES_90S).to_numpy()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the style map projections and persist them in FIFA_CACHE_DIR")
+    parser.add_argument("--kind", choices=list(KINDS) + ["all"], default="all")
+    parser.add_argument("--refit", action="store_true", help="refit even when a persisted projection exists")
+    args = parser.parse_args(argv)
+
+    kinds = list(KINDS) if args.kind == "all" else [args.kind]
+    if args.refit:
+        refit(kinds)
+    for kind in kinds:
+        get_projection(kind)
+        print(f"Projection of {kind} at {projection_path(kind)}")
+
+
+if __name__ == "__main__":
+    main()
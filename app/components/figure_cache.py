@@ -0,0 +1,200 @@
+"""
+Figure Cache for FIFA Visual Analysis
+
+This module provides a disk-backed cache for serialized callback outputs.
+The cache lives in a SQLite file under a configurable directory so that every
+gunicorn worker reads and writes the same entries: a figure built by one
+worker is served by all others.
+
+Entries are keyed on a content hash of the cleaned datasets plus the
+canonicalized callback inputs, so regenerating the CSV files invalidates the
+cache automatically. The total size is bounded and the least recently used
+entries are evicted first.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Define the data path relative to the app root
+DATA_PATH = os.path.join('data', 'cleaned')  # Path to the cleaned data folder
+
+# Cache configuration (overridable through environment variables)
+CACHE_DIR = os.environ.get("FIFA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "fifa-vis-cache"))
+CACHE_MAX_BYTES = int(os.environ.get("FIFA_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 256 MB
+CACHE_ENABLED = os.environ.get("FIFA_FIGURE_CACHE", "1") != "0"
+
+_local = threading.local()
+_dataset_hash = {"stamp": None, "digest": None}
+_dataset_lock = threading.Lock()
+
+
+def dataset_hash():
+    """Get a content hash of all cleaned CSV files (recomputed only when a file changes)"""
+    try:
+        files = sorted(f for f in os.listdir(DATA_PATH) if f.endswith(".csv"))
+        stamp = tuple(
+            (f, os.stat(os.path.join(DATA_PATH, f)).st_size, os.stat(os.path.join(DATA_PATH, f)).st_mtime_ns)
+            for f in files
+        )
+    except OSError as e:
+        print(f"Error reading data folder for cache key: {e}")
+        return "no-data"
+
+    with _dataset_lock:
+        if _dataset_hash["stamp"] != stamp:
+            digest = hashlib.sha256()
+            for f in files:
+                digest.update(f.encode("utf-8"))
+                with open(os.path.join(DATA_PATH, f), "rb") as fh:
+                    for chunk in iter(lambda: fh.read(1 << 20), b""):
+                        digest.update(chunk)
+            _dataset_hash["stamp"] = stamp
+            _dataset_hash["digest"] = digest.hexdigest()[:16]
+        return _dataset_hash["digest"]
+
+
+def per_version(maxsize=2):
+    """Memoize a function per dataset version (see dataset_hash)
+
+    Results are cached on the positional arguments plus the dataset hash, so
+    they are rebuilt when the cleaned CSV files change. Arguments must be
+    hashable; results are shared between callers and must not be modified.
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=maxsize)
+        def compute(version, *args):
+            return func(*args)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            return compute(dataset_hash(), *args)
+
+        wrapper.cache_clear = compute.cache_clear
+        return wrapper
+    return decorator
+
+
+def canonical_inputs(args, kwargs=None):
+    """Serialize callback inputs into a stable JSON string
+
+    Dictionaries are key-sorted; list order is kept because it is meaningful
+    for most callbacks (e.g. selection order decides team colors).
+    """
+    return json.dumps([list(args), kwargs or {}], sort_keys=True, separators=(",", ":"), default=str)
+
+
+def make_key(name, args, kwargs=None):
+    """Build a cache key from a callback name, the dataset hash and its inputs"""
+    payload = f"{name}|{dataset_hash()}|{canonical_inputs(args, kwargs)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _connect():
+    """Get a SQLite connection for the current thread and process"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(CACHE_DIR, "figures.sqlite3"), timeout=5.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS entries ("
+        " key TEXT PRIMARY KEY,"
+        " value BLOB NOT NULL,"
+        " size INTEGER NOT NULL,"
+        " accessed REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+    _local.conn = conn
+    _local.pid = os.getpid()
+    return conn
+
+
+def get(key):
+    """Get a cached value (bytes) or None if it is missing"""
+    try:
+        conn = _connect()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+    except sqlite3.Error as e:
+        print(f"Error reading figure cache: {e}")
+        return None
+
+
+def put(key, value):
+    """Store a value (bytes) and evict the least recently used entries if over budget"""
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time())
+        )
+        _evict(conn)
+    except sqlite3.Error as e:
+        print(f"Error writing figure cache: {e}")
+
+
+def _evict(conn):
+    """Delete the oldest entries until the cache fits in CACHE_MAX_BYTES"""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= CACHE_MAX_BYTES:
+        return
+
+    excess = total - CACHE_MAX_BYTES
+    stale_keys = []
+    for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+        stale_keys.append((key,))
+        excess -= size
+        if excess <= 0:
+            break
+    conn.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+
+
+def clear():
+    """Remove every cached entry"""
+    try:
+        _connect().execute("DELETE FROM entries")
+    except sqlite3.Error as e:
+        print(f"Error clearing figure cache: {e}")
+
+
+def _to_json(value):
+    """Serialize a callback output (figures, components, lists) to JSON bytes"""
+    from plotly.io.json import to_json_plotly
+    return to_json_plotly(value).encode("utf-8")
+
+
+def cached(name):
+    """Decorator caching a callback's serialized output on disk
+
+    Only use it on callbacks that are pure functions of their inputs (no
+    callback_context, no module-level state). Outputs are returned as plain
+    JSON structures, which Dash accepts for every property.
+    """
+    def decorator(func):
+        if not CACHE_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(name, args, kwargs)
+            hit = get(key)
+            if hit is not None:
+                return json.loads(hit)
+
+            result = func(*args, **kwargs)
+            put(key, _to_json(result))
+            return result
+        return wrapper
+    return decorator
@@ -1,6 +1,16 @@
-from dash import Dash, html, dcc
+from dash import Dash, html, dcc, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
 from . import ids
+from . import data_utils
+from . import filter_engine
+from . import simulation
+from . import single_flight
+
+# Teams listed in the simulated stage-reach table
+SIMULATION_TOP_TEAMS = 8
+
+# Metrics offered for range filtering (the metrics with a friendly label)
+RANGE_FILTER_METRICS = list(data_utils.get_attribute_labels())
 
 def render(app: Dash) -> html.Div:
     # Define filter options with user-friendly labels
@@ -13,7 +23,93 @@ def render(app: Dash) -> html.Div:
         {"label": "Third Place", "value": 5},
         {"label": "Finals", "value": 6},
     ]
-    
+    stage_labels = {option["value"]: option["label"] for option in filter_options}
+    labels = data_utils.get_attribute_labels()
+
+    @app.callback(
+        Output(ids.FILTER_SIMULATION, "children"),
+        Input(ids.FILTER, "value")
+    )
+    @single_flight.single_flight("simulation")
+    def update_simulation(filter_val):
+        # Chance of reaching the selected stage; the title chance for "All Teams"/"Group Stage"
+        probabilities = simulation.stage_probabilities()
+        actual = set()
+        if filter_val in simulation.STAGE_COLUMNS:
+            column = simulation.STAGE_COLUMNS[filter_val]
+            heading = f"Chance of reaching the {stage_labels[filter_val]}"
+            # Teams that actually got there are shown in bold
+            team_data = data_utils.get_dataset("team_data")
+            actual = set(team_data.loc[team_data["stage"] >= filter_val, "team"])
+        else:
+            column = "champion"
+            heading = "Chance of winning the tournament"
+        top = probabilities.nlargest(SIMULATION_TOP_TEAMS, column)
+        rows = [
+            html.Tr([
+                html.Td(team, className="fw-bold" if team in actual else None),
+                html.Td(f"{value:.1%}")
+            ])
+            for team, value in zip(top["team"], top[column])
+        ]
+        return [
+            html.Div(heading, className="small fw-bold"),
+            dbc.Table([html.Tbody(rows)], bordered=False, hover=True, striped=True, size="sm", className="mb-1"),
+            html.Div(
+                f"{simulation.SIMULATION_RUNS:,} simulated tournaments from the match xG."
+                + (" Bold teams actually got there." if actual else ""),
+                className="small text-muted"
+            )
+        ]
+
+    @app.callback(
+        Output(ids.METRIC_FILTER_RANGE, "min"),
+        Output(ids.METRIC_FILTER_RANGE, "max"),
+        Output(ids.METRIC_FILTER_RANGE, "value"),
+        Output(ids.METRIC_FILTER_RANGE, "disabled"),
+        Input(ids.METRIC_FILTER_METRIC, "value")
+    )
+    def configure_range(metric):
+        # The slider spans the metric's observed range
+        matrix = filter_engine.get_metric_matrix()
+        bounds = matrix.bounds(metric) if metric in matrix.metric_index else None
+        if bounds is None:
+            return 0, 1, [0, 1], True
+        return bounds[0], bounds[1], list(bounds), False
+
+    @app.callback(
+        Output(ids.METRIC_FILTER_EXPRESSION, "value"),
+        Input(ids.METRIC_FILTER_ADD, "n_clicks"),
+        [
+            State(ids.METRIC_FILTER_METRIC, "value"),
+            State(ids.METRIC_FILTER_RANGE, "value"),
+            State(ids.METRIC_FILTER_EXPRESSION, "value")
+        ],
+        prevent_initial_call=True
+    )
+    def add_range(n_clicks, metric, value_range, expression):
+        # Append the slider range as two predicates
+        if not metric or not value_range:
+            return no_update
+        predicates = [(metric, ">=", round(value_range[0], 2)), (metric, "<=", round(value_range[1], 2))]
+        added = filter_engine.format_predicates(predicates)
+        return f"{expression} AND {added}" if expression and expression.strip() else added
+
+    @app.callback(
+        Output(ids.METRIC_FILTER_STORE, "data"),
+        Output(ids.METRIC_FILTER_FEEDBACK, "children"),
+        Input(ids.METRIC_FILTER_EXPRESSION, "value")
+    )
+    def apply_expression(expression):
+        try:
+            predicates = filter_engine.parse_expression(expression)
+        except ValueError as e:
+            return no_update, html.Span(str(e), className="text-danger")
+        if not predicates:
+            return [], ""
+        matching = len(filter_engine.filter_teams(predicates))
+        return [list(p) for p in predicates], html.Span(f"{matching} teams match", className="text-success")
+
     return html.Div([
         dbc.Label("Filter by Tournament Stage", className="fw-bold mb-1"),
         dcc.Dropdown(
@@ -23,5 +119,44 @@ def render(app: Dash) -> html.Div:
             clearable=False,
             style={"width": "100%", "font-size": "14px"},
             className="custom-dropdown"
-        )
+        ),
+        html.Details([
+            html.Summary("Filter by metric ranges", className="small fw-bold"),
+            dbc.Row([
+                dbc.Col(
+                    dcc.Dropdown(
+                        id=ids.METRIC_FILTER_METRIC,
+                        options=[{"label": labels.get(m, m), "value": m} for m in RANGE_FILTER_METRICS],
+                        value=RANGE_FILTER_METRICS[0],
+                        clearable=False,
+                        style={"font-size": "13px"}
+                    ),
+                    width=9
+                ),
+                dbc.Col(
+                    dbc.Button("Add", id=ids.METRIC_FILTER_ADD, color="primary", size="sm"),
+                    width=3
+                ),
+            ], className="g-1 mt-1 align-items-center"),
+            dcc.RangeSlider(
+                id=ids.METRIC_FILTER_RANGE,
+                min=0, max=1, value=[0, 1],
+                marks=None,
+                tooltip={"placement": "bottom"},
+                className="mt-2"
+            ),
+            dcc.Input(
+                id=ids.METRIC_FILTER_EXPRESSION,
+                type="text",
+                debounce=True,
+                placeholder="e.g. possession > 55 AND gk_save_pct < 70",
+                style={"width": "100%", "font-size": "13px", "font-family": "monospace"}
+            ),
+            html.Div(id=ids.METRIC_FILTER_FEEDBACK, className="small"),
+            dcc.Store(id=ids.METRIC_FILTER_STORE, data=[])
+        ], className="mt-2"),
+        html.Details([
+            html.Summary("Simulated stage-reach probabilities", className="small fw-bold"),
+            dbc.Spinner(html.Div(id=ids.FILTER_SIMULATION), color="primary", type="grow", size="sm")
+        ], className="mt-2")
     ])
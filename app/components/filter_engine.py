@@ -0,0 +1,111 @@
+"""
+Metric Filter Engine for FIFA Visual Analysis
+
+This module filters teams on metric range predicates such as
+`possession > 55 AND gk_save_pct < 70`. The numeric team metrics are kept
+as one float matrix per dataset version, with a sorted index per column
+(argsort order plus sorted values), so every predicate is a range query:
+two binary searches and a slice of row IDs scattered into a boolean mask.
+Predicates combine with AND as `&` over those masks.
+
+Predicates are (metric, operator, value) tuples; rows with a missing
+value never match.
+"""
+
+import re
+
+import numpy as np
+
+from . import data_utils
+from . import figure_cache
+
+OPERATORS = ('>=', '<=', '>', '<', '==')
+
+# "<metric> <operator> <number>", e.g. "possession > 55"
+PREDICATE_PATTERN = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|==|>|<)\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+class MetricMatrix:
+    """Numeric team metrics with a sorted index per column"""
+
+    def __init__(self, frame):
+        frame = frame.reset_index(drop=True)
+        numeric = frame.select_dtypes(include="number").drop(columns=["stage"], errors="ignore")
+        self.teams = frame['team'].astype(str).to_numpy()
+        self.metrics = list(numeric.columns)
+        self.metric_index = {metric: j for j, metric in enumerate(self.metrics)}
+        self.values = numeric.to_numpy(dtype=float)
+
+        # NaNs sort last, so each column's valid values are sorted[:valid]
+        self.order = np.argsort(self.values, axis=0, kind="stable")
+        self.sorted = np.take_along_axis(self.values, self.order, axis=0)
+        self.valid = (~np.isnan(self.values)).sum(axis=0)
+
+    def bounds(self, metric):
+        """Get the (min, max) of a metric, or None when it has no values"""
+        j = self.metric_index[metric]
+        if self.valid[j] == 0:
+            return None
+        return float(self.sorted[0, j]), float(self.sorted[self.valid[j] - 1, j])
+
+    def range_rows(self, metric, operator, value):
+        """Get the row IDs matching one predicate with two binary searches"""
+        j = self.metric_index[metric]
+        column = self.sorted[:self.valid[j], j]
+        start, stop = 0, len(column)
+        if operator in ('>', '>=', '=='):
+            start = np.searchsorted(column, value, side='right' if operator == '>' else 'left')
+        if operator in ('<', '<=', '=='):
+            stop = np.searchsorted(column, value, side='left' if operator == '<' else 'right')
+        return self.order[start:max(start, stop), j]
+
+    def mask(self, predicates):
+        """Get the boolean mask of rows matching every predicate"""
+        mask = np.ones(len(self.teams), dtype=bool)
+        for metric, operator, value in predicates:
+            matches = np.zeros(len(self.teams), dtype=bool)
+            matches[self.range_rows(metric, operator, value)] = True
+            mask &= matches
+        return mask
+
+
+@figure_cache.per_version()
+def get_metric_matrix():
+    """Get the metric matrix of the current dataset version (shared, read-only)"""
+    return MetricMatrix(data_utils.get_dataset("team_data"))
+
+
+def parse_expression(expression):
+    """Parse "metric op number AND ..." into a tuple of predicates
+
+    Raises ValueError with a readable message for invalid input.
+    """
+    if not expression or not expression.strip():
+        return ()
+    matrix = get_metric_matrix()
+    predicates = []
+    for part in re.split(r'\s+AND\s+', expression.strip(), flags=re.IGNORECASE):
+        match = PREDICATE_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Could not read '{part.strip()}' (expected e.g. 'possession > 55')")
+        metric, operator, value = match.groups()
+        if metric not in matrix.metric_index:
+            raise ValueError(f"Unknown metric '{metric}'")
+        predicates.append((metric, operator, float(value)))
+    return tuple(predicates)
+
+
+def format_predicates(predicates):
+    """Format predicates back into an expression"""
+    return " AND ".join(f"{metric} {operator} {value:g}" for metric, operator, value in predicates)
+
+
+@figure_cache.per_version(maxsize=128)
+def _filtered_teams(predicates):
+    matrix = get_metric_matrix()
+    return tuple(matrix.teams[matrix.mask(predicates)].tolist())
+
+
+def filter_teams(predicates):
+    """Get the teams matching every predicate (memoized per predicate set)"""
+    return list(_filtered_teams(tuple(tuple(p) for p in predicates)))
@@ -0,0 +1,156 @@
+"""
+Goalkeeper Radar Component
+
+This component compares goalkeepers on their own radar dimensions (shot
+stopping, clean sheets, distribution, sweeping, cross claiming), computed
+from the player_keepers/player_keepersadv rows by scoring.py. Goalkeepers
+are left out of the outfield player radar.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+from dash import Dash, dcc, html
+from dash.dependencies import Input, Output, State
+import dash_bootstrap_components as dbc
+
+from . import ids
+from . import radar_engine
+from . import selection
+from . import serialization
+from . import single_flight
+
+# Radar scores are displayed with one decimal
+RADAR_TICK_FORMATS = {"score": ".1f"}
+
+
+def get_available_players(selection_store):
+    """Get the bitset of the players that can be shown (filters + team selection, see selection.py)"""
+    return selection.available_players(selection_store)
+
+
+def render(app: Dash) -> html.Div:
+    """Create a goalkeeper radar chart component"""
+
+    layout = html.Div([
+        html.H4("Goalkeeper Radar Comparison", className="text-center mb-3"),
+        html.Div([
+            html.Label("Select Goalkeepers:", className="fw-bold mb-1"),
+            dcc.Dropdown(
+                id=ids.GOALKEEPER_RADAR_DROPDOWN,
+                options=[],
+                multi=True,
+                value=[],
+                style={'width': '100%', 'font-size': '14px'},
+                placeholder="Select goalkeepers to compare (filtered by selected teams)",
+                className="custom-dropdown mb-2"
+            ),
+            dbc.Switch(
+                id=ids.GOALKEEPER_RADAR_BANDS,
+                label="Show confidence bands",
+                value=False,
+                className="small mb-2"
+            ),
+        ], className="px-2"),
+        dbc.Spinner(
+            dcc.Graph(
+                id=ids.GOALKEEPER_RADAR_CHART,
+                config={'displayModeBar': True},
+                className="border rounded"
+            ),
+            color="primary",
+            type="grow",
+            size="sm"
+        ),
+        dcc.Store(id=ids.GOALKEEPER_RADAR_STATE)
+    ])
+
+    @app.callback(
+        Output(ids.GOALKEEPER_RADAR_DROPDOWN, 'options'),
+        Input(ids.SELECTION_STORE, 'data')
+    )
+    def update_goalkeeper_dropdown(selection_store):
+        engine = radar_engine.get_engine("goalkeeper")
+        mask = engine.mask(players=get_available_players(selection_store))
+        return [
+            {'label': label, 'value': player}
+            for label, player in zip(engine.labels[mask].tolist(), engine.keys[mask].tolist())
+        ]
+
+    @app.callback(
+        Output(ids.GOALKEEPER_RADAR_CHART, 'figure'),
+        Output(ids.GOALKEEPER_RADAR_STATE, 'data'),
+        [
+            Input(ids.GOALKEEPER_RADAR_DROPDOWN, 'value'),
+            Input(ids.SELECTION_STORE, 'data'),
+            Input(ids.GOALKEEPER_RADAR_BANDS, 'value')
+        ],
+        State(ids.GOALKEEPER_RADAR_STATE, 'data')
+    )
+    @single_flight.single_flight("goalkeeper-radar")
+    def update_goalkeeper_radar(selected_keepers, selection_store, show_bands, drawn):
+        fig = go.Figure()
+        engine = radar_engine.get_engine("goalkeeper", bands=bool(show_bands))
+        available_players = get_available_players(selection_store)
+        keeper_ids = engine.ordered(
+            np.flatnonzero(engine.mask(keys=selected_keepers or [], players=available_players))
+        )
+
+        if keeper_ids.size == 0:
+            fig.add_annotation(
+                text="Select goalkeepers from the dropdown to view radar chart",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5,
+                showarrow=False,
+                font=dict(size=16, color="#666666")
+            )
+            fig.update_layout(
+                paper_bgcolor='rgba(250, 250, 250, 0.9)',
+                height=500
+            )
+            return fig, None
+
+        # Only send the traces that changed when goalkeepers are already drawn
+        patch, state = radar_engine.patch_update(engine, drawn, keeper_ids, RADAR_TICK_FORMATS)
+        if patch is not None:
+            return patch, state
+        fig.add_traces(engine.traces(keeper_ids))
+
+        fig.update_layout(
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, 10],
+                    tickfont=dict(size=11),
+                    gridcolor='rgba(0,0,0,0.07)',
+                    linecolor='rgba(0,0,0,0.1)'
+                ),
+                angularaxis=dict(
+                    tickfont=dict(size=12, color='black'),
+                    linecolor='rgba(0,0,0,0.1)',
+                    gridcolor='rgba(0,0,0,0.04)'
+                ),
+                bgcolor='rgba(255, 255, 255, 1)'
+            ),
+            showlegend=True,
+            legend=dict(
+                font=dict(size=11),
+                orientation="h",
+                yanchor="bottom",
+                y=-0.15,
+                xanchor="center",
+                x=0.5,
+                bgcolor='rgba(255, 255, 255, 0.9)',
+                bordercolor='rgba(0, 0, 0, 0.1)',
+                borderwidth=1
+            ),
+            title="Goalkeeper Performance Radar Chart",
+            title_x=0.5,
+            title_font=dict(size=15),
+            margin=dict(t=50, l=40, r=40, b=100),
+            height=550,
+            paper_bgcolor='rgba(250, 250, 250, 0.9)'
+        )
+
+        return serialization.prepare(fig, "goalkeeper-radar", RADAR_TICK_FORMATS), state
+
+    return layout
@@ -0,0 +1,149 @@
+"""
+Head-to-Head Engine for FIFA Visual Analysis
+
+This module precomputes teams x teams matrices from the long-form match
+table: matches played, wins/draws/losses, and per-stat sums (e.g. xG, goals,
+shots) accumulated with `np.add.at`. Opponent-adjusted team metrics are then
+plain matrix products over those matrices:
+
+    adjusted_for[t] = league mean + (stat[t] - sum_o N[t, o] * allowed[o]) / games[t]
+
+where `allowed[o]` is what opponents produce against o on average, so a
+team is credited for doing well against opponents that usually concede
+little. "vs strong opponents" metrics restrict the products to opponents
+above the median of goals scored per match.
+
+Matches without a recorded score (decided on penalties) count as draws.
+Everything is cached per dataset version.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import figure_cache
+from . import matches
+
+# Match stats kept as teams x teams matrices
+H2H_STATS = ['goals_for', 'xg', 'total_shots', 'sot', 'possession']
+
+# Opponent-adjusted columns offered as scatter axes: column -> (label, stat, side)
+# side "for" adjusts what the team produced, "against" what it conceded
+ADJUSTED_METRICS = {
+    'adj_goals_for': ("Opponent-adjusted Goals per match", 'goals_for', 'for'),
+    'adj_goals_against': ("Opponent-adjusted Goals conceded per match", 'goals_for', 'against'),
+    'adj_xg_for': ("Opponent-adjusted xG per match", 'xg', 'for'),
+    'adj_xg_against': ("Opponent-adjusted xG conceded per match", 'xg', 'against'),
+    'adj_shots_for': ("Opponent-adjusted Shots per match", 'total_shots', 'for'),
+    'adj_possession': ("Opponent-adjusted Possession %", 'possession', 'for'),
+}
+
+# Per-match metrics against opponents above the median of goals per match
+VS_STRONG_METRICS = {
+    'xg_against_vs_strong': ("xG conceded per match vs above-median scorers", 'xg', 'against'),
+    'xg_for_vs_strong': ("xG per match vs above-median scorers", 'xg', 'for'),
+    'points_vs_strong': ("Points per match vs above-median scorers", None, None),
+}
+
+
+class HeadToHead:
+    """Teams x teams matrices of match outcomes and stat sums"""
+
+    def __init__(self, table):
+        long = table.frame
+        self.teams = list(table.teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        n = len(self.teams)
+
+        rows = long['team'].map(self.team_index).to_numpy()
+        cols = long['opponent'].map(self.team_index).to_numpy()
+
+        self.played = np.zeros((n, n))
+        np.add.at(self.played, (rows, cols), 1)
+
+        # Outcomes from the team's perspective; a missing score counts as a draw
+        goal_diff = (long['goals_for'] - long['goals_against']).to_numpy()
+        self.wins = np.zeros((n, n))
+        self.draws = np.zeros((n, n))
+        self.losses = np.zeros((n, n))
+        np.add.at(self.wins, (rows, cols), goal_diff > 0)
+        np.add.at(self.draws, (rows, cols), ~(goal_diff > 0) & ~(goal_diff < 0))
+        np.add.at(self.losses, (rows, cols), goal_diff < 0)
+
+        # sums[stat][t, o] = stat produced by t against o, with non-null counts
+        self.sums = {}
+        self.counts = {}
+        for stat in H2H_STATS:
+            values = long[stat].to_numpy(dtype=float)
+            present = ~np.isnan(values)
+            self.sums[stat] = np.zeros((n, n))
+            self.counts[stat] = np.zeros((n, n))
+            np.add.at(self.sums[stat], (rows[present], cols[present]), values[present])
+            np.add.at(self.counts[stat], (rows[present], cols[present]), 1)
+
+    def differential(self, stat):
+        """Get the teams x teams matrix of summed (stat for - stat against)"""
+        return self.sums[stat] - self.sums[stat].T
+
+    def points(self):
+        """Get the teams x teams matrix of points won (3 per win, 1 per draw)"""
+        return 3 * self.wins + self.draws
+
+    def adjusted(self, stat, side="for"):
+        """Get the opponent-adjusted per-match value of a stat for every team"""
+        S = self.sums[stat] if side == "for" else self.sums[stat].T
+        N = self.counts[stat] if side == "for" else self.counts[stat].T
+        games = N.sum(axis=1)
+
+        # What opponents typically allow (for) / produce (against) per match
+        with np.errstate(invalid="ignore", divide="ignore"):
+            baseline = S.sum(axis=0) / N.sum(axis=0)
+            league_mean = S.sum() / N.sum()
+            expected = N @ np.nan_to_num(baseline)
+            return np.where(games > 0, league_mean + (S.sum(axis=1) - expected) / games, np.nan)
+
+    def strong_opponents(self):
+        """Get a mask of teams scoring above the median of goals per match"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            goals_per_match = self.sums['goals_for'].sum(axis=1) / self.counts['goals_for'].sum(axis=1)
+        return goals_per_match > np.nanmedian(goals_per_match)
+
+    def per_match_vs(self, opponents, stat=None, side="for"):
+        """Get a per-match stat (or points when stat is None) against a mask of opponents"""
+        if stat is None:
+            totals, games = self.points(), self.played
+        else:
+            totals = self.sums[stat] if side == "for" else self.sums[stat].T
+            games = self.counts[stat] if side == "for" else self.counts[stat].T
+        mask = opponents.astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (totals @ mask) / (games @ mask)
+
+
+@figure_cache.per_version()
+def get_head_to_head():
+    """Get the head-to-head matrices of the current dataset version (shared, read-only)"""
+    return HeadToHead(matches.get_match_table())
+
+
+@figure_cache.per_version()
+def adjusted_metrics():
+    """Get one row per team with the opponent-adjusted and vs-strong-opponent metrics"""
+    h2h = get_head_to_head()
+    columns = {'team': h2h.teams}
+    for column, (_, stat, side) in ADJUSTED_METRICS.items():
+        columns[column] = h2h.adjusted(stat, side)
+    strong = h2h.strong_opponents()
+    for column, (_, stat, side) in VS_STRONG_METRICS.items():
+        columns[column] = h2h.per_match_vs(strong, stat, side)
+    return pd.DataFrame(columns)
+
+
+def with_adjusted_metrics(df):
+    """Add the opponent-adjusted metric columns to a team frame"""
+    return df.merge(adjusted_metrics(), on='team', how='left')
+
+
+def axis_options():
+    """Get the scatter axis dropdown options of the opponent-adjusted metrics"""
+    metrics = {**ADJUSTED_METRICS, **VS_STRONG_METRICS}
+    return [{"label": label, "value": column} for column, (label, _, _) in metrics.items()]
@@ -8,12 +8,33 @@ Y_AXIS_DROPDOWN = "y-axis-dropdown"
 SCATTER_PLOT = "scatter-plot"
 SEARCH_BAR = "search-bar"
 FILTER = "filter"
+FILTER_SIMULATION = "filter-simulation"
+
+# Metric range filter
+METRIC_FILTER_METRIC = "metric-filter-metric"
+METRIC_FILTER_RANGE = "metric-filter-range"
+METRIC_FILTER_ADD = "metric-filter-add"
+METRIC_FILTER_EXPRESSION = "metric-filter-expression"
+METRIC_FILTER_FEEDBACK = "metric-filter-feedback"
+METRIC_FILTER_STORE = "metric-filter-store"
 
 # Shared data store 
 FILTERED_TEAMS_STORE = "filtered-teams-store"
+# Combined team selection as bitsets (see selection.py)
+SELECTION_STORE = "selection-store"
+PCP_BRUSH_STORE = "pcp-brush-store"
+PCP_LINES_STORE = "pcp-lines-store"
+
+# Stats summary table
+STATS_SUMMARY = "stats-summary"
+
+# Lazy-loaded layout sections (pattern-matching ids: {"type": ..., "name": section})
+LAZY_SECTION = "lazy-section"
+LAZY_SECTION_TRIGGER = "lazy-section-trigger"
 
 # Parallel coordinates components
 TEAMS_DROPDOWN = "teams-dropdown"
+PCP_AXIS_ORDER = "pcp-axis-order"
 PCP = "pcp"
 PCP_EXPLANATION = "pcp-explanation"
 PCP_EXPLANATION_BUTTON = "pcp-explanation-button"
@@ -33,6 +54,61 @@ PLAYER_RADAR_TASK2_DROPDOWN = "player-radar-task2-dropdown"
 PLAYER_RADAR_TASK2_CHART = "player-radar-task2-chart"
 TEAM_RADAR_TASK2_DROPDOWN = "team-radar-task2-dropdown"
 TEAM_RADAR_TASK2_CHART = "team-radar-task2-chart"
+# Entities currently drawn on the radars (used for partial Patch updates)
+PLAYER_RADAR_TASK2_STATE = "player-radar-task2-state"
+TEAM_RADAR_TASK2_STATE = "team-radar-task2-state"
+
+PLAYER_RADAR_POSITION_NORMALIZE = "player-radar-position-normalize"
+
+# Bootstrap confidence band toggles
+TEAM_RADAR_BANDS = "team-radar-bands"
+PLAYER_RADAR_BANDS = "player-radar-bands"
+GOALKEEPER_RADAR_BANDS = "goalkeeper-radar-bands"
+
+# Goalkeeper radar
+GOALKEEPER_RADAR_DROPDOWN = "goalkeeper-radar-dropdown"
+GOALKEEPER_RADAR_CHART = "goalkeeper-radar-chart"
+GOALKEEPER_RADAR_STATE = "goalkeeper-radar-state"
+
+# As-of-matchday timeline
+TIMELINE_SLIDER = "timeline-slider"
+TIMELINE_LABEL = "timeline-label"
+
+# Custom radar dimension weights
+TEAM_RADAR_WEIGHTS_INPUT = "team-radar-weights-input"
+TEAM_RADAR_WEIGHTS_APPLY = "team-radar-weights-apply"
+TEAM_RADAR_WEIGHTS_RESET = "team-radar-weights-reset"
+TEAM_RADAR_WEIGHTS_FEEDBACK = "team-radar-weights-feedback"
+TEAM_RADAR_WEIGHTS_STORE = "team-radar-weights-store"
+PLAYER_RADAR_WEIGHTS_INPUT = "player-radar-weights-input"
+PLAYER_RADAR_WEIGHTS_APPLY = "player-radar-weights-apply"
+PLAYER_RADAR_WEIGHTS_RESET = "player-radar-weights-reset"
+PLAYER_RADAR_WEIGHTS_FEEDBACK = "player-radar-weights-feedback"
+PLAYER_RADAR_WEIGHTS_STORE = "player-radar-weights-store"
+
+# Similar player search (player radar section)
+PLAYER_SIMILARITY_REFERENCE = "player-similarity-reference"
+PLAYER_SIMILARITY_FEATURES = "player-similarity-features"
+PLAYER_SIMILARITY_POSITIONS = "player-similarity-positions"
+PLAYER_SIMILARITY_RESULTS = "player-similarity-results"
+PLAYER_SIMILARITY_COMPARE = "player-similarity-compare"
+
+# Team similarity view
+TEAM_SIMILARITY_METRICS = "team-similarity-metrics"
+TEAM_SIMILARITY_CLUSTERS = "team-similarity-clusters"
+TEAM_SIMILARITY_NEAREST = "team-similarity-nearest"
+TEAM_SIMILARITY_CHART = "team-similarity-chart"
+
+# Metric correlations
+CORRELATION_METRICS = "correlation-metrics"
+CORRELATION_ALL_METRICS = "correlation-all-metrics"
+CORRELATION_METHOD = "correlation-method"
+CORRELATION_PAIRS = "correlation-pairs"
+CORRELATION_CHART = "correlation-chart"
+
+# Style map
+STYLE_MAP_KIND = "style-map-kind"
+STYLE_MAP_CHART = "style-map-chart"
 
 CLEAR_SCATTER_BUTTON = "clear-scatter"
 CLEAR_PCP_BUTTON = "clear-pcp"
@@ -2,26 +2,99 @@
 Main layout for the FIFA Visual Analysis dashboard
 """
 
-from dash import Dash, html, dcc
+import os
+
+from dash import Dash, html, dcc, Input, Output, State, MATCH
 import dash_bootstrap_components as dbc
 
 from . import x_axis_dropdown, y_axis_dropdown, filter, scatter_plot
-from . import pcp, teams_dropdown, pcp_explanation, stats_summary
-from . import player_radar_task2, team_radar_task2
+from . import pcp, teams_dropdown, pcp_explanation, stats_summary, timeline_slider
+from . import player_radar_task2, team_radar_task2, goalkeeper_radar, team_similarity_view, correlation_view, style_map_view
 from . import ids
+from . import selection
+from .. import asset_manifest
+
+# Below-the-fold sections are mounted only when they scroll into view (or the
+# user clicks "Load section"), so their callbacks do not fire on initial load.
+# Set FIFA_LAZY_SECTIONS=0 to mount everything up front.
+LAZY_SECTIONS = os.environ.get("FIFA_LAZY_SECTIONS", "1") == "1"
+
+# Section name -> rendered content, returned when the section is opened
+_lazy_section_content = {}
+
+def register_lazy_sections(app: Dash) -> None:
+    """Register the callback that swaps a section placeholder for its content"""
+    @app.callback(
+        Output({"type": ids.LAZY_SECTION, "name": MATCH}, "children"),
+        Input({"type": ids.LAZY_SECTION_TRIGGER, "name": MATCH}, "n_clicks"),
+        State({"type": ids.LAZY_SECTION_TRIGGER, "name": MATCH}, "id"),
+        prevent_initial_call=True
+    )
+    def load_section(n_clicks, trigger_id):
+        return _lazy_section_content[trigger_id["name"]]
+
+def lazy_section(name: str, content, min_height: str = "600px"):
+    """Wrap a section so it renders as a placeholder until it is opened"""
+    if not LAZY_SECTIONS:
+        return content
+
+    # Callbacks are registered by the render functions at startup; only
+    # mounting the components (and so firing their callbacks) is deferred
+    _lazy_section_content[name] = content
+    return html.Div(
+        id={"type": ids.LAZY_SECTION, "name": name},
+        children=html.Div([
+            html.P("This section loads when it scrolls into view.", className="text-muted mb-2"),
+            dbc.Button(
+                "Load section",
+                id={"type": ids.LAZY_SECTION_TRIGGER, "name": name},
+                color="secondary",
+                outline=True,
+                size="sm",
+                className="lazy-section-trigger"
+            )
+        ], className="lazy-section d-flex flex-column justify-content-center align-items-center bg-white rounded shadow-sm",
+           style={"minHeight": min_height})
+    )
+
+def logo(width: int = 64):
+    """Get the FIFA logo from the built WebP/PNG variants (None if the asset build has not run)"""
+    manifest = asset_manifest.load_manifest()
+    png = asset_manifest.image_srcset("fifa_logo", "png", manifest)
+    if not png:
+        # The original PNG is too large to send on first load
+        return None
+    return html.Picture([
+        html.Source(srcSet=asset_manifest.image_srcset("fifa_logo", "webp", manifest), type="image/webp"),
+        html.Img(
+            src=png.split(" ")[0],
+            srcSet=png,
+            sizes=f"{width}px",
+            alt="FIFA World Cup 2022",
+            style={"width": f"{width}px", "height": "auto", "marginRight": "18px"}
+        )
+    ])
 
 def create_layout(app: Dash) -> dbc.Container:
     """Create the main layout for the dashboard"""
+    if LAZY_SECTIONS:
+        register_lazy_sections(app)
+    selection.register_callbacks(app)
+
     return dbc.Container(
         fluid=True,
         children=[
             # Store for filtered teams (shared between components)
-            dcc.Store(id=ids.FILTERED_TEAMS_STORE, data=[]),
+            dcc.Store(id=ids.FILTERED_TEAMS_STORE),
+            # Stores for the combined team selection and the PCP brushes
+            dcc.Store(id=ids.SELECTION_STORE),
+            dcc.Store(id=ids.PCP_BRUSH_STORE),
             
             # Title section with FIFA World Cup branding
             dbc.Row([
                 dbc.Col([
                     html.Div([
+                        logo(),
                         html.Span(
                             "FIFA",
                             style={
@@ -62,6 +135,11 @@ def create_layout(app: Dash) -> dbc.Container:
                         html.Div(
                             teams_dropdown.render(app),
                             className="p-3 border rounded shadow bg-light"
+                        ),
+                        # As-of-matchday timeline shared by the team views
+                        html.Div(
+                            timeline_slider.render(app),
+                            className="pt-2"
                         )
                     ], width={"size": 10, "offset": 1})
                 ], className="py-2 fade-in slide-in-up"),
@@ -128,6 +206,16 @@ def create_layout(app: Dash) -> dbc.Container:
                     )
                 ], width=12)
             ]),
+
+            # Statistics of the selected teams (narrowed by box/lasso selection on the scatter)
+            dbc.Row([
+                dbc.Col([
+                    html.Div(
+                        stats_summary.render(app),
+                        className="bg-white rounded shadow-sm p-3 fade-in"
+                    )
+                ], width=12)
+            ], className="mt-3"),
             
             # Horizontal divider
             dbc.Row([
@@ -147,60 +235,155 @@ def create_layout(app: Dash) -> dbc.Container:
                 ], width=12)
             ]),
             
+            lazy_section("pcp", html.Div([
+                dbc.Row([
+                    dbc.Col([
+                        html.Div(
+                            pcp_explanation.render(app),
+                            className="d-flex justify-content-center fade-in"
+                        )
+                    ], width=12, className="mb-3")
+                ]),
+                
+                dbc.Row([
+                    dbc.Col([
+                        html.Div(
+                            pcp.render(app, x_axis_dropdown_id=ids.X_AXIS_DROPDOWN, y_axis_dropdown_id=ids.Y_AXIS_DROPDOWN),
+                            className="dash-graph bg-white rounded shadow-sm p-3 fade-in slide-in-up"
+                        )
+                    ], width=12)
+                ])
+            ]), min_height="1600px"),
+            
+            # Horizontal divider
+            dbc.Row([
+                dbc.Col(html.Hr(), width=12)
+            ], className="my-4"),
+            
+            # Radar Charts section header
             dbc.Row([
                 dbc.Col([
-                    html.Div(
-                        pcp_explanation.render(app),
-                        className="d-flex justify-content-center fade-in"
-                    )
-                ], width=12, className="mb-3")
+                    html.Div([
+                        html.H2("Performance Radar Comparisons", className="text-center mb-3 fw-bold text-secondary"),
+                        html.P(
+                            "Visualize team and player performance with these detailed radar charts.",
+                            className="text-muted text-center mb-4"
+                        )
+                    ], className="p-3 bg-light rounded shadow-sm fade-in slide-in-up")
+                ], width=12)
             ]),
             
+            # Team and Player Radar Charts side by side, goalkeepers below
+            lazy_section("radars", html.Div([
+                dbc.Row([
+                    # Team Radar Chart (left)
+                    dbc.Col([
+                        html.Div(
+                            team_radar_task2.render(app),
+                            className="border rounded shadow-sm p-3 h-100 bg-white dash-graph fade-in slide-in-up"
+                        )
+                    ], width=6),
+                    
+                    # Player Radar Chart (right)
+                    dbc.Col([
+                        html.Div(
+                            player_radar_task2.render(app),
+                            className="border rounded shadow-sm p-3 h-100 bg-white dash-graph fade-in slide-in-up"
+                        )
+                    ], width=6)
+                ]),
+                
+                # Goalkeeper Radar Chart
+                dbc.Row([
+                    dbc.Col([
+                        html.Div(
+                            goalkeeper_radar.render(app),
+                            className="border rounded shadow-sm p-3 h-100 bg-white dash-graph fade-in slide-in-up"
+                        )
+                    ], width={"size": 6, "offset": 3})
+                ], className="mt-4")
+            ]), min_height="1300px"),
+            
+            # Horizontal divider
+            dbc.Row([
+                dbc.Col(html.Hr(), width=12)
+            ], className="my-4"),
+            
+            # Team similarity section header
             dbc.Row([
+                dbc.Col([
+                    html.Div([
+                        html.H2("Team Similarity", className="text-center mb-3 fw-bold text-secondary"),
+                        html.P(
+                            "Find which teams played alike, with teams grouped by a hierarchical clustering of their metrics.",
+                            className="text-muted text-center mb-4"
+                        )
+                    ], className="p-3 bg-light rounded shadow-sm fade-in slide-in-up")
+                ], width=12)
+            ]),
+            
+            lazy_section("team-similarity", dbc.Row([
                 dbc.Col([
                     html.Div(
-                        pcp.render(app, x_axis_dropdown_id=ids.X_AXIS_DROPDOWN, y_axis_dropdown_id=ids.Y_AXIS_DROPDOWN),
-                        className="dash-graph bg-white rounded shadow-sm p-3 fade-in slide-in-up"
+                        team_similarity_view.render(app),
+                        className="border rounded shadow-sm p-3 bg-white dash-graph fade-in slide-in-up"
                     )
                 ], width=12)
-            ]),
+            ]), min_height="800px"),
             
             # Horizontal divider
             dbc.Row([
                 dbc.Col(html.Hr(), width=12)
             ], className="my-4"),
             
-            # Radar Charts section header
+            # Metric correlations section header
             dbc.Row([
                 dbc.Col([
                     html.Div([
-                        html.H2("Performance Radar Comparisons", className="text-center mb-3 fw-bold text-secondary"),
+                        html.H2("Metric Correlations", className="text-center mb-3 fw-bold text-secondary"),
                         html.P(
-                            "Visualize team and player performance with these detailed radar charts.",
+                            "See which team metrics move together, as Pearson or Spearman correlations.",
                             className="text-muted text-center mb-4"
                         )
                     ], className="p-3 bg-light rounded shadow-sm fade-in slide-in-up")
                 ], width=12)
             ]),
             
-            # Team and Player Radar Charts side by side
-            dbc.Row([
-                # Team Radar Chart (left)
+            lazy_section("correlations", dbc.Row([
                 dbc.Col([
                     html.Div(
-                        team_radar_task2.render(app),
-                        className="border rounded shadow-sm p-3 h-100 bg-white dash-graph fade-in slide-in-up"
+                        correlation_view.render(app),
+                        className="border rounded shadow-sm p-3 bg-white dash-graph fade-in slide-in-up"
                     )
-                ], width=6),
-                
-                # Player Radar Chart (right)
+                ], width=12)
+            ]), min_height="800px"),
+            
+            # Horizontal divider
+            dbc.Row([
+                dbc.Col(html.Hr(), width=12)
+            ], className="my-4"),
+            
+            # Style map section header
+            dbc.Row([
+                dbc.Col([
+                    html.Div([
+                        html.H2("Style Map", className="text-center mb-3 fw-bold text-secondary"),
+                        html.P(
+                            "Every player and team placed by playing style: the two main directions of variation in their per-90 metrics.",
+                            className="text-muted text-center mb-4"
+                        )
+                    ], className="p-3 bg-light rounded shadow-sm fade-in slide-in-up")
+                ], width=12)
+            ]),
+            
+            lazy_section("style-map", dbc.Row([
                 dbc.Col([
                     html.Div(
-                        player_radar_task2.render(app),
-                        className="border rounded shadow-sm p-3 h-100 bg-white dash-graph fade-in slide-in-up"
+                        style_map_view.render(app),
+                        className="border rounded shadow-sm p-3 bg-white dash-graph fade-in slide-in-up"
                     )
-                ], width=6)
-            ]),
+                ], width=12)
+            ]), min_height="800px"),
             
             # Horizontal divider
             dbc.Row([
@@ -0,0 +1,103 @@
+"""
+Match Table for FIFA Visual Analysis
+
+match_data_clean.csv stores each match once, with home_*/away_* column
+pairs. This module reshapes it into a long-form table with one row per
+(match, team): `opponent`, `is_home`, `goals_for`/`goals_against` parsed
+from `score` (NaN when the score is missing, e.g. matches settled on
+penalties), and the paired stats as typed float columns without the
+home_/away_ prefixes.
+
+Rows are sorted by team and kickoff time, and a team index maps every team
+to its row slice, so per-team match queries are slices instead of scans.
+The table is built once per dataset version.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import data_utils
+from . import figure_cache
+
+# Stats stored as home_<stat>/away_<stat> pairs
+PAIRED_STATS = [
+    'xg', 'possession', 'completed_passes', 'attempted_passes', 'sot',
+    'total_shots', 'saves', 'fouls', 'corners', 'crosses', 'touches',
+    'tackles', 'interceptions', 'aerials_won', 'clearances', 'offsides',
+    'gks', 'throw_ins', 'long_balls'
+]
+
+# Column stems that are spelled differently in the CSV
+SOURCE_STEMS = {
+    'attempted_passes': 'attempted_pases',  # typo in the data
+}
+
+# Per-match columns copied to both team rows
+MATCH_COLUMNS = ['match', 'match_time', 'venue', 'referee']
+
+# Scores look like "2–1" (en dash); a plain hyphen is accepted too
+SCORE_PATTERN = r'^\s*(\d+)\s*[–-]\s*(\d+)\s*$'
+
+
+def _side(matches, side, other, goals):
+    """Get the team rows of one side (home or away) of every match"""
+    frame = matches[[c for c in MATCH_COLUMNS if c in matches.columns]].copy()
+    frame['team'] = matches[f'{side}_team']
+    frame['opponent'] = matches[f'{other}_team']
+    frame['is_home'] = side == 'home'
+    frame['goals_for'] = goals[0 if side == 'home' else 1]
+    frame['goals_against'] = goals[1 if side == 'home' else 0]
+    for stat in PAIRED_STATS:
+        stem = SOURCE_STEMS.get(stat, stat)
+        frame[stat] = pd.to_numeric(matches.get(f'{side}_{stem}', np.nan), errors='coerce')
+        frame[f'opp_{stat}'] = pd.to_numeric(matches.get(f'{other}_{stem}', np.nan), errors='coerce')
+    return frame
+
+
+def build_long_table(matches):
+    """Reshape the match data into one row per (match, team), sorted by team and kickoff"""
+    goals = matches['score'].astype(str).str.extract(SCORE_PATTERN).astype(float)
+    long = pd.concat(
+        [_side(matches, 'home', 'away', goals), _side(matches, 'away', 'home', goals)],
+        ignore_index=True
+    )
+
+    long['match'] = long['match'].astype(int)
+    long['match_time'] = pd.to_datetime(long['match_time'])
+    long['is_home'] = long['is_home'].astype(bool)
+    stat_columns = ['goals_for', 'goals_against'] + PAIRED_STATS + [f'opp_{s}' for s in PAIRED_STATS]
+    long[stat_columns] = long[stat_columns].astype(float)
+
+    return long.sort_values(['team', 'match_time', 'match'], kind='stable').reset_index(drop=True)
+
+
+class MatchTable:
+    """Long-form match rows with a team -> row slice index"""
+
+    def __init__(self, long):
+        self.frame = long
+        teams = long['team'].to_numpy()
+        names, starts = np.unique(teams, return_index=True)
+        stops = np.append(starts[1:], len(teams))
+        order = np.argsort(starts)
+        self.teams = names[order].tolist()
+        self.team_slices = {
+            names[i]: slice(int(starts[i]), int(stops[i])) for i in order
+        }
+
+    def team_matches(self, team):
+        """Get the match rows of one team in kickoff order (empty for unknown teams)"""
+        return self.frame.iloc[self.team_slices.get(team, slice(0, 0))]
+
+    def match_counts(self):
+        """Get the number of matches played by every team"""
+        return {team: s.stop - s.start for team, s in self.team_slices.items()}
+
+
+@figure_cache.per_version()
+def get_match_table():
+    """Get the long-form match table of the current dataset version
+
+    The table is shared between callers and must not be modified.
+    """
+    return MatchTable(build_long_table(data_utils.get_dataset("match_data")))
@@ -5,28 +5,39 @@ This component creates a visually appealing parallel coordinates plot
 to visualize and compare team performance across multiple metrics.
 """
 
-from dash import Dash, dcc, html, Input, Output, callback, ctx, clientside_callback
+from dash import Dash, dcc, html, Input, Output, State, callback, ctx, clientside_callback
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 import os
+import re
 import colorsys
 from . import ids
+from . import correlations
 from . import data_utils  # Import shared data utilities
+from . import figure_cache
+from . import selection
+from . import serialization
+from . import single_flight
+from . import timeline
 from . import team_radar_task2  # Import to use the same color palette
 
 # Define the data path relative to the app root
 DATA_PATH = os.path.join('data', 'cleaned')  # Path to the data folder
 
+# Display precision of each PCP metric (also drives float trimming on serialization)
+TICK_FORMATS = {
+    'possession': '.1f', 'shots_per90': '.2f', 'goals_per90': '.2f',
+    'assists_per90': '.2f', 'passes_pct': '.1f', 'passes_pct_short': '.1f',
+    'passes_pct_medium': '.1f', 'passes_pct_long': '.1f', 'tackles_interceptions': '.1f', 'gk_save_pct': '.1f'
+}
+
 # Utility functions
-def load_team_data():
-    """Load and prepare team data"""
-    DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'cleaned')
-    file_path = os.path.join(DATA_PATH, "team_data_clean.csv")
-    
-    # Load data
-    df = pd.read_csv(file_path)
+def load_team_data(as_of=None):
+    """Load and prepare team data (as of a timeline kickoff index when given)"""
+    # Shared team data, loaded once on first use
+    df = timeline.team_data_as_of(as_of)
     
     # Select columns for PCP - using columns that actually exist in the dataset
     selected_columns = [
@@ -49,6 +60,14 @@ def load_team_data():
     
     return df
 
+def range_pairs(value):
+    """Get the [low, high] pairs of a Parcoords constraintrange (empty when cleared)"""
+    if isinstance(value, (list, tuple)):
+        if len(value) == 2 and all(isinstance(v, (int, float)) for v in value):
+            return [list(value)]
+        return [pair for item in value for pair in range_pairs(item)]
+    return []
+
 def bin_column(series, bins=3, labels=None):
     # Bin a continuous column into categories
     if labels is None:
@@ -70,18 +89,25 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
     
     @callback(
         Output(ids.PCP, "figure"),
+        Output(ids.PCP_LINES_STORE, "data"),
         [Input(ids.TEAMS_DROPDOWN, "value"),
-         Input(ids.FILTERED_TEAMS_STORE, "data")] +
+         Input(ids.FILTERED_TEAMS_STORE, "data"),
+         Input(ids.TIMELINE_SLIDER, "value"),
+         Input(ids.PCP_AXIS_ORDER, "value")] +
         ([Input(x_axis_dropdown_id, "value")] if x_axis_dropdown_id else []) +
         ([Input(y_axis_dropdown_id, "value")] if y_axis_dropdown_id else [])
     )
-    def update_pcp(selected_teams, filtered_teams, x_axis=None, y_axis=None):
+    @single_flight.single_flight("pcp")
+    @figure_cache.cached("pcp")
+    def update_pcp(selected_teams, filtered_teams, as_of=None, axis_order=None, x_axis=None, y_axis=None):
         """Update the PCP visualization"""
-        df = load_team_data()
+        df = load_team_data(as_of)
         fig = go.Figure()
+        # Team IDs and axis values of the drawn lines, for brushing (see update_brush)
+        lines = {"ids": [], "values": []}
         
         # Only show teams that match the tournament stage filter
-        if filtered_teams:
+        if filtered_teams is not None:
             df = df[df['team'].isin(filtered_teams)]
             
         # Use colorblind-friendly palette
@@ -93,6 +119,10 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
             'passes_pct', 'passes_pct_short', 'passes_pct_medium', 'passes_pct_long',
             'tackles_interceptions', 'gk_save_pct'
         ]
+
+        # Optionally put the most (anti-)correlated metrics next to each other (cached order)
+        if axis_order in correlations.METHODS:
+            attrs = correlations.axis_order(attrs, axis_order)
         
         # Define friendly labels for attributes
         labels = {
@@ -107,11 +137,7 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
             'tackles_interceptions': 'Tackles + Interceptions',
             'gk_save_pct': 'Save %'
         }
-        tick_formats = {
-            'possession': '.1f', 'shots_per90': '.2f', 'goals_per90': '.2f',
-            'assists_per90': '.2f', 'passes_pct': '.1f', 'passes_pct_short': '.1f',
-            'passes_pct_medium': '.1f', 'passes_pct_long': '.1f', 'tackles_interceptions': '.1f', 'gk_save_pct': '.1f'
-        }
+        tick_formats = TICK_FORMATS
         if not selected_teams or len(selected_teams) == 0:
             fig.add_annotation(
                 text="Select teams above to visualize their performance",
@@ -157,6 +183,7 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
                 
                 dimensions.append(
                     dict(
+                        name=attr,
                         range=[range_min, range_max],
                         label=label_html,
                         values=selected_df[attr].tolist(),
@@ -179,6 +206,10 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
                     tickfont=dict(size=10, family="Arial", color="#333333")
                 )
             )
+            lines = {
+                "ids": selection.get_universe("team").ids_of(selected_df['team']).tolist(),
+                "values": [dimension['values'] for dimension in dimensions]
+            }
             # Add hidden individual scatter traces for each attribute to enable hover
             x_positions = list(range(len(attrs)))
             for i, team in enumerate(selected_df['team']):
@@ -201,6 +232,7 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
                             ),
                             hoverinfo="text",
                             hovertext=hover_text,
+                            meta=attr,
                             showlegend=False
                         )
                     )
@@ -208,7 +240,7 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
             # Create a separate legend showing teams
             for i, team in enumerate(selected_teams):
                 # Only add to legend if team is in the filtered data (passes tournament stage filter)
-                if team in filtered_teams:
+                if filtered_teams is None or team in filtered_teams:
                     color_idx = i % len(colorblind_palette)
                     team_color = colorblind_palette[color_idx]
                     fig.add_trace(
@@ -255,8 +287,44 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
             hovermode="closest"  # For better hover interaction
         )
         
-        return fig
+        return serialization.prepare(fig, "pcp", TICK_FORMATS), lines
     
+    # Brushing the PCP axes narrows the shared team selection
+    @callback(
+        Output(ids.PCP_BRUSH_STORE, "data"),
+        [Input(ids.PCP, "restyleData"),
+         Input(ids.PCP_LINES_STORE, "data")],
+        State(ids.PCP_BRUSH_STORE, "data"),
+        prevent_initial_call=True
+    )
+    def update_brush(restyle_data, lines, brush):
+        # A redrawn figure starts without brushes
+        if not restyle_data or ctx.triggered_id == ids.PCP_LINES_STORE:
+            return {"ranges": {}, "ids": None}
+
+        ranges = dict((brush or {}).get("ranges") or {})
+        for key, value in restyle_data[0].items():
+            match = re.match(r"dimensions\[(\d+)\]\.constraintrange", key)
+            if match:
+                pairs = range_pairs(value)
+                if pairs:
+                    ranges[match.group(1)] = pairs
+                else:
+                    ranges.pop(match.group(1), None)
+
+        if not ranges or not lines:
+            return {"ranges": ranges, "ids": None}
+
+        team_ids = np.asarray(lines["ids"], dtype=int)
+        inside = np.ones(len(team_ids), dtype=bool)
+        for dim_index, pairs in ranges.items():
+            values = np.asarray(lines["values"][int(dim_index)], dtype=float)
+            in_any = np.zeros(len(values), dtype=bool)
+            for low, high in pairs:
+                in_any |= (values >= low) & (values <= high)
+            inside &= in_any
+        return {"ranges": ranges, "ids": team_ids[inside].tolist()}
+
     # Generate legend content for selected teams
     @callback(
         Output("pcp-legend", "children"),
@@ -272,7 +340,7 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
         
         # Filter teams based on tournament stage filter
         available_teams = selected_teams
-        if filtered_teams:
+        if filtered_teams is not None:
             available_teams = [team for team in selected_teams if team in filtered_teams]
             
         # If all selected teams were filtered out
@@ -315,18 +383,21 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
     @callback(
         Output('parcats-plot', 'figure'),
         [Input(ids.TEAMS_DROPDOWN, 'value'),
-         Input(ids.FILTERED_TEAMS_STORE, 'data')] +
+         Input(ids.FILTERED_TEAMS_STORE, 'data'),
+         Input(ids.TIMELINE_SLIDER, 'value')] +
         ([Input(x_axis_dropdown_id, "value")] if x_axis_dropdown_id else []) +
         ([Input(y_axis_dropdown_id, "value")] if y_axis_dropdown_id else []) +
         [Input('parcats-plot', 'clickData')]
     )
-    def update_parcats(selected_teams, filtered_teams, x_axis=None, y_axis=None, click_data=None):
-        df = load_team_data()
+    @single_flight.single_flight("parcats")
+    @figure_cache.cached("parcats")
+    def update_parcats(selected_teams, filtered_teams, as_of=None, x_axis=None, y_axis=None, click_data=None):
+        df = load_team_data(as_of)
         if not selected_teams or len(selected_teams) == 0:
             return go.Figure()
         
         # Apply tournament stage filter
-        if filtered_teams:
+        if filtered_teams is not None:
             df = df[df['team'].isin(filtered_teams)]
             
         # Filter by selected teams
@@ -537,6 +608,16 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
         
         return fig
 
+    # The PCP section can be mounted lazily, so its Clear button gets its own
+    # callback instead of being an input of the (always mounted) teams dropdown
+    @callback(
+        Output(ids.TEAMS_DROPDOWN, "value", allow_duplicate=True),
+        Input(ids.CLEAR_PCP_BUTTON, "n_clicks"),
+        prevent_initial_call=True
+    )
+    def clear_selection(n_clicks):
+        return []
+
     # --- Layout ---
     return html.Div([
         dcc.Graph(id='parcats-plot', className="mb-4 border rounded shadow-sm"),
@@ -546,6 +627,20 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
                 html.Div(id="pcp-legend", className="mb-3")
             ], width=12),
         ]),
+        html.Div([
+            dbc.Label("Axis order:", className="fw-bold me-2 small"),
+            dcc.RadioItems(
+                id=ids.PCP_AXIS_ORDER,
+                options=[{"label": "Default", "value": "default"}] + [
+                    {"label": f"By {label} correlation", "value": method}
+                    for method, label in correlations.METHODS.items()
+                ],
+                value="default",
+                inline=True,
+                inputClassName="me-1",
+                labelClassName="me-3 small"
+            ),
+        ], className="text-center mb-2"),
         html.Div([
             dbc.Button(
                 "Clear Selection",
@@ -564,5 +659,6 @@ def render(app: Dash, x_axis_dropdown_id=None, y_axis_dropdown_id=None) -> html.
             ),
             color="primary",
             type="border",
-        )
+        ),
+        dcc.Store(id=ids.PCP_LINES_STORE)
     ])
\ No newline at end of file
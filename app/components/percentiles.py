@@ -0,0 +1,138 @@
+"""
+Percentile Index for FIFA Visual Analysis
+
+This module keeps, for every numeric metric, the sorted non-null values of
+the population (teams, or players overall and per position group), so a
+percentile rank is a pair of `np.searchsorted` calls instead of a sort per
+request. Any view can then say "87th percentile among midfielders".
+
+Indexes are built once per dataset version, on first use.
+"""
+
+import numpy as np
+
+from . import data_utils
+from . import figure_cache
+
+# Position codes of player_data_clean.csv -> plural label used in descriptions
+GROUP_LABELS = {
+    "GK": "goalkeepers",
+    "DF": "defenders",
+    "MF": "midfielders",
+    "FW": "forwards",
+}
+
+
+def ordinal(n):
+    """Format an integer as an English ordinal (1st, 2nd, 3rd, 11th, ...)"""
+    if 10 <= n % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+class PercentileIndex:
+    """Sorted value arrays per (group, metric) for percentile lookups
+
+    Group None is the whole population; with a `group_column`, every value of
+    that column gets its own arrays as well.
+    """
+
+    def __init__(self, frame, key_columns, population, group_column=None):
+        self.population = population
+        numeric = frame.select_dtypes(include="number")
+        self.metrics = list(numeric.columns)
+
+        groups = frame[group_column].fillna("").astype(str).to_numpy() if group_column else None
+        keys = list(zip(*[frame[c].astype(str) for c in key_columns]))
+        self.groups = dict(zip(keys, groups.tolist())) if groups is not None else {}
+
+        values = numeric.to_numpy(dtype=float)
+        self.sorted = {}
+        for column, metric in enumerate(self.metrics):
+            self.sorted[(None, metric)] = self._sorted(values[:, column])
+            if groups is not None:
+                for group in np.unique(groups):
+                    if group:
+                        self.sorted[(group, metric)] = self._sorted(values[groups == group, column])
+
+    @staticmethod
+    def _sorted(values):
+        values = values[~np.isnan(values)]
+        values.sort()
+        return values
+
+    def group_of(self, key):
+        """Get the group (e.g. position) of an entity, or None"""
+        return self.groups.get(tuple(str(k) for k in key)) or None
+
+    def percentiles(self, metric, values, group=None):
+        """Get the percentile ranks (0-100) of values within a group, NaN when unknown
+
+        Ties count as half below, so equal values share the same rank.
+        """
+        values = np.asarray(values, dtype=float)
+        reference = self.sorted.get((group, metric))
+        if reference is None or reference.size == 0:
+            return np.full(values.shape, np.nan)
+        below = np.searchsorted(reference, values, side="left")
+        at_or_below = np.searchsorted(reference, values, side="right")
+        ranks = 100 * (below + at_or_below) / (2 * reference.size)
+        return np.where(np.isnan(values), np.nan, ranks)
+
+    def percentile(self, metric, value, group=None):
+        """Get the percentile rank (0-100) of one value, or None when unknown"""
+        rank = float(self.percentiles(metric, [value], group)[0])
+        return None if np.isnan(rank) else rank
+
+    def describe(self, rank, group=None):
+        """Describe a percentile rank, e.g. "87th percentile among midfielders" """
+        if rank is None or np.isnan(rank):
+            return ""
+        return f"{ordinal(int(round(rank)))} percentile among {GROUP_LABELS.get(group, self.population)}"
+
+    def describe_many(self, metric, values, groups=None):
+        """Describe the percentile ranks of values, each within its own group"""
+        values = np.asarray(values, dtype=float)
+        if groups is None:
+            ranks = self.percentiles(metric, values)
+            return [self.describe(rank) for rank in ranks.tolist()]
+
+        groups = np.asarray([group or "" for group in groups], dtype=object)
+        descriptions = [""] * len(values)
+        for group in set(groups.tolist()):
+            rows = np.flatnonzero(groups == group)
+            ranks = self.percentiles(metric, values[rows], group or None)
+            for row, rank in zip(rows.tolist(), ranks.tolist()):
+                descriptions[row] = self.describe(rank, group or None)
+        return descriptions
+
+
+def _build_team_index():
+    teams = data_utils.get_dataset("team_data").drop(columns=["stage"], errors="ignore")
+    scores = data_utils.get_dataset("team_scores")
+    if scores is not None:
+        teams = teams.merge(scores, on="team", how="left")
+    return PercentileIndex(teams, ["team"], "teams")
+
+
+def _build_player_index():
+    players = data_utils.get_dataset("player_data")
+    # One row per (player, team): each source file contributes different columns
+    profiles = players.groupby(["player", "team"], sort=False).first().reset_index()
+    scores = data_utils.get_dataset("player_scores")
+    if scores is not None:
+        profiles = profiles.merge(scores, on=["player", "team"], how="left")
+    return PercentileIndex(profiles, ["player", "team"], "players", group_column="position")
+
+
+INDEX_BUILDERS = {
+    "team": _build_team_index,
+    "player": _build_player_index,
+}
+
+@figure_cache.per_version(maxsize=4)
+def get_index(kind):
+    """Get the percentile index of "team" or "player" for the current dataset version"""
+    return INDEX_BUILDERS[kind]()
@@ -1,37 +1,49 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import os
 from dash import Dash, dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 from . import ids
 from . import data_utils  # Import shared data utilities
-
-# Load data
-DATA_PATH = os.path.join('data', 'cleaned') 
-file_path = os.path.join(DATA_PATH, "player_performance_scores.csv")
-PLAYER_DATA = pd.read_csv(file_path)
+from . import radar_engine
+from . import radar_weights
+from . import selection
+from . import serialization
+from . import similarity
+from . import single_flight
 
 # Radar dimensions (correct column names from the CSV file)
-dimensions = [
-    "Scoring Threat",
-    "Chance Creation",
-    "Build-up Play",
-    "Defensive Workrate",
-    "Discipline & Physical"
-]
+dimensions = radar_engine.PLAYER_DIMENSIONS
+
+# Radar scores are displayed with one decimal
+RADAR_TICK_FORMATS = {"score": ".1f"}
 
 # Colorblind-friendly palette (using Set2 from ColorBrewer)
-COLORBLIND_PALETTE = [
-    'rgba(102, 194, 165, 1)', # teal
-    'rgba(252, 141, 98, 1)',  # salmon
-    'rgba(141, 160, 203, 1)', # blue-purple
-    'rgba(231, 138, 195, 1)', # pink
-    'rgba(166, 216, 84, 1)',  # light green
-    'rgba(255, 217, 47, 1)',  # yellow
-    'rgba(229, 196, 148, 1)', # beige
-    'rgba(179, 179, 179, 1)'  # gray
-]
+COLORBLIND_PALETTE = radar_engine.COLORBLIND_PALETTE
+
+# Number of similar players listed for the reference player
+SIMILAR_PLAYERS_K = 5
+
+
+def get_available_players(selection_store):
+    """Get the bitset of the players that can be shown (filters + team selection, see selection.py)"""
+    return selection.available_players(selection_store)
+
+
+def find_similar_players(reference, feature_set, positions, selection_store):
+    """Get the players most similar to the reference among the available teams"""
+    if not reference:
+        return []
+    return similarity.similar_players(
+        reference,
+        k=SIMILAR_PLAYERS_K,
+        feature_set=feature_set or "radar",
+        players=get_available_players(selection_store),
+        positions=positions or None
+    )
 
 def render(app: Dash) -> html.Div:
     """Create a player radar chart component"""
@@ -50,6 +62,61 @@ def render(app: Dash) -> html.Div:
                 placeholder="Select players to compare (filtered by selected teams)",
                 className="custom-dropdown mb-2"
             ),
+            dbc.Switch(
+                id=ids.PLAYER_RADAR_POSITION_NORMALIZE,
+                label="Compare players within their position group",
+                value=False,
+                className="small mb-2"
+            ),
+            dbc.Switch(
+                id=ids.PLAYER_RADAR_BANDS,
+                label="Show confidence bands (wider for players with few minutes)",
+                value=False,
+                className="small mb-2"
+            ),
+        ], className="px-2"),
+        html.Div([
+            html.Label("Find Similar Players:", className="fw-bold mb-1"),
+            dbc.Row([
+                dbc.Col(
+                    dcc.Dropdown(
+                        id=ids.PLAYER_SIMILARITY_REFERENCE,
+                        options=[],
+                        placeholder="Reference player",
+                        style={'font-size': '14px'}
+                    ),
+                    md=5
+                ),
+                dbc.Col(
+                    dcc.Dropdown(
+                        id=ids.PLAYER_SIMILARITY_POSITIONS,
+                        options=[{'label': pos, 'value': pos} for pos in similarity.POSITIONS],
+                        multi=True,
+                        placeholder="Any position",
+                        style={'font-size': '14px'}
+                    ),
+                    md=4
+                ),
+                dbc.Col(
+                    dbc.RadioItems(
+                        id=ids.PLAYER_SIMILARITY_FEATURES,
+                        options=[{'label': label, 'value': value} for value, label in similarity.FEATURE_SETS.items()],
+                        value="radar",
+                        inline=True,
+                        className="small"
+                    ),
+                    md=3
+                ),
+            ], className="g-2 mb-2"),
+            html.Div(id=ids.PLAYER_SIMILARITY_RESULTS, className="small mb-2"),
+            dbc.Button(
+                "Compare on radar",
+                id=ids.PLAYER_SIMILARITY_COMPARE,
+                color="secondary",
+                size="sm",
+                outline=True,
+                className="mb-2"
+            ),
         ], className="px-2"),
         dbc.Spinner(
             dcc.Graph(
@@ -60,165 +127,139 @@ def render(app: Dash) -> html.Div:
             color="primary",
             type="grow",
             size="sm"
-        )
+        ),
+        dcc.Store(id=ids.PLAYER_RADAR_TASK2_STATE),
+        radar_weights.render(app, "player")
     ])
     
     # Callback to update player dropdown options based on selected teams
     @app.callback(
         Output(ids.PLAYER_RADAR_TASK2_DROPDOWN, 'options'),
         Output(ids.PLAYER_RADAR_TASK2_DROPDOWN, 'value'),
+        Output(ids.PLAYER_SIMILARITY_REFERENCE, 'options'),
+        Input(ids.SELECTION_STORE, 'data')
+    )
+    def update_player_dropdown(selection_store):
+        engine = radar_engine.get_engine("player")
+
+        # Players of the selected teams, or of every team passing the filters
+        # when no team is selected
+        mask = engine.mask(players=get_available_players(selection_store))
+
+        options = [
+            {'label': label, 'value': player}
+            for label, player in zip(engine.labels[mask].tolist(), engine.keys[mask].tolist())
+        ]
+        # Default value: empty selection
+        value = []
+        
+        return options, value, options
+
+    # Callback to list the players most similar to the reference player
+    @app.callback(
+        Output(ids.PLAYER_SIMILARITY_RESULTS, 'children'),
         [
-            Input(ids.TEAMS_DROPDOWN, 'value'),
-            Input(ids.FILTERED_TEAMS_STORE, 'data')
+            Input(ids.PLAYER_SIMILARITY_REFERENCE, 'value'),
+            Input(ids.PLAYER_SIMILARITY_FEATURES, 'value'),
+            Input(ids.PLAYER_SIMILARITY_POSITIONS, 'value'),
+            Input(ids.SELECTION_STORE, 'data')
         ]
     )
-    def update_player_dropdown(selected_teams, filtered_teams):
-        # Start with all teams
-        available_teams = set(PLAYER_DATA['team'].unique())
-        
-        # Filter by tournament stage if applicable
-        if filtered_teams:
-            available_teams = set(filtered_teams)
-        
-        # If no teams selected, show only players from teams that pass the tournament stage filter
-        if not selected_teams or len(selected_teams) == 0:
-            # Filter by tournament stage
-            filtered_players = PLAYER_DATA[PLAYER_DATA['team'].isin(available_teams)]
-            options = [
-                {'label': f"{row['player']} ({row['team']})", 'value': row['player']}
-                for _, row in filtered_players.iterrows()
-            ]
-            # Default value: empty selection
-            value = []
-        else:
-            # Filter by selected teams AND tournament stage filter
-            filtered_selected_teams = [team for team in selected_teams if team in available_teams]
-            filtered_players = PLAYER_DATA[PLAYER_DATA['team'].isin(filtered_selected_teams)]
-            options = [
-                {'label': f"{row['player']} ({row['team']})", 'value': row['player']}
-                for _, row in filtered_players.iterrows()
-            ]
-            # Default value: empty selection
-            value = []
-        
-        return options, value
+    def update_similar_players(reference, feature_set, positions, selection_store):
+        if not reference:
+            return html.Span("Pick a reference player to list the most similar ones", className="text-muted fst-italic")
+
+        matches = find_similar_players(reference, feature_set, positions, selection_store)
+        if not matches:
+            return html.Span("No similar players for the current filters", className="text-muted fst-italic")
+
+        return html.Ol([
+            html.Li(f"{m['player']} ({m['team']}, {m['position'] or '?'}) - distance {m['distance']:.2f}")
+            for m in matches
+        ], className="mb-0")
+
+    # Callback to show the reference player and its matches on the radar
+    @app.callback(
+        Output(ids.PLAYER_RADAR_TASK2_DROPDOWN, 'value', allow_duplicate=True),
+        Input(ids.PLAYER_SIMILARITY_COMPARE, 'n_clicks'),
+        [
+            State(ids.PLAYER_SIMILARITY_REFERENCE, 'value'),
+            State(ids.PLAYER_SIMILARITY_FEATURES, 'value'),
+            State(ids.PLAYER_SIMILARITY_POSITIONS, 'value'),
+            State(ids.SELECTION_STORE, 'data'),
+            State(ids.PLAYER_RADAR_TASK2_DROPDOWN, 'options')
+        ],
+        prevent_initial_call=True
+    )
+    def compare_similar_players(n_clicks, reference, feature_set, positions, selection_store, options):
+        if not n_clicks or not reference:
+            raise PreventUpdate
+
+        matches = find_similar_players(reference, feature_set, positions, selection_store)
+        # Only players offered by the dropdown can be drawn on the radar
+        available = {option['value'] for option in options or []}
+        players = [reference] + [m['player'] for m in matches]
+        return [player for player in players if player in available]
     
     # Define callback for the radar chart
     @app.callback(
         Output(ids.PLAYER_RADAR_TASK2_CHART, 'figure'),
+        Output(ids.PLAYER_RADAR_TASK2_STATE, 'data'),
         [
             Input(ids.PLAYER_RADAR_TASK2_DROPDOWN, 'value'),
-            Input(ids.TEAMS_DROPDOWN, 'value'),
-            Input(ids.FILTERED_TEAMS_STORE, 'data')
-        ]
+            Input(ids.SELECTION_STORE, 'data'),
+            Input(ids.PLAYER_RADAR_WEIGHTS_STORE, 'data'),
+            Input(ids.PLAYER_RADAR_POSITION_NORMALIZE, 'value'),
+            Input(ids.PLAYER_RADAR_BANDS, 'value')
+        ],
+        State(ids.PLAYER_RADAR_TASK2_STATE, 'data')
     )
-    def update_radar(selected_players, selected_teams, filtered_teams):
+    @single_flight.single_flight("player-radar")
+    def update_radar(selected_players, selection_store, weights_config, by_position, show_bands, drawn):
         fig = go.Figure()
+        state = None
+        # Scores normalized across all outfield players, or within position groups;
+        # custom weights recompute them (memoized per configuration)
+        kind = "player_position" if by_position else "player"
+        engine = radar_engine.get_engine(
+            kind, radar_weights.get_weights("player", weights_config), bands=bool(show_bands)
+        )
         
-        # Start with a base filter of all teams
-        available_teams = set(PLAYER_DATA['team'].unique())
-        
-        # Apply tournament stage filter if present
-        if filtered_teams:
-            available_teams = set(filtered_teams)
-        
-        # If there are teams selected, further filter to those teams
-        if selected_teams and len(selected_teams) > 0:
-            # Filter selected teams to only include those that match tournament stage
-            filtered_team_selection = [team for team in selected_teams if team in available_teams]
-            if filtered_team_selection:
-                # If we have teams remaining after filtering
-                available_teams = set(filtered_team_selection)
-            else:
-                # All selected teams were filtered out
-                fig.add_annotation(
-                    text="No selected teams available for the current tournament stage filter",
-                    xref="paper", yref="paper",
-                    x=0.5, y=0.5,
-                    showarrow=False,
-                    font=dict(size=16, color="#666666")
-                )
-                fig.update_layout(
-                    title="Tournament Stage Filter Applied",
-                    title_x=0.5,
-                    paper_bgcolor='rgba(250, 250, 250, 0.9)',
-                    height=500
-                )
-                return fig
+        # Players of the teams passing the filters, narrowed to the selected teams if any
+        available_players = get_available_players(selection_store)
+        if not available_players:
+            # Every selected team was filtered out
+            fig.add_annotation(
+                text="No selected teams available for the current filters",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5,
+                showarrow=False,
+                font=dict(size=16, color="#666666")
+            )
+            fig.update_layout(
+                title="Filters Applied",
+                title_x=0.5,
+                paper_bgcolor='rgba(250, 250, 250, 0.9)',
+                height=500
+            )
+            return fig, None
                 
         # Check if we have players selected from the dropdown
         if selected_players and len(selected_players) > 0:
-            # Filter to only include players from teams that match tournament stage
-            filtered_player_data = PLAYER_DATA[PLAYER_DATA['team'].isin(available_teams)]
-            
-            # Further filter to selected players
-            filtered_selected_players = filtered_player_data[filtered_player_data['player'].isin(selected_players)]
+            # Players from teams that match the tournament stage, further
+            # filtered to the selected players
+            player_ids = engine.ordered(
+                np.flatnonzero(engine.mask(keys=selected_players, players=available_players))
+            )
             
             # If we have matching players
-            if not filtered_selected_players.empty:
-                # Process players for radar chart
-                radar_players = []
-                for _, player_row in filtered_selected_players.iterrows():
-                    values = [player_row[dim] for dim in dimensions]
-                    radar_players.append((player_row['player'], sum(values), player_row, values))
-                
-                # Sort by radar size (smallest first)
-                radar_players.sort(key=lambda x: x[1])
-                
-                # Add traces for each player
-                for idx, (player_name, size, row, values) in enumerate(radar_players):
-                    # Close the loop
-                    radar_values = values + [values[0]]
-                    
-                    # Get color
-                    color_idx = idx % len(COLORBLIND_PALETTE)
-                    base_color = COLORBLIND_PALETTE[color_idx]
-                    
-                    # Set transparency
-                    fill_opacity = 0.2
-                    
-                    # Extract RGB components
-                    rgba_parts = base_color.replace('rgba(', '').replace(')', '').split(',')
-                    r, g, b = rgba_parts[0].strip(), rgba_parts[1].strip(), rgba_parts[2].strip()
-                    
-                    # Create fill and line colors
-                    fill_color = f"rgba({r},{g},{b},{fill_opacity})"
-                    line_color = f"rgba({r},{g},{b},1)"
-                    
-                    # Create display name
-                    team = row['team']
-                    display_name = f"{player_name} ({team})"
-                    
-                    # Add radar trace
-                    fig.add_trace(go.Scatterpolar(
-                        r=radar_values,
-                        theta=dimensions + [dimensions[0]],
-                        fill='toself',
-                        name=display_name,
-                        line=dict(
-                            color=line_color,
-                            width=1.5
-                        ),
-                        fillcolor=fill_color,
-                        text=[f"{dim}: {val:.1f}" for dim, val in zip(dimensions, values)] + [""],
-                        hoverinfo="text+name"
-                    ))
-                    
-                    # Add dots at each point for better readability
-                    fig.add_trace(go.Scatterpolar(
-                        r=radar_values,
-                        theta=dimensions + [dimensions[0]],
-                        mode='markers',
-                        marker=dict(
-                            symbol='circle',
-                            size=6,
-                            color=line_color,
-                            line=dict(color='white', width=1)
-                        ),
-                        name=f"{display_name} (points)",
-                        showlegend=False,
-                        hoverinfo="skip"
-                    ))
+            if player_ids.size > 0:
+                # Only send the traces that changed when players are already drawn
+                patch, state = radar_engine.patch_update(engine, drawn, player_ids, RADAR_TICK_FORMATS)
+                if patch is not None:
+                    return patch, state
+                # Traces ordered by radar size (smallest first)
+                fig.add_traces(engine.traces(player_ids))
             else:
                 # No players match both the selection and the tournament stage filter
                 fig.add_annotation(
@@ -267,7 +308,7 @@ def render(app: Dash) -> html.Div:
                 bordercolor='rgba(0, 0, 0, 0.1)',
                 borderwidth=1
             ),
-            title="Player Performance Radar Chart",
+            title="Player Performance Radar Chart (within position)" if by_position else "Player Performance Radar Chart",
             title_x=0.5,
             title_font=dict(size=15),
             margin=dict(t=50, l=40, r=40, b=100),
@@ -275,6 +316,6 @@ def render(app: Dash) -> html.Div:
             paper_bgcolor='rgba(250, 250, 250, 0.9)'
         )
 
-        return fig
+        return serialization.prepare(fig, "player-radar", RADAR_TICK_FORMATS), state
     
     return layout 
\ No newline at end of file
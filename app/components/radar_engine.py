@@ -0,0 +1,369 @@
+"""
+Radar Engine for FIFA Visual Analysis
+
+This module keeps the radar dimension scores of teams and players as float
+matrices indexed by integer IDs (row positions), with fill/line color pairs
+precomputed from the palette. Radar traces for any selection are built with
+vectorized gathers and a single argsort instead of per-row DataFrame lookups.
+
+Each entity is drawn as consecutive traces (fill + markers, preceded by a
+shaded bootstrap confidence ring when the engine has bands), so when a
+selection changes by a few entities the figure can be updated with a Dash
+Patch that only removes, inserts and recolors the affected traces.
+"""
+
+import copy
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+from dash import Patch
+
+from . import bootstrap
+from . import data_utils
+from . import figure_cache
+from . import percentiles
+from . import scoring
+from . import selection
+from . import serialization
+from . import timeline
+
+# Colorblind-friendly palette (using Set2 from ColorBrewer)
+COLORBLIND_PALETTE = [
+    'rgba(102, 194, 165, 1)', # teal
+    'rgba(252, 141, 98, 1)',  # salmon
+    'rgba(141, 160, 203, 1)', # blue-purple
+    'rgba(231, 138, 195, 1)', # pink
+    'rgba(166, 216, 84, 1)',  # light green
+    'rgba(255, 217, 47, 1)',  # yellow
+    'rgba(229, 196, 148, 1)', # beige
+    'rgba(179, 179, 179, 1)'  # gray
+]
+
+# Very transparent fill so overlapping radars stay readable
+FILL_OPACITY = 0.2
+# Confidence rings are lighter still, drawn behind the radar fills
+BAND_OPACITY = 0.12
+
+TEAM_DIMENSIONS = ['Offensive', 'Defensive', 'Cohesion', 'Efficiency', 'Discipline']
+PLAYER_DIMENSIONS = [
+    "Scoring Threat",
+    "Chance Creation",
+    "Build-up Play",
+    "Defensive Workrate",
+    "Discipline & Physical"
+]
+
+
+def _color_pair(rgba, opacity=FILL_OPACITY):
+    """Get the (fill, line) colors for a palette entry"""
+    r, g, b = [part.strip() for part in rgba.replace('rgba(', '').replace(')', '').split(',')[:3]]
+    return f"rgba({r},{g},{b},{opacity})", f"rgba({r},{g},{b},1)"
+
+
+# (fill, line) color pairs and confidence ring fills, parsed once
+COLOR_PAIRS = [_color_pair(color) for color in COLORBLIND_PALETTE]
+BAND_COLORS = [_color_pair(color, BAND_OPACITY)[0] for color in COLORBLIND_PALETTE]
+
+
+class RadarEngine:
+    """Radar scores of one entity type (teams or players) as a float matrix"""
+
+    def __init__(self, frame, key_column, dimensions, label_column=None, notes=None, signature="default"):
+        frame = frame.reset_index(drop=True)
+        self.dimensions = list(dimensions)
+        self.keys = frame[key_column].astype(str).to_numpy()
+        self.teams = frame['team'].astype(str).to_numpy()
+        self.labels = frame[label_column].astype(str).to_numpy() if label_column else self.keys
+        self.scores = frame[self.dimensions].to_numpy(dtype=float)
+        # Optional hover note per (row, dimension), e.g. a percentile rank
+        self.notes = notes
+        # Identifies the score definition, so figures of different ones are never patched
+        self.signature = signature
+        # Optional (lower, upper) confidence band matrices, see with_bands
+        self.bands = None
+
+        # Key -> integer ID (first occurrence wins, like a .iloc[0] lookup)
+        self.index = {}
+        for i, key in enumerate(self.keys):
+            self.index.setdefault(key, i)
+        # Player universe ID of every row (see selection.py), for player engines
+        self.player_ids = None
+        if key_column == 'player':
+            self.player_ids = selection.get_universe("player").ids_of(zip(self.keys, self.teams))
+
+    @property
+    def traces_per_entity(self):
+        """Number of consecutive traces drawn for each entity"""
+        return 2 if self.bands is None else 3
+
+    def with_bands(self, offsets):
+        """Get a copy of the engine that draws a confidence ring behind every entity
+
+        `offsets` maps (key, team) to (lower, upper) offsets over the dimensions
+        (see bootstrap.band_offsets); rows without offsets get an empty ring.
+        """
+        lower = self.scores.copy()
+        upper = self.scores.copy()
+        for i, pair in enumerate(zip(self.keys, self.teams)):
+            if pair in offsets:
+                lower[i] += offsets[pair][0]
+                upper[i] += offsets[pair][1]
+
+        banded = copy.copy(self)
+        banded.bands = (
+            np.clip(np.fmin(lower, self.scores), scoring.SCORE_MIN, scoring.SCORE_MAX),
+            np.clip(np.fmax(upper, self.scores), scoring.SCORE_MIN, scoring.SCORE_MAX),
+        )
+        banded.signature = f"{self.signature}:bands"
+        return banded
+
+    def ids_for(self, keys):
+        """Get the integer IDs of the given keys, in order, skipping unknown ones"""
+        return np.array([self.index[k] for k in keys if k in self.index], dtype=int)
+
+    def mask(self, keys=None, teams=None, players=None):
+        """Get a boolean mask of rows matching the given keys and/or teams
+
+        `players` is a player bitset (see selection.py; player engines only).
+        """
+        mask = np.ones(len(self.keys), dtype=bool)
+        if keys is not None:
+            mask &= np.isin(self.keys, list(keys))
+        if teams is not None:
+            mask &= np.isin(self.teams, list(teams))
+        if players is not None:
+            mask &= selection.rows_in(self.player_ids, players)
+        return mask
+
+    def ordered(self, ids):
+        """Order IDs by radar size (smallest first, so they are drawn on top)"""
+        ids = np.asarray(ids, dtype=int)
+        sizes = self.scores[ids].sum(axis=1)
+        return ids[np.argsort(sizes, kind="stable")]
+
+    def _band_trace(self, entity_id, slot):
+        """Build the shaded confidence ring of one entity drawn in a palette slot"""
+        lower = self.bands[0][entity_id].tolist()
+        upper = self.bands[1][entity_id].tolist()
+        theta = self.dimensions + [self.dimensions[0]]
+
+        # Around the upper bound, then back around the lower bound: the fill is the ring between
+        return go.Scatterpolar(
+            r=upper + upper[:1] + (lower + lower[:1])[::-1],
+            theta=theta + theta[::-1],
+            fill='toself',
+            meta="score",
+            name=f"{self.labels[entity_id]} ({bootstrap.CONFIDENCE:.0%} band)",
+            line=dict(width=0),
+            fillcolor=BAND_COLORS[slot % len(BAND_COLORS)],
+            showlegend=False,
+            hoverinfo="skip"
+        )
+
+    def _entity_traces(self, entity_id, slot):
+        """Build the traces of one entity drawn in a palette slot (ring, fill, markers)"""
+        raw = self.scores[entity_id].tolist()
+        row = raw + raw[:1]  # close the loop
+        theta = self.dimensions + [self.dimensions[0]]
+        label = self.labels[entity_id]
+        fill_color, line_color = COLOR_PAIRS[slot % len(COLOR_PAIRS)]
+
+        # Radar trace with visible lines and transparent fills
+        fill_trace = go.Scatterpolar(
+            r=row,
+            theta=theta,
+            fill='toself',
+            meta="score",
+            name=label,
+            line=dict(
+                color=line_color,
+                width=1.5
+            ),
+            fillcolor=fill_color,
+            text=self._hover_text(entity_id, raw) + [""],
+            hoverinfo="text+name"
+        )
+
+        # Dots at each point for better readability
+        marker_trace = go.Scatterpolar(
+            r=row,
+            theta=theta,
+            mode='markers',
+            marker=dict(
+                symbol='circle',
+                size=6,
+                color=line_color,
+                line=dict(color='white', width=1)
+            ),
+            name=f"{label} (points)",
+            meta="score",
+            showlegend=False,
+            hoverinfo="skip"
+        )
+        if self.bands is None:
+            return fill_trace, marker_trace
+        return self._band_trace(entity_id, slot), fill_trace, marker_trace
+
+    def _hover_text(self, entity_id, raw):
+        """Get the hover text of each dimension of an entity"""
+        text = [f"{dim}: {val:.1f}" for dim, val in zip(self.dimensions, raw)]
+        if self.bands is not None:
+            text = [
+                f"{line} ({low:.1f}-{high:.1f})"
+                for line, low, high in zip(text, self.bands[0][entity_id], self.bands[1][entity_id])
+            ]
+        if self.notes is not None:
+            text = [f"{line}<br>{note}" if note else line for line, note in zip(text, self.notes[entity_id])]
+        return text
+
+    def traces(self, ids):
+        """Build the traces for the given IDs, ordered by size"""
+        traces = []
+        for slot, entity_id in enumerate(self.ordered(ids).tolist()):
+            traces.extend(self._entity_traces(entity_id, slot))
+        return traces
+
+    def patch_traces(self, previous, current, tick_formats=None):
+        """Build a Patch turning a figure drawn for `previous` into one for `current`
+
+        Both arguments are ordered ID lists (as returned by `ordered`). Inserted
+        traces are trimmed like full figures (see serialization.prepare) with
+        `tick_formats`. Returns None when a partial update is not possible and
+        the full figure is needed.
+        """
+        previous_set = set(previous)
+        current_set = set(current)
+
+        # Entities kept in both selections must already be in the right order
+        if [i for i in previous if i in current_set] != [i for i in current if i in previous_set]:
+            return None
+
+        patch = Patch()
+        stride = self.traces_per_entity
+        ring = 1 if self.bands is not None else 0  # Offset of the fill trace
+
+        # Remove dropped entities, last first so earlier positions stay valid
+        for pos in range(len(previous) - 1, -1, -1):
+            if previous[pos] not in current_set:
+                for k in range(stride - 1, -1, -1):
+                    del patch['data'][stride * pos + k]
+
+        # Insert added entities at their final positions (ascending), and
+        # recolor kept entities whose palette slot changed with the new order
+        for pos, entity_id in enumerate(current):
+            if entity_id not in previous_set:
+                traces = serialization.prepare_traces(self._entity_traces(entity_id, pos), tick_formats or {})
+                for k, trace in enumerate(traces):
+                    patch['data'].insert(stride * pos + k, trace.to_plotly_json())
+            elif previous.index(entity_id) % len(COLOR_PAIRS) != pos % len(COLOR_PAIRS):
+                fill_color, line_color = COLOR_PAIRS[pos % len(COLOR_PAIRS)]
+                if ring:
+                    patch['data'][stride * pos]['fillcolor'] = BAND_COLORS[pos % len(BAND_COLORS)]
+                patch['data'][stride * pos + ring]['line']['color'] = line_color
+                patch['data'][stride * pos + ring]['fillcolor'] = fill_color
+                patch['data'][stride * pos + ring + 1]['marker']['color'] = line_color
+        return patch
+
+
+def _percentile_notes(index, scores, dimensions, groups=None):
+    """Get the percentile description of every (row, dimension) score"""
+    columns = [index.describe_many(dim, scores[dim].to_numpy(dtype=float), groups) for dim in dimensions]
+    return [list(row) for row in zip(*columns)]
+
+
+def _build_team_engine():
+    scores = data_utils.get_dataset("team_scores")
+    notes = _percentile_notes(percentiles.get_index("team"), scores, TEAM_DIMENSIONS)
+    return RadarEngine(scores, 'team', TEAM_DIMENSIONS, notes=notes, signature="team")
+
+
+def _build_player_engine():
+    scores = data_utils.get_dataset("player_scores").copy()
+    scores['label'] = scores['player'].astype(str) + " (" + scores['team'].astype(str) + ")"
+
+    # Player scores are ranked within the player's position group
+    index = percentiles.get_index("player")
+    groups = [index.group_of(key) for key in zip(scores['player'], scores['team'])]
+    notes = _percentile_notes(index, scores, PLAYER_DIMENSIONS, groups)
+    return RadarEngine(scores, 'player', PLAYER_DIMENSIONS, label_column='label', notes=notes, signature="player")
+
+
+def patch_update(engine, drawn, ids, tick_formats=None):
+    """Get (patch, state) for redrawing a radar with the ordered `ids`
+
+    `drawn` is the chart's state store: the dataset version and ordered IDs of
+    the entities currently on the figure, or None when it shows a message.
+    The patch is None when the full figure has to be sent. `tick_formats` are
+    the ones the view passes to serialization.prepare.
+    """
+    ids = [int(i) for i in ids]
+    state = {"version": f"{figure_cache.dataset_hash()}:{engine.signature}", "ids": ids}
+    if not drawn or drawn.get("version") != state["version"] or not drawn.get("ids"):
+        return None, state
+    return engine.patch_traces(drawn["ids"], ids, tick_formats), state
+
+
+def _build_default_weighted_engine(kind):
+    """Build the engine of a score kind computed on the fly with its default categories"""
+    return _build_weighted_engine(kind, scoring.equal_weights(scoring.DEFAULT_CATEGORIES[kind]))
+
+
+ENGINE_BUILDERS = {
+    "team": _build_team_engine,
+    "player": _build_player_engine,
+    # Players compared within their position group (DF/MF/FW)
+    "player_position": lambda: _build_default_weighted_engine("player_position"),
+    "goalkeeper": lambda: _build_default_weighted_engine("goalkeeper"),
+}
+
+
+@figure_cache.per_version(maxsize=4)
+def _build_engine(kind):
+    return ENGINE_BUILDERS[kind]()
+
+
+@figure_cache.per_version(maxsize=32)
+def _build_weighted_engine(kind, weights):
+    scores = scoring.weighted_scores(kind, weights).copy()
+    dimensions = [category for category, _ in weights]
+    signature = f"{kind}:{json.dumps(weights)}"
+    if kind == "team":
+        return RadarEngine(scores, 'team', dimensions, signature=signature)
+    scores['label'] = scores['player'].astype(str) + " (" + scores['team'].astype(str) + ")"
+    return RadarEngine(scores, 'player', dimensions, label_column='label', signature=signature)
+
+
+@figure_cache.per_version(maxsize=64)
+def _build_team_engine_as_of(kickoff_index, weights):
+    weights = weights or scoring.equal_weights(scoring.TEAM_CATEGORIES)
+    scores = scoring.compute_weighted_scores(timeline.team_data_as_of(kickoff_index), ['team'], weights)
+    dimensions = [category for category, _ in weights]
+    return RadarEngine(scores, 'team', dimensions, signature=f"team@{kickoff_index}:{json.dumps(weights)}")
+
+
+@figure_cache.per_version(maxsize=32)
+def _build_banded_engine(kind, weights):
+    engine = get_engine(kind, weights)
+    offsets = bootstrap.band_offsets(kind, weights or scoring.equal_weights(scoring.DEFAULT_CATEGORIES[kind]))
+    return engine.with_bands(offsets)
+
+
+def get_engine(kind, weights=None, as_of=None, bands=False):
+    """Get the shared radar engine of a score kind, built on first use
+
+    Kinds are "team", "player", "player_position" and "goalkeeper".
+
+    With `weights` (see scoring.parse_weights), the engine holds scores
+    recomputed for that weight configuration, memoized per configuration.
+    With `as_of` (a timeline kickoff index), team scores are recomputed from
+    the team data as of that kickoff. With `bands`, the engine draws
+    bootstrap confidence rings (end-of-tournament data only).
+    """
+    if kind == "team" and as_of is not None and not timeline.get_timeline().is_final(as_of):
+        return _build_team_engine_as_of(int(as_of), weights)
+    if bands:
+        return _build_banded_engine(kind, weights)
+    if weights:
+        return _build_weighted_engine(kind, weights)
+    return _build_engine(kind)
@@ -0,0 +1,97 @@
+"""
+Radar Weights Component
+
+This component lets analysts redefine the radar dimensions with a JSON
+category -> metric weight configuration. Valid configurations are kept in a
+store read by the radar callbacks, which recompute the scores on the fly
+(see scoring.weighted_scores); an empty configuration restores the
+default scores.
+"""
+
+import json
+
+from dash import Dash, dcc, html, Input, Output, State, ctx, no_update
+import dash_bootstrap_components as dbc
+
+from . import ids
+from . import scoring
+
+# Component ids of each radar's weights panel
+PANEL_IDS = {
+    "team": {
+        "input": ids.TEAM_RADAR_WEIGHTS_INPUT,
+        "apply": ids.TEAM_RADAR_WEIGHTS_APPLY,
+        "reset": ids.TEAM_RADAR_WEIGHTS_RESET,
+        "feedback": ids.TEAM_RADAR_WEIGHTS_FEEDBACK,
+        "store": ids.TEAM_RADAR_WEIGHTS_STORE,
+    },
+    "player": {
+        "input": ids.PLAYER_RADAR_WEIGHTS_INPUT,
+        "apply": ids.PLAYER_RADAR_WEIGHTS_APPLY,
+        "reset": ids.PLAYER_RADAR_WEIGHTS_RESET,
+        "feedback": ids.PLAYER_RADAR_WEIGHTS_FEEDBACK,
+        "store": ids.PLAYER_RADAR_WEIGHTS_STORE,
+    },
+}
+
+
+def get_weights(kind, config):
+    """Get the weights tuple of a stored configuration, or None for the default scores"""
+    if not config:
+        return None
+    try:
+        return scoring.parse_weights(kind, config)
+    except ValueError:
+        return None
+
+
+def render(app: Dash, kind: str) -> html.Div:
+    """Create the custom weights panel of the "team" or "player" radar"""
+    panel_ids = PANEL_IDS[kind]
+    example = json.dumps(scoring.default_weights(kind), indent=1)
+
+    layout = html.Details([
+        html.Summary("Custom dimension weights", className="small fw-bold"),
+        html.P(
+            "Map each radar dimension to {metric: weight} (or a list of metrics for equal weights). "
+            "Leave empty for the default scores.",
+            className="small text-muted mb-1"
+        ),
+        dcc.Textarea(
+            id=panel_ids["input"],
+            placeholder=example,
+            style={'width': '100%', 'height': '140px', 'font-family': 'monospace', 'font-size': '12px'}
+        ),
+        html.Div([
+            dbc.Button("Apply", id=panel_ids["apply"], color="primary", size="sm", className="me-2"),
+            dbc.Button("Reset", id=panel_ids["reset"], color="secondary", size="sm", outline=True),
+        ], className="mb-1"),
+        html.Div(id=panel_ids["feedback"], className="small"),
+        dcc.Store(id=panel_ids["store"])
+    ], className="px-2 mb-2")
+
+    @app.callback(
+        Output(panel_ids["store"], 'data'),
+        Output(panel_ids["feedback"], 'children'),
+        Output(panel_ids["input"], 'value'),
+        [
+            Input(panel_ids["apply"], 'n_clicks'),
+            Input(panel_ids["reset"], 'n_clicks')
+        ],
+        State(panel_ids["input"], 'value'),
+        prevent_initial_call=True
+    )
+    def apply_weights(apply_clicks, reset_clicks, text):
+        if ctx.triggered_id == panel_ids["reset"] or not (text or "").strip():
+            return None, html.Span("Using the default scores", className="text-muted"), ""
+
+        # Invalid configurations keep the current scores and explain the problem
+        try:
+            weights = scoring.parse_weights(kind, text)
+        except ValueError as e:
+            return no_update, html.Span(str(e), className="text-danger"), no_update
+
+        dimensions = ", ".join(category for category, _ in weights)
+        return json.loads(text), html.Span(f"Applied: {dimensions}", className="text-success"), no_update
+
+    return layout
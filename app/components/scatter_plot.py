@@ -7,45 +7,12 @@ from dash import Dash, dcc
 from dash.dependencies import Input, Output
 from . import ids
 from . import data_utils
-
-# Load cleaned team data
-TEAM_DATA = pd.read_csv("data/cleaned/team_data_clean.csv")
-
-# -----------------------------------------------------------------------------
-# Add tournament stage information if it is missing
-# The stage values correspond to the dropdown in `filter.py`:
-#   1 = Group Stage (all teams)
-#   2 = Round of 16
-#   3 = Quarter Finals
-#   4 = Semi Finals
-#   5 = Third Place
-#   6 = Finals
-# We derive the stage reached for each team based on the number of games played
-# (and a small manual mapping for the last four teams that all played 7 games).
-# -----------------------------------------------------------------------------
-if "stage" not in TEAM_DATA.columns:
-    finals_teams = {"Argentina", "France"}
-    third_place_teams = {"Croatia", "Morocco"}
-
-    def _determine_stage(row):
-        team = row["team"]
-        if team in finals_teams:
-            return 6  # Finals (Champion / Runner-up)
-        if team in third_place_teams:
-            return 5  # Third-place match contestants
-
-        games = int(row["games"])
-        if games >= 6:
-            # Safety fallback – should not happen for 2022 World Cup data
-            return 4  # Semi Finals
-        if games == 5:
-            return 3  # Quarter Finals
-        if games == 4:
-            return 2  # Round of 16
-        # Default: eliminated in the group stage
-        return 1
-
-    TEAM_DATA["stage"] = TEAM_DATA.apply(_determine_stage, axis=1)
+from . import figure_cache
+from . import filter_engine
+from . import head_to_head
+from . import selection
+from . import single_flight
+from . import timeline
 
 # Add jitter to avoid overlapping points
 JITTER_AMOUNT = 0.01
@@ -61,22 +28,30 @@ def render(app: Dash) -> dcc.Graph:
         [
             Input(ids.X_AXIS_DROPDOWN, "value"),
             Input(ids.Y_AXIS_DROPDOWN, "value"),
-            Input(ids.FILTER, "value")
+            Input(ids.FILTER, "value"),
+            Input(ids.METRIC_FILTER_STORE, "data")
         ],
         # Remove teams_dropdown as input to avoid circular dependency
     )
-    def update_scatter(x_col, y_col, filter_val):
-        # Start with a copy of the data
-        df = TEAM_DATA.copy()
+    def update_scatter(x_col, y_col, filter_val, metric_predicates=None):
+        # Start with a copy of the data (tournament stage is added by data_utils)
+        df = data_utils.get_dataset("team_data").copy()
         
         # Apply tournament stage filter – show teams that reached AT LEAST the
         # selected stage. 0 = All teams (no filtering).
         filtered_df = df.copy()
         if filter_val > 0:
             filtered_df = df[df["stage"] >= filter_val]
+
+        # Apply the metric range predicates (compiled to masks by the filter engine)
+        if metric_predicates:
+            filtered_df = filtered_df[filtered_df["team"].isin(filter_engine.filter_teams(metric_predicates))]
         
         # Store the list of filtered teams for other components to use
-        filtered_teams = filtered_df["team"].unique().tolist()
+        # (None when no filter is active, so an empty list means "no team matches")
+        filtered_teams = None
+        if filter_val > 0 or metric_predicates:
+            filtered_teams = filtered_df["team"].unique().tolist()
         
         # Create a figure with custom traces for better accessibility
         fig = go.Figure()
@@ -122,14 +97,19 @@ def render(app: Dash) -> dcc.Graph:
             Input(ids.TEAMS_DROPDOWN, "value"),
             Input(ids.FILTERED_TEAMS_STORE, "data"),
             Input(ids.X_AXIS_DROPDOWN, "value"),
-            Input(ids.Y_AXIS_DROPDOWN, "value")
+            Input(ids.Y_AXIS_DROPDOWN, "value"),
+            Input(ids.TIMELINE_SLIDER, "value")
         ],
         prevent_initial_call=True
     )
-    def update_scatter_team_selection(selected_teams, filtered_teams, x_col, y_col):
-        # Start with a copy of the data for teams that pass the filter
-        df = TEAM_DATA.copy()
-        filtered_df = df[df["team"].isin(filtered_teams)].copy()
+    @single_flight.single_flight("scatter")
+    @figure_cache.cached("scatter")
+    def update_scatter_team_selection(selected_teams, filtered_teams, x_col, y_col, as_of=None):
+        # Start with the data (as of the timeline kickoff) plus the opponent-adjusted
+        # metrics for teams that pass the filter
+        df = head_to_head.with_adjusted_metrics(timeline.team_data_as_of(as_of))
+        filtered_df = df if filtered_teams is None else df[df["team"].isin(filtered_teams)]
+        filtered_df = filtered_df.copy()
         
         # Add jitter to avoid point overlap
         filtered_df["x"] = add_jitter(filtered_df[x_col])
@@ -174,8 +154,11 @@ def render(app: Dash) -> dcc.Graph:
             )
             return fig
         
+        # Team IDs travel with the points, so box/lasso selections emit IDs
+        team_ids = selection.get_universe("team").ids_of(teams_to_show).tolist()
+
         # Create one trace per team for better control of appearance
-        for team in teams_to_show:
+        for team, team_id in zip(teams_to_show, team_ids):
             team_df = filtered_df[filtered_df["team"] == team]
             if team_df.empty:
                 continue
@@ -197,6 +180,7 @@ def render(app: Dash) -> dcc.Graph:
                 ),
                 name=team,
                 text=team,
+                customdata=[[team_id]] * len(team_df),
                 hovertemplate=f"<b>{team}</b><br>{x_col}: %{{x:.2f}}<br>{y_col}: %{{y:.2f}}<extra></extra>"
             ))
         
@@ -214,6 +198,7 @@ def render(app: Dash) -> dcc.Graph:
             height=600,  # Set fixed height
             plot_bgcolor='rgba(250, 250, 250, 0.9)',  # Light background
             font=dict(size=12),  # Larger font
+            dragmode='select',  # Box select by default (lasso and zoom in the mode bar)
             legend=dict(
                 itemsizing='constant',  # Make legend symbols consistent size
                 borderwidth=1,  # Add border to legend
@@ -225,6 +210,16 @@ def render(app: Dash) -> dcc.Graph:
 
         return fig
 
+    # A redrawn scatter starts without a box/lasso selection, so a stale one
+    # does not keep narrowing the other views
+    @app.callback(
+        Output(ids.SCATTER_PLOT, "selectedData"),
+        Input(ids.SCATTER_PLOT, "figure"),
+        prevent_initial_call=True
+    )
+    def clear_scatter_selection(figure):
+        return None
+
     return dcc.Graph(
         id=ids.SCATTER_PLOT,
         config={'displayModeBar': True, 'scrollZoom': True},
@@ -0,0 +1,419 @@
+"""
+Performance Scores for FIFA Visual Analysis
+
+This module computes the radar scores of teams and players from the cleaned
+data. Each radar dimension (category) averages the min-max normalized values
+of its metrics on a 1-10 scale. Normalization is vectorized over the whole
+metric matrix and category averages are one matrix product with a
+metric x category membership matrix, so scores regenerate in well under a
+second.
+
+The category -> metrics mappings are plain dicts and can be replaced, e.g.
+`compute_team_scores(categories={...})`. For custom weights at request time
+(`weighted_scores`), every candidate metric is normalized once per dataset
+version and cached, so a new weight configuration costs one matrix product.
+
+Score kinds:
+- "team": all teams, normalized across teams
+- "player": outfield players, normalized across all of them
+- "player_position": outfield players, normalized within their position
+  group (DF/MF/FW) with a single groupby().transform pass
+- "goalkeeper": goalkeepers, from the player_keepers/player_keepersadv rows
+
+Regenerate the radar CSVs from the project root with:
+    python -m app.components.scoring
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import data_utils
+from . import figure_cache
+
+TEAM_CATEGORIES = {
+    'Offensive': ['goals_per90', 'xg_per90'],
+    'Defensive': ['tackles', 'interceptions'],
+    'Cohesion': ['possession', 'passes_pct'],
+    'Efficiency': ['xg_net', 'xg_assist_per90'],
+    'Discipline': ['cards_yellow', 'fouls', 'avg_age']
+}
+
+PLAYER_CATEGORIES = {
+    'Scoring Threat': ['goals_per90', 'xg_per90', 'shots_on_target_per90'],
+    'Chance Creation': ['assists_per90', 'gca_per90', 'sca_per90', 'passes_into_final_third'],
+    'Build-up Play': ['passes_pct', 'progressive_passes', 'touches'],
+    'Defensive Workrate': ['tackles', 'interceptions', 'clearances', 'blocks'],
+    'Discipline & Physical': ['cards_yellow', 'fouls', 'aerials_won_pct', 'age']
+}
+
+GOALKEEPER_CATEGORIES = {
+    'Shot Stopping': ['gk_save_pct', 'gk_psxg_net_per90'],
+    'Clean Sheets': ['gk_clean_sheets_pct'],
+    'Distribution': ['gk_passes_pct_launched', 'gk_passes_length_avg'],
+    'Sweeping': ['gk_def_actions_outside_pen_area_per90', 'gk_avg_distance_def_actions'],
+    'Cross Claiming': ['gk_crosses_stopped_pct']
+}
+
+# Players are scored from their player_stats.csv rows (one per outfield player)
+PLAYER_BASE_SOURCE = "player_stats.csv"
+
+# Goalkeepers are scored from the rows of these source files
+GOALKEEPER_SOURCES = ["player_keepers.csv", "player_keepersadv.csv"]
+
+# Players with less than this share of the scoring metrics available are dropped
+MIN_AVAILABILITY = 0.8
+
+SCORE_MIN = 1
+SCORE_MAX = 10
+
+OUTPUT_FILES = {
+    "team": "team_performance_scores.csv",
+    "player": "player_performance_scores.csv",
+    "goalkeeper": "goalkeeper_performance_scores.csv",
+}
+
+
+def category_metrics(categories):
+    """Get the distinct metrics used by the categories, in first-use order"""
+    return list(dict.fromkeys(m for metrics in categories.values() for m in metrics))
+
+
+def weight_matrix(weights, metrics):
+    """Get the (metrics x categories) matrix of metric weights per category
+
+    `weights` is a sequence of (category, ((metric, weight), ...)) pairs.
+    """
+    position = {metric: i for i, metric in enumerate(metrics)}
+    matrix = np.zeros((len(metrics), len(weights)))
+    for j, (_, members) in enumerate(weights):
+        for metric, weight in members:
+            matrix[position[metric], j] = weight
+    return matrix
+
+
+def membership_matrix(categories, metrics):
+    """Get the (metrics x categories) matrix with 1 where a metric belongs to a category"""
+    return weight_matrix(equal_weights(categories), metrics)
+
+
+def normalize(values):
+    """Min-max normalize each column of a matrix to [0, 1], keeping NaNs
+
+    Columns without variation are set to 0.5.
+    """
+    with np.errstate(invalid="ignore"):
+        mins = np.nanmin(values, axis=0)
+        spans = np.nanmax(values, axis=0) - mins
+    varying = spans > 0
+    normalized = np.full(values.shape, 0.5)
+    normalized[:, varying] = (values[:, varying] - mins[varying]) / spans[varying]
+    return normalized
+
+
+def normalize_by_group(values, groups):
+    """Min-max normalize each column of a matrix within each group, keeping NaNs
+
+    All groups are handled in one groupby().transform pass. Columns without
+    variation inside a group are set to 0.5 for that group.
+    """
+    mins, spans = normalization_bounds(values, groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normalized = np.where(spans > 0, (values - mins) / spans, 0.5)
+    return np.where(np.isnan(values), np.nan, normalized)
+
+
+def normalization_bounds(values, groups=None):
+    """Get the (mins, spans) a matrix is min-max normalized with
+
+    Without groups they are per column; with groups they are per row, taken
+    over the row's group.
+    """
+    if groups is None:
+        with np.errstate(invalid="ignore"):
+            mins = np.nanmin(values, axis=0)
+            return mins, np.nanmax(values, axis=0) - mins
+    grouped = pd.DataFrame(values).groupby(np.asarray(groups), sort=False)
+    mins = grouped.transform('min').to_numpy(dtype=float)
+    return mins, grouped.transform('max').to_numpy(dtype=float) - mins
+
+
+def category_scores(normalized, membership):
+    """Average the available normalized metrics of each category, scaled to 1-10
+
+    `membership` may hold weights instead of 0/1, giving weighted averages.
+    """
+    available = ~np.isnan(normalized)
+    totals = np.nan_to_num(normalized) @ membership
+    counts = available.astype(float) @ membership
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / counts
+    return means * (SCORE_MAX - SCORE_MIN) + SCORE_MIN
+
+
+def score_frame(frame, key_columns, categories, group_column=None):
+    """Score every row of a frame holding the category metrics as columns
+
+    With a `group_column`, metrics are normalized within each group.
+    """
+    metrics = category_metrics(categories)
+    values = frame[metrics].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    normalized = normalize_by_group(values, frame[group_column]) if group_column else normalize(values)
+    scores = category_scores(normalized, membership_matrix(categories, metrics))
+
+    result = frame[key_columns].reset_index(drop=True)
+    return pd.concat([result, pd.DataFrame(scores, columns=list(categories))], axis=1)
+
+
+def team_metric_frame(team_data, categories=TEAM_CATEGORIES):
+    """Get the team rows with the metrics needed by the categories"""
+    return team_data[['team'] + category_metrics(categories)]
+
+
+def player_metric_frame(player_data, categories=PLAYER_CATEGORIES, min_availability=MIN_AVAILABILITY, metrics=None):
+    """Get one row per outfield player with the metrics needed by the categories
+
+    player_data_clean.csv stacks one row per player and source file, and each
+    metric is only filled in the rows of its source file. The player_stats.csv
+    rows are indexed by (player, team) and joined once with the first non-null
+    value of every metric across all source files. `metrics` adds columns to
+    keep beyond the category metrics.
+    """
+    columns = list(dict.fromkeys(category_metrics(categories) + list(metrics or [])))
+    metrics = [m for m in columns if m != 'age']
+
+    base = player_data[
+        (player_data['source_file'] == PLAYER_BASE_SOURCE) & (player_data['position'] != 'GK')
+    ].set_index(['player', 'team'])[['age', 'position']]
+    # Whole years, from the "years-days" age format
+    base['age'] = pd.to_numeric(base['age'].astype(str).str.extract(r'(\d+)', expand=False), errors='coerce')
+
+    wide = player_data.groupby(['player', 'team'], sort=False)[metrics].first()
+    frame = base.join(wide, how='left').reset_index()
+
+    # Drop players with too little of the data available
+    available = frame[category_metrics(categories)].notna().mean(axis=1)
+    return frame[available >= min_availability].reset_index(drop=True)
+
+
+def goalkeeper_metric_frame(player_data, categories=GOALKEEPER_CATEGORIES, min_availability=MIN_AVAILABILITY, metrics=None):
+    """Get one row per goalkeeper with the metrics needed by the categories
+
+    Goalkeeping metrics only exist in the player_keepers/player_keepersadv
+    rows; each (player, team) takes the first non-null value of every metric.
+    """
+    columns = list(dict.fromkeys(category_metrics(categories) + list(metrics or [])))
+    keepers = player_data[player_data['source_file'].isin(GOALKEEPER_SOURCES)]
+    frame = keepers.groupby(['player', 'team'], sort=False)[columns].first().reset_index()
+
+    # Drop goalkeepers with too little of the data available
+    available = frame[category_metrics(categories)].notna().mean(axis=1)
+    return frame[available >= min_availability].reset_index(drop=True)
+
+
+def compute_team_scores(team_data=None, categories=TEAM_CATEGORIES):
+    """Compute the team radar scores (one row per team)"""
+    if team_data is None:
+        team_data = data_utils.load_team_data()
+    return score_frame(team_metric_frame(team_data, categories), ['team'], categories)
+
+
+def compute_player_scores(player_data=None, categories=PLAYER_CATEGORIES, min_availability=MIN_AVAILABILITY, by_position=False):
+    """Compute the player radar scores (one row per outfield player)
+
+    With `by_position`, players are only compared with their own position group.
+    """
+    if player_data is None:
+        player_data = data_utils.load_player_data()
+    frame = player_metric_frame(player_data, categories, min_availability)
+    return score_frame(frame, ['player', 'team'], categories, group_column='position' if by_position else None)
+
+
+def compute_goalkeeper_scores(player_data=None, categories=GOALKEEPER_CATEGORIES, min_availability=MIN_AVAILABILITY):
+    """Compute the goalkeeper radar scores (one row per goalkeeper)"""
+    if player_data is None:
+        player_data = data_utils.load_player_data()
+    frame = goalkeeper_metric_frame(player_data, categories, min_availability)
+    return score_frame(frame, ['player', 'team'], categories)
+
+
+def equal_weights(categories):
+    """Get the weights of a category -> metrics mapping with every metric weighted 1"""
+    return tuple((category, tuple((metric, 1.0) for metric in metrics)) for category, metrics in categories.items())
+
+
+# Default category -> metrics mapping of each score kind
+DEFAULT_CATEGORIES = {
+    "team": TEAM_CATEGORIES,
+    "player": PLAYER_CATEGORIES,
+    "player_position": PLAYER_CATEGORIES,
+    "goalkeeper": GOALKEEPER_CATEGORIES,
+}
+
+
+def default_weights(kind):
+    """Get the default weight configuration of a score kind as a JSON-ready dict"""
+    return {category: {metric: 1 for metric in metrics} for category, metrics in DEFAULT_CATEGORIES[kind].items()}
+
+
+def candidate_metrics(kind):
+    """Get the metrics custom weights can use for a score kind"""
+    return normalized_pool(kind)[1]
+
+
+def parse_weights(kind, config):
+    """Validate a weight configuration and get it as a hashable weights tuple
+
+    `config` maps each category to either a list of metrics (equal weights)
+    or a {metric: weight} dict; it may also be given as a JSON string.
+    Raises ValueError with a readable message when the configuration is invalid.
+    """
+    if isinstance(config, str):
+        try:
+            config = json.loads(config)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(config, dict) or not config:
+        raise ValueError("Expected an object mapping categories to metrics")
+
+    known = set(candidate_metrics(kind))
+    weights = []
+    for category, members in config.items():
+        if isinstance(members, list):
+            members = {metric: 1 for metric in members}
+        if not isinstance(members, dict) or not members:
+            raise ValueError(f"Category '{category}' needs a list of metrics or a {{metric: weight}} object")
+        pairs = []
+        for metric, weight in members.items():
+            if metric not in known:
+                raise ValueError(f"Unknown metric '{metric}' in category '{category}'")
+            if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight < 0:
+                raise ValueError(f"Weight of '{metric}' in '{category}' must be a non-negative number")
+            if weight > 0:
+                pairs.append((metric, float(weight)))
+        if not pairs:
+            raise ValueError(f"Category '{category}' has no metric with a positive weight")
+        weights.append((str(category), tuple(pairs)))
+    return tuple(weights)
+
+
+def compute_weighted_scores(frame, key_columns, weights):
+    """Score the rows of a frame holding the weighted metrics as columns (see parse_weights)"""
+    metrics = list(dict.fromkeys(metric for _, members in weights for metric, _ in members))
+    values = frame[metrics].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    scores = category_scores(normalize(values), weight_matrix(weights, metrics))
+
+    result = frame[key_columns].reset_index(drop=True)
+    return pd.concat([result, pd.DataFrame(scores, columns=[category for category, _ in weights])], axis=1)
+
+
+def metric_pool(kind):
+    """Get (keys frame, metrics, values matrix, groups) over every candidate metric
+
+    `groups` holds the normalization group of each row, or None when all rows
+    are normalized together. Computed once per dataset version and shared
+    between requests; nothing may be modified.
+    """
+    return _metric_pool(kind)
+
+
+def normalized_pool(kind):
+    """Get (keys frame, metrics, normalized matrix) over every candidate metric
+
+    The matrix is computed once per dataset version and shared between
+    requests; it must not be modified.
+    """
+    return _normalized_pool(kind)
+
+
+@figure_cache.per_version(maxsize=8)
+def _metric_pool(kind):
+    if kind == "team":
+        frame = data_utils.get_dataset("team_data").drop(columns=["stage"], errors="ignore")
+        key_columns = ['team']
+        metrics = list(frame.select_dtypes(include="number").columns)
+    elif kind == "goalkeeper":
+        player_data = data_utils.get_dataset("player_data")
+        numeric = [c for c in player_data.select_dtypes(include="number").columns if c.startswith('gk_')]
+        frame = goalkeeper_metric_frame(player_data, metrics=numeric)
+        key_columns = ['player', 'team']
+        metrics = numeric
+    else:
+        player_data = data_utils.get_dataset("player_data")
+        numeric = [c for c in player_data.select_dtypes(include="number").columns if c != 'age']
+        frame = player_metric_frame(player_data, metrics=numeric)
+        key_columns = ['player', 'team']
+        metrics = ['age'] + numeric
+
+    values = frame[metrics].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    groups = frame['position'].to_numpy() if kind == "player_position" else None
+    return frame[key_columns].reset_index(drop=True), metrics, values, groups
+
+
+@figure_cache.per_version(maxsize=8)
+def _normalized_pool(kind):
+    keys, metrics, values, groups = _metric_pool(kind)
+    normalized = normalize_by_group(values, groups) if groups is not None else normalize(values)
+    return keys, metrics, normalized
+
+
+def weighted_scores(kind, weights):
+    """Get the scores of a score kind for a weights tuple (see parse_weights)
+
+    Results are memoized per weight configuration and dataset version.
+    """
+    return _weighted_scores(kind, weights)
+
+
+@figure_cache.per_version(maxsize=64)
+def _weighted_scores(kind, weights):
+    keys, metrics, normalized = _normalized_pool(kind)
+    scores = category_scores(normalized, weight_matrix(weights, metrics))
+    categories = [category for category, _ in weights]
+    return pd.concat([keys, pd.DataFrame(scores, columns=categories)], axis=1)
+
+
+SCORE_BUILDERS = {
+    "team": compute_team_scores,
+    "player": compute_player_scores,
+    "goalkeeper": compute_goalkeeper_scores,
+}
+
+
+def use_computed_scores():
+    """Make the app compute the radar scores from the cleaned data instead of reading the CSVs"""
+    data_utils.DATASET_LOADERS["team_scores"] = compute_team_scores
+    data_utils.DATASET_LOADERS["player_scores"] = compute_player_scores
+
+
+def write_scores(kinds=("team", "player"), output_dir=data_utils.DATA_PATH, by_position=False):
+    """Compute the scores and write them to CSV, returning the written paths"""
+    paths = []
+    for kind in kinds:
+        path = os.path.join(output_dir, OUTPUT_FILES[kind])
+        if kind == "player":
+            scores = compute_player_scores(by_position=by_position)
+        else:
+            scores = SCORE_BUILDERS[kind]()
+        scores.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate the team, player and goalkeeper radar score CSVs")
+    parser.add_argument("--kind", choices=list(OUTPUT_FILES) + ["all"], default="all")
+    parser.add_argument("--output-dir", default=data_utils.DATA_PATH)
+    parser.add_argument("--by-position", action="store_true", help="normalize player metrics within position groups")
+    args = parser.parse_args(argv)
+
+    kinds = list(OUTPUT_FILES) if args.kind == "all" else [args.kind]
+    for path in write_scores(kinds, args.output_dir, args.by_position):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Selection Layer for FIFA Visual Analysis
+
+Team and player sets are passed between views as bitsets over integer IDs
+(the position of a team, or of a (player, team) pair, in the sorted
+universe of the current dataset version) instead of lists of names.
+Bitsets are Python ints, so combining selections is a single `&`; they
+convert to boolean NumPy masks for array lookups and are stored in
+dcc.Store components as hex strings. Player bitsets are derived from team
+bitsets with one gather (`players_of`), and engines holding (player, team)
+rows keep their player IDs to mask rows with `rows_in`.
+
+The combined team selection lives in SELECTION_STORE:
+- "dropdown": the teams picked in the global teams dropdown
+- "filters": stage/metric filters AND scatter box-select AND PCP brushing
+  (null when nothing constrains the teams)
+- "teams": dropdown AND filters
+
+Views read it with `selected_teams` / `available_teams` /
+`available_players` rather than re-filtering name lists.
+"""
+
+import numpy as np
+from dash import Dash, Input, Output
+
+from . import data_utils
+from . import figure_cache
+from . import ids
+
+
+class Universe:
+    """Integer IDs of a sorted set of keys, with bitset conversions"""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.all = (1 << len(self.keys)) - 1
+
+    def bits(self, keys):
+        """Get the bitset of the given keys (unknown keys are ignored)"""
+        bits = 0
+        for key in keys or []:
+            i = self.index.get(key)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    def from_mask(self, mask):
+        """Get the bitset of a boolean array over the IDs"""
+        return int.from_bytes(np.packbits(np.asarray(mask, dtype=bool), bitorder="little").tobytes(), "little")
+
+    def from_ids(self, id_list):
+        """Get the bitset of the given integer IDs"""
+        bits = 0
+        for i in id_list or []:
+            if 0 <= int(i) < len(self.keys):
+                bits |= 1 << int(i)
+        return bits
+
+    def mask(self, bits):
+        """Get a boolean array over the IDs with True for members"""
+        if not bits:
+            return np.zeros(len(self.keys), dtype=bool)
+        raw = np.frombuffer(bits.to_bytes((len(self.keys) + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder="little")[:len(self.keys)].astype(bool)
+
+    def ids(self, bits):
+        """Get the integer IDs of a bitset in ascending order"""
+        return np.flatnonzero(self.mask(bits)).tolist()
+
+    def names(self, bits):
+        """Get the keys of a bitset in universe order"""
+        return [self.keys[i] for i in self.ids(bits)]
+
+    def ids_of(self, keys):
+        """Get the ID of every key as an int array (-1 for unknown keys)"""
+        return np.array([self.index.get(key, -1) for key in keys], dtype=int)
+
+
+def intersect(*bitsets):
+    """Intersect bitsets, where None stands for "no constraint" (None if all are None)"""
+    result = None
+    for bits in bitsets:
+        if bits is not None:
+            result = bits if result is None else result & bits
+    return result
+
+
+def encode(bits):
+    """Encode a bitset for a dcc.Store (None stays None)"""
+    return None if bits is None else format(bits, "x")
+
+
+def decode(value):
+    """Decode a bitset stored with `encode`"""
+    return None if value is None else int(value, 16)
+
+
+@figure_cache.per_version(maxsize=4)
+def _universe(kind):
+    if kind == "team":
+        return Universe(data_utils.get_team_names())
+    players = data_utils.get_dataset("player_data")[['player', 'team']].drop_duplicates()
+    return Universe(sorted(zip(players['player'].astype(str), players['team'].astype(str))))
+
+
+def get_universe(kind="team"):
+    """Get the "team" or "player" (player, team) universe of the current dataset version"""
+    return _universe(kind)
+
+
+@figure_cache.per_version()
+def _player_team_ids():
+    return get_universe("team").ids_of([team for _, team in get_universe("player").keys])
+
+
+def players_of(team_bits):
+    """Get the bitset of the players (player universe) of the teams in a team bitset"""
+    team_mask = get_universe("team").mask(team_bits)
+    team_ids = _player_team_ids()
+    return get_universe("player").from_mask((team_ids >= 0) & team_mask[np.maximum(team_ids, 0)])
+
+
+def rows_in(row_ids, bits, kind="player"):
+    """Get a boolean mask of rows, given their universe IDs (-1 if unknown), that are in a bitset"""
+    members = get_universe(kind).mask(bits)
+    row_ids = np.asarray(row_ids, dtype=int)
+    return (row_ids >= 0) & members[np.maximum(row_ids, 0)]
+
+
+def selected_teams(store):
+    """Get the bitset of teams picked in the dropdown and passing every filter"""
+    return decode((store or {}).get("teams")) or 0
+
+
+def available_teams(store):
+    """Get the bitset of teams views should draw from
+
+    The dropdown selection when there is one, otherwise every team passing
+    the filters.
+    """
+    store = store or {}
+    if decode(store.get("dropdown")):
+        return selected_teams(store)
+    filters = decode(store.get("filters"))
+    return get_universe("team").all if filters is None else filters
+
+
+def available_players(store):
+    """Get the bitset of the players of the teams views draw from (see available_teams)"""
+    return players_of(available_teams(store))
+
+
+def point_ids(selected_data):
+    """Get the integer IDs in the customdata of a box/lasso selection's points"""
+    point_ids = []
+    for point in (selected_data or {}).get("points") or []:
+        customdata = point.get("customdata")
+        if isinstance(customdata, list):
+            customdata = customdata[0] if customdata else None
+        if customdata is not None:
+            point_ids.append(customdata)
+    return point_ids
+
+
+def register_callbacks(app: Dash) -> None:
+    """Register the callback combining the team selections into SELECTION_STORE"""
+    @app.callback(
+        Output(ids.SELECTION_STORE, "data"),
+        [
+            Input(ids.TEAMS_DROPDOWN, "value"),
+            Input(ids.FILTERED_TEAMS_STORE, "data"),
+            Input(ids.SCATTER_PLOT, "selectedData"),
+            Input(ids.PCP_BRUSH_STORE, "data")
+        ]
+    )
+    def combine_selections(dropdown, filtered_teams, scatter_selection, pcp_brush):
+        universe = get_universe("team")
+
+        # Stage/metric filters (None means no filter, an empty list that no team matches)
+        stage = None if filtered_teams is None else universe.bits(filtered_teams)
+        # Teams inside the scatter box/lasso selection (points carry team IDs)
+        box = None
+        if scatter_selection and scatter_selection.get("points") is not None:
+            box = universe.from_ids(point_ids(scatter_selection))
+        # Teams inside every PCP brush
+        brushed = universe.from_ids(pcp_brush["ids"]) if pcp_brush and pcp_brush.get("ids") is not None else None
+
+        picked = universe.bits(dropdown)
+        filters = intersect(stage, box, brushed)
+        teams = picked if filters is None else picked & filters
+        return {"dropdown": encode(picked), "filters": encode(filters), "teams": encode(teams)}
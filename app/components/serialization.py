@@ -0,0 +1,163 @@
+"""
+Fast Figure Serialization for FIFA Visual Analysis
+
+This module provides an opt-in serialization path for callback responses.
+When enabled (FIFA_FAST_SERIALIZE=1) it:
+- switches Plotly's JSON engine to orjson when it is installed
+- rounds numeric arrays of each metric to a number of significant digits
+  derived from its tick format (plus a configurable number of guard digits)
+  before the figure is encoded
+
+With FIFA_SERIALIZE_REPORT=1 every prepared figure is also encoded the
+default way, and the payload-size and encode-time reduction is printed per view.
+"""
+
+import os
+import re
+import time
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard encoder
+    orjson = None
+
+FAST_SERIALIZE = os.environ.get("FIFA_FAST_SERIALIZE", "0") == "1"
+REPORT = os.environ.get("FIFA_SERIALIZE_REPORT", "0") == "1"
+GUARD_DIGITS = int(os.environ.get("FIFA_FLOAT_GUARD_DIGITS", 1))  # Significant digits kept beyond the tick format
+
+# Running totals per view: {view: {"count", "bytes_before", "bytes_after", "ms_before", "ms_after"}}
+STATS = {}
+
+
+def enable_fast_encoder():
+    """Make Plotly (and therefore Dash responses) encode JSON with orjson"""
+    if not FAST_SERIALIZE:
+        return False
+    if orjson is None:
+        print("FIFA_FAST_SERIALIZE is set but orjson is not installed; using the default encoder")
+        return False
+
+    import plotly.io as pio
+    pio.json.config.default_engine = "orjson"
+    return True
+
+
+def significant_digits(tick_format, values):
+    """Get the significant digits to keep for a metric's values, given its d3 tick format
+
+    Significant-digit formats ('.3s', '.3g', '.3r') give them directly; fixed
+    formats such as '.2f' or '.1%' are converted on the largest value, so no
+    value loses a displayed decimal.
+    """
+    match = re.search(r"\.(\d+)([a-z%]?)", tick_format or "")
+    precision = int(match.group(1)) if match else 1
+    kind = match.group(2) if match else "f"
+    if kind in ("g", "p", "r", "s"):
+        digits = precision
+    elif kind == "e":
+        digits = precision + 1
+    else:
+        if kind == "%":
+            precision += 2
+        arr = np.abs(np.asarray(values if values is not None else [], dtype=float))
+        arr = arr[np.isfinite(arr) & (arr > 0)]
+        magnitude = int(np.floor(np.log10(arr.max()))) + 1 if arr.size else 1
+        digits = precision + magnitude
+    return max(1, digits) + GUARD_DIGITS
+
+
+def _round(values, digits):
+    """Round a numeric sequence to significant digits, keeping None/NaN entries untouched"""
+    if values is None:
+        return None
+    arr = np.asarray(values, dtype=float)
+    out = arr.copy()
+    nonzero = np.isfinite(arr) & (arr != 0)
+    # Decimals per value; values share a few magnitudes, so round per group
+    decimals = np.zeros(arr.shape, dtype=int)
+    decimals[nonzero] = digits - 1 - np.floor(np.log10(np.abs(arr[nonzero]))).astype(int)
+    for d in np.unique(decimals[nonzero]):
+        rows = nonzero & (decimals == d)
+        out[rows] = np.round(arr[rows], d)
+    return out.tolist()
+
+
+def _trim(values, tick_format):
+    """Round a numeric sequence to the significant digits of its tick format"""
+    if values is None:
+        return None
+    return _round(values, significant_digits(tick_format, values))
+
+
+def trim_figure(fig, tick_formats):
+    """Round every metric-tagged numeric array in a figure (in place)
+
+    Parcoords dimensions are matched on their `name`, other traces on their
+    `meta` value, against the keys of `tick_formats`.
+    """
+    trim_traces(fig.data, tick_formats)
+    return fig
+
+
+def trim_traces(traces, tick_formats):
+    """Round every metric-tagged numeric array of some traces (in place, see trim_figure)"""
+    for trace in traces:
+        if trace.type == "parcoords":
+            for dim in trace.dimensions:
+                if dim.name not in tick_formats:
+                    continue
+                # Ticks and range keep the digits of the values they label
+                digits = significant_digits(tick_formats[dim.name], dim.values)
+                dim.values = _round(dim.values, digits)
+                dim.tickvals = _round(dim.tickvals, digits)
+                dim.range = _round(dim.range, digits)
+        elif isinstance(trace.meta, str) and trace.meta in tick_formats:
+            tick_format = tick_formats[trace.meta]
+            if trace.type == "scatterpolar":
+                trace.r = _trim(trace.r, tick_format)
+            else:
+                trace.y = _trim(trace.y, tick_format)
+    return traces
+
+
+def _encode(fig, engine):
+    """Encode a figure and return (size in bytes, time in ms)"""
+    from plotly.io.json import to_json_plotly
+    start = time.perf_counter()
+    payload = to_json_plotly(fig, engine=engine)
+    return len(payload.encode("utf-8")), (time.perf_counter() - start) * 1000
+
+
+def prepare_traces(traces, tick_formats):
+    """Apply the float trimming to traces sent without a figure (e.g. inserted by a Patch) if enabled"""
+    if FAST_SERIALIZE:
+        trim_traces(traces, tick_formats)
+    return traces
+
+
+def prepare(fig, view, tick_formats):
+    """Apply the fast serialization path to a callback figure if enabled"""
+    if not FAST_SERIALIZE:
+        return fig
+
+    if REPORT:
+        bytes_before, ms_before = _encode(fig, "json")
+
+    trim_figure(fig, tick_formats)
+
+    if REPORT:
+        bytes_after, ms_after = _encode(fig, "orjson" if orjson is not None else "json")
+        stats = STATS.setdefault(view, dict(count=0, bytes_before=0, bytes_after=0, ms_before=0.0, ms_after=0.0))
+        stats["count"] += 1
+        stats["bytes_before"] += bytes_before
+        stats["bytes_after"] += bytes_after
+        stats["ms_before"] += ms_before
+        stats["ms_after"] += ms_after
+        print(
+            f"[serialize] {view}: {bytes_before / 1024:.1f} KB -> {bytes_after / 1024:.1f} KB "
+            f"({100 * (1 - bytes_after / max(1, bytes_before)):.0f}% smaller), "
+            f"{ms_before:.1f} ms -> {ms_after:.1f} ms"
+        )
+    return fig
@@ -0,0 +1,167 @@
+"""
+Player Similarity Engine for FIFA Visual Analysis
+
+This module answers "which players are most similar to X" queries. Player
+profiles are stacked into a z-scored float matrix (one row per player), with
+squared row norms precomputed, so a query is one matrix-vector product plus
+an `argpartition` for the top-k instead of a scan over DataFrame rows.
+
+Two feature sets are available:
+- "radar": the five radar scores from player_performance_scores.csv
+- "per90": per-90 rates of counting stats from player_data_clean.csv, for
+  players with enough minutes for the rates to be meaningful
+
+Indexes are built on first use and rebuilt when the dataset version changes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import data_utils
+from . import figure_cache
+from . import radar_engine
+from . import selection
+
+# Counting stats turned into per-90 rates for the "per90" feature set
+PER90_METRICS = [
+    "goals", "shots", "shots_on_target", "xg", "npxg",
+    "assists", "xg_assist", "sca", "gca", "assisted_shots",
+    "passes_completed", "progressive_passes", "passes_into_final_third",
+    "passes_into_penalty_area", "crosses", "through_balls",
+    "touches", "dribbles_completed", "progressive_passes_received",
+    "tackles_won", "interceptions", "blocks", "clearances",
+    "ball_recoveries", "aerials_won", "fouls", "fouled",
+]
+
+# Below this many full matches, per-90 rates are too noisy to compare
+MIN_MINUTES_90S = 1.0
+
+FEATURE_SETS = {
+    "radar": "Radar profile",
+    "per90": "Per-90 metrics",
+}
+
+POSITIONS = ["GK", "DF", "MF", "FW"]
+
+
+class SimilarityIndex:
+    """Z-scored player profiles with a brute-force Euclidean top-k search"""
+
+    def __init__(self, frame, feature_columns):
+        frame = frame.reset_index(drop=True)
+        self.feature_columns = list(feature_columns)
+        self.keys = frame['player'].astype(str).to_numpy()
+        self.teams = frame['team'].astype(str).to_numpy()
+        self.positions = frame['position'].fillna("").astype(str).to_numpy()
+        # Player universe ID of every row (see selection.py)
+        self.player_ids = selection.get_universe("player").ids_of(zip(self.keys, self.teams))
+
+        values = frame[self.feature_columns].to_numpy(dtype=float)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[~(std > 0)] = 1.0  # constant columns carry no information
+        # Missing values sit at the column mean (0 after standardization)
+        self.matrix = np.nan_to_num((values - mean) / std)
+        self.sq_norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+
+        self.index = {}
+        for i, key in enumerate(self.keys):
+            self.index.setdefault(key, i)
+
+    def query(self, player, k=5, players=None, positions=None):
+        """Get the k players closest to `player`, optionally limited to a player bitset and positions
+
+        Returns a list of dicts with player, team, position and distance,
+        closest first. The reference player is never part of the results.
+        """
+        ref = self.index.get(player)
+        if ref is None or k <= 0:
+            return []
+
+        candidates = np.ones(len(self.keys), dtype=bool)
+        if players is not None:
+            candidates &= selection.rows_in(self.player_ids, players)
+        if positions:
+            candidates &= np.isin(self.positions, list(positions))
+        candidates[ref] = False
+        candidate_ids = np.flatnonzero(candidates)
+        if candidate_ids.size == 0:
+            return []
+
+        # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b
+        query = self.matrix[ref]
+        distances = self.sq_norms[candidate_ids] + self.sq_norms[ref] - 2 * (self.matrix[candidate_ids] @ query)
+        distances = np.sqrt(np.maximum(distances, 0))
+
+        k = min(k, candidate_ids.size)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top], kind="stable")]
+
+        return [
+            {
+                "player": self.keys[i],
+                "team": self.teams[i],
+                "position": self.positions[i],
+                "distance": float(d),
+            }
+            for i, d in zip(candidate_ids[top].tolist(), distances[top].tolist())
+        ]
+
+
+def load_player_profiles(minutes_floor=None):
+    """Get one row per (player, team) from the long player data, with per-90 rates
+
+    Rates need MIN_MINUTES_90S full matches; with `minutes_floor`, players
+    with fewer get their rates over `minutes_floor` matches instead.
+    """
+    df = data_utils.get_dataset("player_data")
+    if df is None:
+        return pd.DataFrame(columns=['player', 'team', 'position', 'minutes_90s'] + PER90_METRICS)
+
+    # Each source file contributes different columns; take the first non-null
+    columns = ['position', 'minutes_90s'] + [m for m in PER90_METRICS if m in df.columns]
+    profiles = df.groupby(['player', 'team'], sort=False)[columns].first().reset_index()
+
+    if minutes_floor is None:
+        minutes = profiles['minutes_90s'].where(profiles['minutes_90s'] >= MIN_MINUTES_90S)
+    else:
+        minutes = profiles['minutes_90s'].clip(lower=minutes_floor)
+    for metric in PER90_METRICS:
+        if metric in profiles.columns:
+            profiles[metric] = profiles[metric] / minutes
+        else:
+            profiles[metric] = np.nan
+    return profiles
+
+
+def _build_radar_index():
+    scores = data_utils.get_dataset("player_scores")
+    positions = load_player_profiles()[['player', 'team', 'position']]
+    frame = scores.merge(positions, on=['player', 'team'], how='left')
+    return SimilarityIndex(frame, radar_engine.PLAYER_DIMENSIONS)
+
+
+def _build_per90_index():
+    profiles = load_player_profiles()
+    profiles = profiles[profiles['minutes_90s'] >= MIN_MINUTES_90S]
+    return SimilarityIndex(profiles, PER90_METRICS)
+
+
+INDEX_BUILDERS = {
+    "radar": _build_radar_index,
+    "per90": _build_per90_index,
+}
+
+@figure_cache.per_version(maxsize=4)
+def _get_index(feature_set):
+    return INDEX_BUILDERS[feature_set]()
+
+
+def get_index(feature_set="radar"):
+    """Get the similarity index of a feature set for the current dataset version"""
+    return _get_index(feature_set)
+
+
+def similar_players(player, k=5, feature_set="radar", players=None, positions=None):
+    """Get the k players most similar to `player` (see SimilarityIndex.query)"""
+    return get_index(feature_set).query(player, k=k, players=players, positions=positions)
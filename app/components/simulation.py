@@ -0,0 +1,249 @@
+"""
+Tournament Simulator for FIFA Visual Analysis
+
+This module replays the tournament many times from the match xG. Every team
+gets an attack and a defence rate (xG for / against per match relative to
+the tournament mean, shrunk towards average by PRIOR_MATCHES pseudo-matches),
+and a side scores Poisson(mean xG * attack[team] * defence[opponent]) goals.
+
+The format is inferred from the match data:
+- the groups are the connected components of the group matches (1-48),
+  ranked on points, goal difference and goals scored, then by lot
+- each knockout match is fed by the group places or the earlier knockout
+  matches its two teams came from (the winner, or the loser for the
+  third-place match); drawn knockout matches go to extra time and then a
+  coin-flip shoot-out
+
+All runs are simulated at once as NumPy arrays, in chunks of CHUNK_SIZE runs
+seeded from one SeedSequence, so results only depend on the seed and the
+number of runs, not on how the chunks are spread over worker processes.
+Stage numbers match the filter dropdown (1 = group stage ... 6 = final).
+"""
+
+import concurrent.futures
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import figure_cache
+from . import matches
+
+SIMULATION_RUNS = int(os.environ.get("FIFA_SIMULATION_RUNS", 100_000))
+SIMULATION_WORKERS = int(os.environ.get("FIFA_SIMULATION_WORKERS", 1))  # >1 shards chunks over processes
+DEFAULT_SEED = 2022
+CHUNK_SIZE = 25_000  # Runs simulated per array batch (bounds memory)
+
+GROUP_MATCHES = 48  # Matches 1-48 are the group stage
+PRIOR_MATCHES = 2.0  # Pseudo-matches at the tournament mean added to every team's rates
+EXTRA_TIME_FRACTION = 1 / 3  # 30 minutes of extra time at the 90-minute scoring rates
+
+GROUP_STAGE = 1
+THIRD_PLACE_STAGE = 5
+FINAL_STAGE = 6
+
+# Probability columns of the results: stage -> column
+STAGE_COLUMNS = {
+    2: 'round_of_16',
+    3: 'quarter_finals',
+    4: 'semi_finals',
+    5: 'third_place',
+    6: 'final',
+}
+
+
+def _connected_groups(n_teams, home, away):
+    """Get the groups (arrays of team ids) formed by the teams that played each other"""
+    parent = list(range(n_teams))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for h, a in zip(home.tolist(), away.tolist()):
+        parent[find(h)] = find(a)
+
+    # Groups in the order of their first match
+    groups = {}
+    for team in dict.fromkeys(np.column_stack([home, away]).ravel().tolist()):
+        groups.setdefault(find(team), []).append(team)
+    return [np.array(group) for group in groups.values()]
+
+
+class TournamentModel:
+    """Scoring rates and the inferred format of the tournament"""
+
+    def __init__(self, table):
+        long = table.frame
+        self.teams = list(table.teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        n_teams = len(self.teams)
+
+        # expected[i, j] = goals team i is expected to score against team j
+        mean_xg = long['xg'].mean()
+        xg = long.groupby('team')[['xg', 'opp_xg']].agg(['sum', 'count']).reindex(self.teams)
+        attack = (xg[('xg', 'sum')] + PRIOR_MATCHES * mean_xg) / (xg[('xg', 'count')] + PRIOR_MATCHES) / mean_xg
+        defence = (xg[('opp_xg', 'sum')] + PRIOR_MATCHES * mean_xg) / (xg[('opp_xg', 'count')] + PRIOR_MATCHES) / mean_xg
+        self.expected = mean_xg * np.outer(attack.to_numpy(), defence.to_numpy())
+
+        # One row per match, from the home team's side
+        played = long[long['is_home']].sort_values('match')
+        numbers = played['match'].to_numpy()
+        home = played['team'].map(self.team_index).to_numpy()
+        away = played['opponent'].map(self.team_index).to_numpy()
+        home_goals = played['goals_for'].to_numpy()
+        away_goals = played['goals_against'].to_numpy()
+
+        group = numbers <= GROUP_MATCHES
+        self.group_home, self.group_away = home[group], away[group]
+        self.groups = _connected_groups(n_teams, self.group_home, self.group_away)
+
+        # Team-by-match incidence matrices turn per-match results into team tables
+        self.home_incidence = np.eye(n_teams)[self.group_home]
+        self.away_incidence = np.eye(n_teams)[self.group_away]
+
+        # The actual group places tell which places feed which knockout match
+        actual = self.group_places(home_goals[None, group], away_goals[None, group])
+        places = {}
+        for g, positions in enumerate(actual):
+            for place, team in enumerate(positions[0].tolist()):
+                places[team] = ('group', (g, place))
+        self.knockout = self._infer_bracket(
+            numbers[~group], home[~group], away[~group], home_goals[~group], away_goals[~group], places
+        )
+
+    def group_places(self, home_goals, away_goals, rng=None):
+        """Get the team ids of every group in finishing order, one (runs, teams) array per group"""
+        home_goals = np.nan_to_num(home_goals)
+        away_goals = np.nan_to_num(away_goals)
+        home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+        away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+
+        points = home_points @ self.home_incidence + away_points @ self.away_incidence
+        goal_diff = (home_goals - away_goals) @ self.home_incidence + (away_goals - home_goals) @ self.away_incidence
+        goals = home_goals @ self.home_incidence + away_goals @ self.away_incidence
+
+        # Points, then goal difference, then goals scored; the fraction draws lots
+        key = points * 10_000 + (goal_diff + 50) * 100 + goals
+        if rng is not None:
+            key = key + rng.random(key.shape)
+        return [group[np.argsort(-key[:, group], axis=1, kind='stable')] for group in self.groups]
+
+    @staticmethod
+    def _infer_bracket(numbers, home, away, home_goals, away_goals, sources):
+        """Get the knockout matches as (number, stage, home feeder, away feeder) in kickoff order
+
+        A feeder is ('group', (group, place)), ('winner', match) or ('loser', match).
+        """
+        remaining = [set(home[i + 1:].tolist()) | set(away[i + 1:].tolist()) for i in range(len(numbers))]
+        feeders = []
+        for i, number in enumerate(numbers.tolist()):
+            h, a = int(home[i]), int(away[i])
+            feeders.append((number, sources.get(h), sources.get(a)))
+
+            # The winner on the score, or (after a shoot-out) the team that plays on
+            if home_goals[i] > away_goals[i] or (h in remaining[i] and a not in remaining[i]):
+                winner, loser = h, a
+            else:
+                winner, loser = a, h
+            sources[winner] = ('winner', number)
+            sources[loser] = ('loser', number)
+
+        # Stages: one more than the feeders; the match after the semi-finals whose
+        # losers play on (the third-place match) is the final
+        losers_play_on = {key for _, *pair in feeders for kind, key in pair if kind == 'loser'}
+        stages = {}
+        bracket = []
+        for number, *pair in feeders:
+            stage = 1 + max(
+                GROUP_STAGE if kind == 'group' else stages[key] for kind, key in pair
+            )
+            if all(kind == 'winner' and key in losers_play_on for kind, key in pair):
+                stage += 1
+            stages[number] = min(stage, FINAL_STAGE)
+            bracket.append((number, stages[number], pair[0], pair[1]))
+        return bracket
+
+
+def _play_knockout(expected, a, b, rng):
+    """Get the (winners, losers) of knockout matches between team id arrays a and b"""
+    rate_a, rate_b = expected[a, b], expected[b, a]
+    goals_a, goals_b = rng.poisson(rate_a), rng.poisson(rate_b)
+
+    # Extra time for level matches, then a coin-flip shoot-out
+    level = goals_a == goals_b
+    goals_a = goals_a + level * rng.poisson(rate_a * EXTRA_TIME_FRACTION)
+    goals_b = goals_b + level * rng.poisson(rate_b * EXTRA_TIME_FRACTION)
+    a_wins = np.where(goals_a == goals_b, rng.random(len(a)) < 0.5, goals_a > goals_b)
+    return np.where(a_wins, a, b), np.where(a_wins, b, a)
+
+
+def _simulate_chunk(model, runs, seed):
+    """Simulate a batch of tournaments; get (stage-reach counts, title counts) per team"""
+    rng = np.random.default_rng(seed)
+    n_teams = len(model.teams)
+    rows = np.arange(runs)
+
+    home_goals = rng.poisson(model.expected[model.group_home, model.group_away], size=(runs, len(model.group_home)))
+    away_goals = rng.poisson(model.expected[model.group_away, model.group_home], size=(runs, len(model.group_home)))
+    places = model.group_places(home_goals, away_goals, rng)
+
+    # Highest stage reached by every team in every run
+    reached = np.full((runs, n_teams), GROUP_STAGE, dtype=np.int8)
+    results = {}
+    champions = None
+    for number, stage, *pair in model.knockout:
+        sides = [
+            places[key[0]][:, key[1]] if kind == 'group' else results[key][0 if kind == 'winner' else 1]
+            for kind, key in pair
+        ]
+        for teams in sides:
+            reached[rows, teams] = np.maximum(reached[rows, teams], stage)
+        results[number] = _play_knockout(model.expected, sides[0], sides[1], rng)
+        if stage == FINAL_STAGE:
+            champions = results[number][0]
+
+    reach = np.stack([(reached >= stage).sum(axis=0) for stage in STAGE_COLUMNS], axis=1)
+    titles = np.bincount(champions, minlength=n_teams) if champions is not None else np.zeros(n_teams, dtype=int)
+    return reach, titles
+
+
+@figure_cache.per_version()
+def get_model():
+    """Get the tournament model of the current dataset version (shared, read-only)"""
+    return TournamentModel(matches.get_match_table())
+
+
+def simulate(runs=SIMULATION_RUNS, seed=DEFAULT_SEED, workers=SIMULATION_WORKERS):
+    """Simulate the tournament; get one row per team with stage-reach and title probabilities"""
+    model = get_model()
+    chunks = [CHUNK_SIZE] * (runs // CHUNK_SIZE) + ([runs % CHUNK_SIZE] if runs % CHUNK_SIZE else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    if workers > 1 and len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_simulate_chunk, [model] * len(chunks), chunks, seeds))
+    else:
+        outcomes = [_simulate_chunk(model, size, chunk_seed) for size, chunk_seed in zip(chunks, seeds)]
+
+    reach = sum(outcome[0] for outcome in outcomes) / runs
+    titles = sum(outcome[1] for outcome in outcomes) / runs
+    df = pd.DataFrame(reach, columns=list(STAGE_COLUMNS.values()))
+    df.insert(0, 'team', model.teams)
+    df['champion'] = titles
+    return df
+
+
+@figure_cache.per_version(maxsize=4)
+def _stage_probabilities(runs, seed):
+    return simulate(runs, seed)
+
+
+def stage_probabilities(runs=SIMULATION_RUNS, seed=DEFAULT_SEED):
+    """Get the simulated stage-reach probabilities of the current dataset version
+
+    The frame is shared between callers and must not be modified.
+    """
+    return _stage_probabilities(runs, seed)
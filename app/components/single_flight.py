@@ -0,0 +1,65 @@
+"""
+Single-Flight Request Coalescing for FIFA Visual Analysis
+
+When many clients open the dashboard at the same time they fire identical
+callback requests. This module collapses concurrent calls with identical
+canonical inputs into one computation: the first caller builds the result and
+every other caller waits for it and shares it.
+
+Coalescing works across the threads of one worker process, so run gunicorn
+with threads (see the Procfile); the figure cache shares results across
+worker processes.
+"""
+
+import functools
+import threading
+
+from . import figure_cache
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def single_flight(name):
+    """Decorator coalescing concurrent identical calls into one computation"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = f"{name}|{figure_cache.canonical_inputs(args, kwargs)}"
+
+            with _flights_lock:
+                flight = _flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight()
+                    _flights[key] = flight
+
+            if not leader:
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+            try:
+                flight.result = func(*args, **kwargs)
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                # Remove the flight first so later calls start a fresh computation
+                with _flights_lock:
+                    _flights.pop(key, None)
+                flight.done.set()
+            return flight.result
+        return wrapper
+    return decorator
@@ -1,7 +1,12 @@
 """
 Stats Summary Component
 
-This component displays a table of statistics for the selected teams.
+This component displays a table of statistics for the selected teams,
+narrowed by the shared team selection (filters, scatter box/lasso select
+and PCP brushing, see selection.py), as of the timeline kickoff like the
+scatter plot. The formatted cells of every team are built once per dataset
+version and kickoff and indexed by team ID, so a table update is a list
+lookup per selected team.
 """
 
 from dash import Dash, html, dcc, Input, Output, callback, ctx
@@ -11,19 +16,18 @@ import numpy as np
 import os
 
 from . import ids
+from . import data_utils
+from . import figure_cache
+from . import percentiles
+from . import selection
+from . import timeline
 
 # Define the data path relative to the app root
 DATA_PATH = os.path.join('data', 'cleaned')  # Path to the data folder
 
 def load_team_data():
-    """Load team data from CSV file"""
-    try:
-        file_path = os.path.join(DATA_PATH, "team_data_clean.csv")
-        df = pd.read_csv(file_path)
-        return df
-    except Exception as e:
-        print(f"Error loading team data: {e}")
-        return None
+    """Load team data (shared, loaded once on first use)"""
+    return data_utils.get_dataset("team_data")
 
 def get_attribute_labels():
     """Get user-friendly labels for attributes"""
@@ -40,80 +44,95 @@ def get_attribute_labels():
         'gk_save_pct': 'Save %'
     }
 
+# Key metrics for comparison
+METRICS = [
+    'possession', 
+    'shots_per90', 
+    'goals_per90', 
+    'assists_per90', 
+    'passes_pct', 
+    'passes_pct_short', 
+    'passes_pct_medium', 
+    'passes_pct_long', 
+    'tackles_interceptions', 
+    'gk_save_pct'
+]
+
+@figure_cache.per_version(maxsize=16)
+def _team_rows(as_of):
+    data = timeline.team_data_as_of(as_of)
+    df = data.drop_duplicates('team').set_index('team')
+    universe = selection.get_universe("team")
+    df = df.reindex(universe.keys)
+
+    # Filter metrics based on what's available in the dataframe
+    metrics = [metric for metric in METRICS if metric in df.columns]
+
+    # Percentile ranks among all teams (as of the same kickoff), for context next to raw values
+    if as_of is None:
+        percentile_index = percentiles.get_index("team")
+    else:
+        percentile_index = percentiles.PercentileIndex(data.drop(columns=["stage"], errors="ignore"), ["team"], "teams")
+    cells = []
+    for metric in metrics:
+        values = df[metric].to_numpy(dtype=float)
+        ranks = percentile_index.percentiles(metric, values)
+        column = []
+        for value, rank in zip(values, ranks):
+            # Format based on metric type
+            if np.isnan(value):
+                column.append(("N/A", None))
+                continue
+            formatted_value = f"{value:.1f}%" if 'pct' in metric else f"{value:.2f}"
+            rank_text = None if np.isnan(rank) else f" ({percentiles.ordinal(int(round(rank)))} pct)"
+            column.append((formatted_value, rank_text))
+        cells.append(column)
+    return metrics, cells
+
+def get_team_rows(as_of=None):
+    """Get the table metrics and their formatted (value, percentile) cells per team ID
+
+    Values are as of a timeline kickoff index, or the final ones for None/the
+    last kickoff.
+    """
+    if as_of is not None and timeline.get_timeline().is_final(as_of):
+        as_of = None
+    return _team_rows(None if as_of is None else int(as_of))
+
 def render(app: Dash) -> html.Div:
     @callback(
-        Output("stats-summary", "children"),
-        [Input(ids.TEAMS_DROPDOWN, "value"),
-         Input(ids.SCATTER_PLOT, "selectedData")]
+        Output(ids.STATS_SUMMARY, "children"),
+        Input(ids.SELECTION_STORE, "data"),
+        Input(ids.TIMELINE_SLIDER, "value")
     )
-    def update_stats_summary(selected_teams, selected_data):
-        # Load data
-        df = load_team_data()
-        if df is None:
-            return html.Div("Error loading data")
-            
-        # Process teams selected from scatter plot
-        scatter_selected_teams = []
-        if selected_data and 'points' in selected_data:
-            for point in selected_data['points']:
-                if 'customdata' in point and len(point['customdata']) > 0:
-                    team = point['customdata'][0]
-                    if team not in scatter_selected_teams:
-                        scatter_selected_teams.append(team)
-        
-        # Combine teams from dropdown and scatter plot
-        if selected_teams:
-            combined_teams = list(selected_teams)
-        else:
-            combined_teams = []
-            
-        # Add scatter plot selected teams
-        for team in scatter_selected_teams:
-            if team not in combined_teams:
-                combined_teams.append(team)
-                
-        if not combined_teams:
+    def update_stats_summary(selection_store, as_of):
+        # Teams picked in the dropdown that pass the filters, the scatter
+        # box/lasso selection and the PCP brushes
+        universe = selection.get_universe("team")
+        team_ids = universe.ids(selection.selected_teams(selection_store))
+        if not team_ids:
             return html.Div("Select teams to see comparative statistics")
-            
-        # Define key metrics for comparison
-        metrics = [
-            'possession', 
-            'shots_per90', 
-            'goals_per90', 
-            'assists_per90', 
-            'passes_pct', 
-            'passes_pct_short', 
-            'passes_pct_medium', 
-            'passes_pct_long', 
-            'tackles_interceptions', 
-            'gk_save_pct'
-        ]
-        
-        # Filter metrics based on what's available in the dataframe
-        available_metrics = [metric for metric in metrics if metric in df.columns]
+
+        # Values as of the timeline kickoff, matching the scatter plot points
+        metrics, cells = get_team_rows(as_of)
         
         # Get labels
         label_map = get_attribute_labels()
         
         # Create summary table
         table_header = [
-            html.Thead(html.Tr([html.Th("Metric")] + [html.Th(team) for team in combined_teams]))
+            html.Thead(html.Tr([html.Th("Metric")] + [html.Th(universe.keys[i]) for i in team_ids]))
         ]
         
         table_rows = []
-        for metric in available_metrics:
+        for metric, column in zip(metrics, cells):
             row_cells = [html.Td(label_map.get(metric, metric.replace('_', ' ').title()))]
-            for team in combined_teams:
-                if team in df['team'].values:
-                    value = df.loc[df['team'] == team, metric].values[0]
-                    # Format based on metric type
-                    if 'pct' in metric:
-                        formatted_value = f"{value:.1f}%" if not pd.isna(value) else "N/A"
-                    else:
-                        formatted_value = f"{value:.2f}" if not pd.isna(value) else "N/A"
-                    row_cells.append(html.Td(formatted_value))
+            for i in team_ids:
+                formatted_value, rank_text = column[i]
+                if rank_text is not None:
+                    row_cells.append(html.Td([formatted_value, html.Small(rank_text, className="text-muted")]))
                 else:
-                    row_cells.append(html.Td("N/A"))
+                    row_cells.append(html.Td(formatted_value))
             table_rows.append(html.Tr(row_cells))
                 
         table_body = [html.Tbody(table_rows)]
@@ -123,6 +142,6 @@ def render(app: Dash) -> html.Div:
     return html.Div(
         children=[
             html.H5("Team Statistics Comparison", className="mt-4 mb-3"),
-            html.Div(id="stats-summary")
+            html.Div(id=ids.STATS_SUMMARY)
         ]
     )
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Style Map View Component
+
+This component draws the 2-D style map of players or teams (see
+embedding.py) with WebGL scatter traces, so the full player pool stays
+interactive. Players of the teams in the shared team selection (see selection.py)
+are highlighted.
+"""
+
+from dash import Dash, dcc, html, Input, Output
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+
+from . import ids
+from . import data_utils
+from . import embedding
+from . import figure_cache
+from . import selection
+from . import single_flight
+
+# Marker color per player position group
+POSITION_COLORS = {
+    'GK': 'rgba(179, 179, 179, 0.7)',
+    'DF': 'rgba(141, 160, 203, 0.7)',
+    'MF': 'rgba(102, 194, 165, 0.7)',
+    'FW': 'rgba(252, 141, 98, 0.7)',
+}
+OTHER_COLOR = 'rgba(229, 196, 148, 0.7)'
+
+
+def axis_title(projection, axis):
+    """Get an axis title with its explained variance and strongest loadings"""
+    labels = data_utils.get_attribute_labels()
+    loadings = ", ".join(
+        f"{'+' if weight > 0 else '-'}{labels.get(feature, feature)}"
+        for feature, weight in projection.top_loadings(axis)
+    )
+    return f"PC{axis + 1} ({projection.explained[axis]:.0%} of variance): {loadings}"
+
+
+def render(app: Dash) -> html.Div:
+    """Create the style map component"""
+
+    layout = html.Div([
+        html.H4("Style Map", className="text-center mb-3"),
+        html.Div([
+            dcc.RadioItems(
+                id=ids.STYLE_MAP_KIND,
+                options=[{'label': label, 'value': kind} for kind, label in embedding.KINDS.items()],
+                value="player",
+                inline=True,
+                inputClassName="me-1",
+                labelClassName="me-3"
+            )
+        ], className="text-center mb-2"),
+        dbc.Spinner(
+            dcc.Graph(
+                id=ids.STYLE_MAP_CHART,
+                config={'displayModeBar': True},
+                className="border rounded"
+            ),
+            color="primary",
+            type="grow",
+            size="sm"
+        )
+    ])
+
+    @app.callback(
+        Output(ids.STYLE_MAP_CHART, 'figure'),
+        [
+            Input(ids.STYLE_MAP_KIND, 'value'),
+            Input(ids.SELECTION_STORE, 'data')
+        ]
+    )
+    @single_flight.single_flight("style-map")
+    @figure_cache.cached("style-map")
+    def update_style_map(kind, selection_store):
+        coordinates = embedding.get_coordinates(kind)
+        projection = embedding.get_projection(kind)
+        universe = selection.get_universe("team")
+        selected = coordinates['team'].isin(universe.names(selection.selected_teams(selection_store)))
+        fig = go.Figure()
+
+        if kind == "player":
+            # One WebGL trace per position group; players projected onto the
+            # map (too few minutes to be fitted) are drawn hollow
+            for position, group in coordinates.groupby(coordinates['position'].fillna("").str[:2], sort=False):
+                fig.add_trace(go.Scattergl(
+                    x=group['x'], y=group['y'],
+                    mode='markers',
+                    name=position or "Unknown",
+                    marker=dict(
+                        color=POSITION_COLORS.get(position, OTHER_COLOR),
+                        size=7,
+                        symbol=['circle' if fitted else 'circle-open' for fitted in group['fitted']]
+                    ),
+                    text=group['player'] + " (" + group['team'] + ")",
+                    hovertemplate="<b>%{text}</b><extra>" + (position or "Unknown") + "</extra>"
+                ))
+            highlight = coordinates[selected]
+            highlight_text = highlight['player'] + " (" + highlight['team'] + ")"
+        else:
+            fig.add_trace(go.Scattergl(
+                x=coordinates['x'], y=coordinates['y'],
+                mode='markers+text',
+                name="Teams",
+                marker=dict(color='rgba(141, 160, 203, 0.7)', size=10),
+                text=coordinates['team'],
+                textposition='top center',
+                textfont=dict(size=9),
+                hovertemplate="<b>%{text}</b><extra></extra>"
+            ))
+            highlight = coordinates[selected]
+            highlight_text = highlight['team']
+
+        # Selected teams on top, outlined
+        if len(highlight):
+            fig.add_trace(go.Scattergl(
+                x=highlight['x'], y=highlight['y'],
+                mode='markers',
+                name="Selected teams",
+                marker=dict(color='rgba(0, 0, 0, 0)', size=12, line=dict(color='black', width=2)),
+                text=highlight_text,
+                hovertemplate="<b>%{text}</b><extra>selected</extra>"
+            ))
+
+        fig.update_layout(
+            title=f"{embedding.KINDS[kind]} by playing style (standardized per-90 metrics)",
+            title_x=0.5,
+            title_font=dict(size=15),
+            xaxis_title=axis_title(projection, 0),
+            yaxis_title=axis_title(projection, 1),
+            xaxis=dict(title_font=dict(size=11), zeroline=False),
+            yaxis=dict(title_font=dict(size=11), zeroline=False),
+            legend=dict(orientation="h", yanchor="bottom", y=-0.25, xanchor="center", x=0.5),
+            margin=dict(t=50, l=60, r=40, b=120),
+            height=700,
+            paper_bgcolor='rgba(250, 250, 250, 0.9)',
+            plot_bgcolor='rgba(255, 255, 255, 1)'
+        )
+        return fig
+
+    return layout
@@ -2,30 +2,25 @@ import pandas as pd
 import plotly.graph_objects as go
 import os
 from dash import Dash, dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
 from . import ids
 from . import data_utils  # Import shared data utilities
-
-# Load data
-DATA_PATH = os.path.join('data', 'cleaned') 
-file_path = os.path.join(DATA_PATH, "team_performance_scores.csv")
-TEAM_DATA = pd.read_csv(file_path)
+from . import radar_engine
+from . import radar_weights
+from . import selection
+from . import serialization
+from . import single_flight
+from . import timeline
 
 # Radar chart dimensions (correct column names from the CSV file)
-dimensions = ['Offensive', 'Defensive', 'Cohesion', 'Efficiency', 'Discipline']
+dimensions = radar_engine.TEAM_DIMENSIONS
+
+# Radar scores are displayed with one decimal
+RADAR_TICK_FORMATS = {"score": ".1f"}
 
-# Colorblind-friendly palette (using Set2 from ColorBrewer)
-COLORBLIND_PALETTE = [
-    'rgba(102, 194, 165, 1)', # teal
-    'rgba(252, 141, 98, 1)',  # salmon
-    'rgba(141, 160, 203, 1)', # blue-purple
-    'rgba(231, 138, 195, 1)', # pink
-    'rgba(166, 216, 84, 1)',  # light green
-    'rgba(255, 217, 47, 1)',  # yellow
-    'rgba(229, 196, 148, 1)', # beige
-    'rgba(179, 179, 179, 1)'  # gray
-]
+# Colorblind-friendly palette (using Set2 from ColorBrewer), shared with the PCP
+COLORBLIND_PALETTE = radar_engine.COLORBLIND_PALETTE
 
 def render(app: Dash) -> html.Div:
     """Create a team radar chart component"""
@@ -37,6 +32,12 @@ def render(app: Dash) -> html.Div:
             html.P(
                 "Teams selected above will be displayed in this radar chart", 
                 className="text-center fst-italic text-muted"
+            ),
+            dbc.Switch(
+                id=ids.TEAM_RADAR_BANDS,
+                label="Show confidence bands",
+                value=False,
+                className="small px-2"
             )
         ], className="mb-2"),
         dbc.Spinner(
@@ -48,27 +49,41 @@ def render(app: Dash) -> html.Div:
             color="primary",
             type="grow",
             size="sm"
-        )
+        ),
+        dcc.Store(id=ids.TEAM_RADAR_TASK2_STATE),
+        radar_weights.render(app, "team")
     ])
     
+    # Bands come from the end-of-tournament data, so the switch is off the
+    # table while the timeline shows an earlier kickoff
+    @app.callback(
+        Output(ids.TEAM_RADAR_BANDS, 'disabled'),
+        Output(ids.TEAM_RADAR_BANDS, 'label'),
+        Input(ids.TIMELINE_SLIDER, 'value')
+    )
+    def update_bands_switch(as_of):
+        if as_of is None or timeline.get_timeline().is_final(as_of):
+            return False, "Show confidence bands"
+        return True, "Confidence bands are only available at the end of the tournament (move the timeline to End)"
+
     # Define callback for the radar chart to use the global team selector
     @app.callback(
         Output(ids.TEAM_RADAR_TASK2_CHART, 'figure'),
+        Output(ids.TEAM_RADAR_TASK2_STATE, 'data'),
         [
-            Input(ids.TEAMS_DROPDOWN, 'value'),
-            Input(ids.FILTERED_TEAMS_STORE, 'data')
-        ]
+            Input(ids.SELECTION_STORE, 'data'),
+            Input(ids.TEAM_RADAR_WEIGHTS_STORE, 'data'),
+            Input(ids.TIMELINE_SLIDER, 'value'),
+            Input(ids.TEAM_RADAR_BANDS, 'value')
+        ],
+        State(ids.TEAM_RADAR_TASK2_STATE, 'data')
     )
-    def update_radar_chart(selected_teams, filtered_teams):
+    @single_flight.single_flight("team-radar")
+    def update_radar_chart(selection_store, weights_config, as_of, show_bands, drawn):
         fig = go.Figure()
 
-        # Filter teams based on tournament stage first
-        available_teams = set(TEAM_DATA['team'].unique())
-        if filtered_teams:
-            available_teams = set(filtered_teams)
-        
         # Apply team selection
-        if not selected_teams or len(selected_teams) == 0:
+        if not selection.decode((selection_store or {}).get("dropdown")):
             # If no teams selected, show a prompt
             fig.update_layout(
                 title="Select teams above to display their radar chart",
@@ -76,97 +91,42 @@ def render(app: Dash) -> html.Div:
                 paper_bgcolor='rgba(250, 250, 250, 0.9)',
                 height=500
             )
-            return fig
+            return fig, None
 
-        # Filter selected teams to only those that match the tournament stage filter
-        filtered_selected_teams = [team for team in selected_teams if team in available_teams]
+        # Selected teams passing the stage/metric filters, box select and PCP brushing
+        filtered_selected_teams = selection.get_universe("team").names(selection.selected_teams(selection_store))
         
         # If all selected teams were filtered out, show a message
         if not filtered_selected_teams:
             fig.add_annotation(
-                text="No selected teams available for the current tournament stage filter",
+                text="No selected teams available for the current filters",
                 xref="paper", yref="paper",
                 x=0.5, y=0.5,
                 showarrow=False,
                 font=dict(size=16, color="#666666")
             )
             fig.update_layout(
-                title="Tournament Stage Filter Applied",
+                title="Filters Applied",
                 title_x=0.5,
                 paper_bgcolor='rgba(250, 250, 250, 0.9)',
                 height=500
             )
-            return fig
+            return fig, None
 
-        # Get the number of teams to display
-        num_teams = len(filtered_selected_teams)
-        
-        # Create a list to store team data for ordering
-        team_with_sizes = []
-        
-        # First, collect all team data and calculate radar size
-        for team in filtered_selected_teams:
-            team_data = TEAM_DATA[TEAM_DATA['team'] == team]
-            if not team_data.empty:
-                row = team_data.iloc[0]
-                values = [row[dim] for dim in dimensions]
-                # Calculate approximate "size" of radar by summing values
-                size = sum(values)
-                team_with_sizes.append((team, size, row))
-        
-        # Sort teams by radar size (smallest first, so they appear on top)
-        team_with_sizes.sort(key=lambda x: x[1])
-        
-        # Now add traces in order from smallest to largest
-        for idx, (team, size, row) in enumerate(team_with_sizes):
-            values = [row[dim] for dim in dimensions]
-            values.append(values[0])  # close the loop
-            
-            # Use colorblind-friendly palette with cycling
-            color_idx = idx % len(COLORBLIND_PALETTE)
-            base_color = COLORBLIND_PALETTE[color_idx]
-            
-            # Set very transparent fill (opacity 0.2) to match reference image
-            fill_opacity = 0.2
-            
-            # Extract RGB components
-            rgba_parts = base_color.replace('rgba(', '').replace(')', '').split(',')
-            r, g, b = rgba_parts[0].strip(), rgba_parts[1].strip(), rgba_parts[2].strip()
-            
-            # Create fill and line colors
-            fill_color = f"rgba({r},{g},{b},{fill_opacity})"
-            line_color = f"rgba({r},{g},{b},1)"  # Full opacity for line
-            
-            # Add radar trace with visible lines and transparent fills
-            fig.add_trace(go.Scatterpolar(
-                r=values,
-                theta=dimensions + [dimensions[0]],
-                fill='toself',
-                name=team,
-                line=dict(
-                    color=line_color,
-                    width=1.5
-                ),
-                fillcolor=fill_color,
-                text=[f"{dim}: {val:.1f}" for dim, val in zip(dimensions, values[:-1])] + [""],
-                hoverinfo="text+name"
-            ))
-            
-            # Add dots at each point for better readability
-            fig.add_trace(go.Scatterpolar(
-                r=values,
-                theta=dimensions + [dimensions[0]],
-                mode='markers',
-                marker=dict(
-                    symbol='circle',
-                    size=6,
-                    color=line_color,
-                    line=dict(color='white', width=1)
-                ),
-                name=f"{team} (points)",
-                showlegend=False,
-                hoverinfo="skip"
-            ))
+        # Gather the selected teams' scores and build traces ordered by radar
+        # size (smallest first, so they appear on top)
+        # Custom weights and the timeline recompute the scores (memoized per configuration);
+        # confidence bands are only drawn for the end-of-tournament scores
+        engine = radar_engine.get_engine(
+            "team", radar_weights.get_weights("team", weights_config), as_of=as_of, bands=bool(show_bands)
+        )
+        team_ids = engine.ordered(engine.ids_for(filtered_selected_teams))
+
+        # Only send the traces that changed when the radar already shows teams
+        patch, state = radar_engine.patch_update(engine, drawn, team_ids, RADAR_TICK_FORMATS)
+        if patch is not None:
+            return patch, state
+        fig.add_traces(engine.traces(team_ids))
 
         # Configure layout to match reference image
         fig.update_layout(
@@ -205,6 +165,6 @@ def render(app: Dash) -> html.Div:
             paper_bgcolor='rgba(250, 250, 250, 0.9)'
         )
 
-        return fig
+        return serialization.prepare(fig, "team-radar", RADAR_TICK_FORMATS), state
     
     return layout 
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Team Similarity Engine for FIFA Visual Analysis
+
+This module precomputes, per metric subset, the pairwise distance matrix of
+teams over their standardized (z-scored) metrics, an average-linkage
+hierarchical clustering (for the dendrogram leaf order) and a k-means
+partition. Everything is NumPy-only and vectorized over the distance matrix,
+so it stays fast as more tournaments add rows.
+
+Results are cached per (metrics, number of clusters, dataset version).
+"""
+
+import numpy as np
+
+from . import data_utils
+from . import figure_cache
+
+DEFAULT_CLUSTERS = 4
+KMEANS_RESTARTS = 10
+KMEANS_MAX_ITER = 100
+KMEANS_SEED = 0
+
+
+def standardized_matrix(metrics):
+    """Get (teams, z-scored matrix) for the given team metrics"""
+    df = data_utils.get_dataset("team_data")
+    metrics = [m for m in metrics if m in df.columns]
+    values = df[metrics].to_numpy(dtype=float)
+
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[~(std > 0)] = 1.0  # constant columns carry no information
+    # Missing values sit at the column mean (0 after standardization)
+    matrix = np.nan_to_num((values - mean) / std)
+    return df['team'].astype(str).to_numpy(), matrix
+
+
+def pairwise_distances(matrix):
+    """Get the Euclidean distance matrix between the rows of a matrix"""
+    sq_norms = np.einsum('ij,ij->i', matrix, matrix)
+    sq = sq_norms[:, None] + sq_norms[None, :] - 2 * (matrix @ matrix.T)
+    distances = np.sqrt(np.maximum(sq, 0))
+    np.fill_diagonal(distances, 0)
+    return distances
+
+
+def average_linkage(distances):
+    """Average-linkage (UPGMA) clustering of a distance matrix
+
+    Returns a (n - 1, 4) linkage matrix in the scipy layout: the two merged
+    nodes, the merge height and the size of the new cluster. Leaves are
+    numbered 0..n-1 and the cluster created at step s is n + s.
+    """
+    n = len(distances)
+    if n < 2:
+        return np.zeros((0, 4))
+
+    D = distances.astype(float).copy()
+    np.fill_diagonal(D, np.inf)
+    sizes = np.ones(n)
+    node_ids = np.arange(n)
+    linkage = np.zeros((n - 1, 4))
+
+    for step in range(n - 1):
+        i, j = divmod(int(np.argmin(D)), n)
+        if i > j:
+            i, j = j, i
+        merged_size = sizes[i] + sizes[j]
+        linkage[step] = [node_ids[i], node_ids[j], D[i, j], merged_size]
+
+        # The merged cluster takes row i; its distances are size-weighted means
+        merged = (sizes[i] * D[i] + sizes[j] * D[j]) / merged_size
+        D[i, :] = merged
+        D[:, i] = merged
+        D[i, i] = np.inf
+        D[j, :] = np.inf
+        D[:, j] = np.inf
+        sizes[i] = merged_size
+        node_ids[i] = n + step
+
+    return linkage
+
+
+def leaf_order(linkage, n):
+    """Get the left-to-right leaf order of a linkage matrix"""
+    if n < 2:
+        return list(range(n))
+    children = {n + step: (int(a), int(b)) for step, (a, b, _, _) in enumerate(linkage)}
+    order = []
+    stack = [2 * n - 2]
+    while stack:
+        node = stack.pop()
+        if node < n:
+            order.append(node)
+        else:
+            left, right = children[node]
+            stack.append(right)
+            stack.append(left)
+    return order
+
+
+def dendrogram_segments(linkage, order):
+    """Get the (x, y) line coordinates of a dendrogram, with None between U shapes
+
+    Leaves are placed at x = their position in `order`.
+    """
+    n = len(order)
+    x = {leaf: float(pos) for pos, leaf in enumerate(order)}
+    y = {leaf: 0.0 for leaf in order}
+    xs, ys = [], []
+    for step, (a, b, height, _) in enumerate(linkage):
+        a, b = int(a), int(b)
+        xs.extend([x[a], x[a], x[b], x[b], None])
+        ys.extend([y[a], height, height, y[b], None])
+        x[n + step] = (x[a] + x[b]) / 2
+        y[n + step] = height
+    return xs, ys
+
+
+def kmeans(matrix, k, seed=KMEANS_SEED, restarts=KMEANS_RESTARTS, max_iter=KMEANS_MAX_ITER):
+    """Cluster the rows of a matrix with k-means (k-means++ init, best of several restarts)"""
+    n = len(matrix)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    sq_norms = np.einsum('ij,ij->i', matrix, matrix)
+    best_labels, best_inertia = np.zeros(n, dtype=int), np.inf
+
+    for _ in range(restarts):
+        # k-means++ seeding
+        centers = [matrix[rng.integers(n)]]
+        for _ in range(1, k):
+            d2 = np.min(((matrix[:, None, :] - np.array(centers)[None]) ** 2).sum(axis=2), axis=1)
+            total = d2.sum()
+            probs = d2 / total if total > 0 else np.full(n, 1 / n)
+            centers.append(matrix[rng.choice(n, p=probs)])
+        centers = np.array(centers)
+
+        for _ in range(max_iter):
+            d2 = sq_norms[:, None] + np.einsum('ij,ij->i', centers, centers)[None] - 2 * (matrix @ centers.T)
+            labels = np.argmin(d2, axis=1)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, matrix)
+            # Empty clusters keep their previous center
+            new_centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+            if np.allclose(new_centers, centers):
+                break
+            centers = new_centers
+
+        inertia = np.maximum(d2[np.arange(n), labels], 0).sum()
+        if inertia < best_inertia:
+            best_labels, best_inertia = labels, inertia
+
+    # Number clusters by first appearance so labels are stable across restarts
+    _, first = np.unique(best_labels, return_index=True)
+    relabel = {old: new for new, old in enumerate(best_labels[np.sort(first)])}
+    return np.array([relabel[label] for label in best_labels], dtype=int)
+
+
+@figure_cache.per_version(maxsize=32)
+def _compute(metrics, n_clusters):
+    teams, matrix = standardized_matrix(metrics)
+    distances = pairwise_distances(matrix)
+    linkage = average_linkage(distances)
+    order = leaf_order(linkage, len(teams))
+    return {
+        "teams": teams,
+        "distances": distances,
+        "linkage": linkage,
+        "order": order,
+        "clusters": kmeans(matrix, n_clusters),
+    }
+
+
+def get_team_similarity(metrics=None, n_clusters=DEFAULT_CLUSTERS):
+    """Get the distance matrix, linkage, leaf order and k-means clusters of the teams
+
+    The returned arrays are shared between callers and must not be modified.
+    """
+    # Distances do not depend on the metric order, so sort for better cache hits
+    metrics = tuple(sorted(metrics or data_utils.get_pcp_attributes()))
+    return _compute(metrics, int(n_clusters))
+
+
+def most_similar_teams(team, metrics=None, n=3):
+    """Get the n teams closest to `team` as (team, distance) pairs"""
+    result = get_team_similarity(metrics)
+    teams = result["teams"].tolist()
+    if team not in teams:
+        return []
+    row = result["distances"][teams.index(team)]
+    closest = [i for i in np.argsort(row, kind="stable").tolist() if teams[i] != team][:n]
+    return [(teams[i], float(row[i])) for i in closest]
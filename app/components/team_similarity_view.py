@@ -0,0 +1,167 @@
+"""
+Team Similarity View Component
+
+This component shows how alike teams played: a heatmap of pairwise distances
+over standardized metrics, ordered by a hierarchical clustering whose
+dendrogram is drawn above it, with k-means clusters in the hover text.
+"""
+
+from dash import Dash, dcc, html, Input, Output
+import dash_bootstrap_components as dbc
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from . import ids
+from . import data_utils
+from . import figure_cache
+from . import single_flight
+from . import team_similarity
+
+# Metrics offered for the similarity computation (the PCP metrics plus a few extras)
+SIMILARITY_METRICS = data_utils.get_pcp_attributes() + [
+    'xg_per90', 'xg_assist_per90', 'npxg_per90', 'aerials_won_pct'
+]
+
+
+def render(app: Dash) -> html.Div:
+    """Create the team similarity heatmap/dendrogram component"""
+    labels = data_utils.get_attribute_labels()
+
+    layout = html.Div([
+        html.H4("Team Similarity", className="text-center mb-3"),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Metrics:", className="fw-bold mb-1"),
+                dcc.Dropdown(
+                    id=ids.TEAM_SIMILARITY_METRICS,
+                    options=[{'label': labels.get(m, m), 'value': m} for m in SIMILARITY_METRICS],
+                    value=data_utils.get_pcp_attributes(),
+                    multi=True,
+                    style={'font-size': '14px'}
+                )
+            ], md=8),
+            dbc.Col([
+                html.Label("Clusters:", className="fw-bold mb-1"),
+                dcc.Slider(
+                    id=ids.TEAM_SIMILARITY_CLUSTERS,
+                    min=2, max=8, step=1,
+                    value=team_similarity.DEFAULT_CLUSTERS,
+                    marks={i: str(i) for i in range(2, 9)}
+                )
+            ], md=4),
+        ], className="mb-2 px-2"),
+        html.Div(id=ids.TEAM_SIMILARITY_NEAREST, className="small text-muted px-2 mb-2"),
+        dbc.Spinner(
+            dcc.Graph(
+                id=ids.TEAM_SIMILARITY_CHART,
+                config={'displayModeBar': True},
+                className="border rounded"
+            ),
+            color="primary",
+            type="grow",
+            size="sm"
+        )
+    ])
+
+    @app.callback(
+        Output(ids.TEAM_SIMILARITY_CHART, 'figure'),
+        [
+            Input(ids.TEAM_SIMILARITY_METRICS, 'value'),
+            Input(ids.TEAM_SIMILARITY_CLUSTERS, 'value'),
+            Input(ids.TEAMS_DROPDOWN, 'value')
+        ]
+    )
+    @single_flight.single_flight("team-similarity")
+    @figure_cache.cached("team-similarity")
+    def update_similarity_chart(metrics, n_clusters, selected_teams):
+        if not metrics:
+            fig = go.Figure()
+            fig.update_layout(
+                title="Select at least one metric to compare teams",
+                title_x=0.5,
+                paper_bgcolor='rgba(250, 250, 250, 0.9)',
+                height=500
+            )
+            return fig
+
+        result = team_similarity.get_team_similarity(metrics, n_clusters or team_similarity.DEFAULT_CLUSTERS)
+        order = result["order"]
+        teams = result["teams"][order].tolist()
+        distances = result["distances"][order][:, order]
+        clusters = (result["clusters"][order] + 1).tolist()
+        positions = list(range(len(teams)))
+
+        # Mark the teams picked in the global selector
+        selected = set(selected_teams or [])
+        tick_labels = [f"<b>{team}</b>" if team in selected else team for team in teams]
+
+        fig = make_subplots(
+            rows=2, cols=1,
+            shared_xaxes=True,
+            row_heights=[0.2, 0.8],
+            vertical_spacing=0.02
+        )
+
+        # Dendrogram of the average-linkage clustering
+        xs, ys = team_similarity.dendrogram_segments(result["linkage"], order)
+        fig.add_trace(go.Scatter(
+            x=xs, y=ys,
+            mode='lines',
+            line=dict(color='rgba(60, 60, 60, 0.8)', width=1),
+            hoverinfo='skip',
+            showlegend=False
+        ), row=1, col=1)
+
+        # Distance heatmap in dendrogram order
+        hover = [
+            [
+                f"{teams[r]} (cluster {clusters[r]}) vs {teams[c]} (cluster {clusters[c]})<br>Distance: {distances[r, c]:.2f}"
+                for c in positions
+            ]
+            for r in positions
+        ]
+        fig.add_trace(go.Heatmap(
+            x=positions, y=positions,
+            z=distances.round(3),
+            text=hover,
+            hoverinfo='text',
+            colorscale='Blues_r',
+            colorbar=dict(title="Distance", len=0.8, y=0.4)
+        ), row=2, col=1)
+
+        fig.update_xaxes(visible=False, row=1, col=1)
+        fig.update_yaxes(visible=False, row=1, col=1)
+        fig.update_xaxes(tickvals=positions, ticktext=tick_labels, tickangle=-60, tickfont=dict(size=10), row=2, col=1)
+        fig.update_yaxes(tickvals=positions, ticktext=tick_labels, autorange='reversed', tickfont=dict(size=10), row=2, col=1)
+        fig.update_layout(
+            title="Pairwise Team Distance (standardized metrics)",
+            title_x=0.5,
+            title_font=dict(size=15),
+            margin=dict(t=50, l=120, r=40, b=120),
+            height=750,
+            paper_bgcolor='rgba(250, 250, 250, 0.9)',
+            plot_bgcolor='rgba(255, 255, 255, 1)'
+        )
+        return fig
+
+    @app.callback(
+        Output(ids.TEAM_SIMILARITY_NEAREST, 'children'),
+        [
+            Input(ids.TEAM_SIMILARITY_METRICS, 'value'),
+            Input(ids.TEAMS_DROPDOWN, 'value')
+        ]
+    )
+    def update_nearest_teams(metrics, selected_teams):
+        if not metrics or not selected_teams:
+            return "Select teams above to list the teams that played most like them"
+
+        lines = []
+        for team in selected_teams[:3]:
+            nearest = team_similarity.most_similar_teams(team, metrics)
+            if nearest:
+                lines.append(html.Div(
+                    f"Most similar to {team}: " + ", ".join(f"{other} ({distance:.2f})" for other, distance in nearest)
+                ))
+        return lines
+
+    return layout
@@ -11,6 +11,7 @@ import pandas as pd
 import os
 
 from . import ids
+from . import data_utils
 
 # Define the data path relative to the app root
 DATA_PATH = os.path.join('data', 'cleaned')  # Path to the data folder
@@ -19,39 +20,34 @@ DATA_PATH = os.path.join('data', 'cleaned')  # Path to the data folder
 previous_filtered_teams = []
 
 def load_teams():
-    """Load teams from the team data CSV file"""
-    try:
-        file_path = os.path.join(DATA_PATH, "team_data_clean.csv")
-        df = pd.read_csv(file_path)
-        teams = df["team"].unique().tolist()
-        teams.sort()
-        return teams
-    except Exception as e:
-        print(f"Error loading teams from team_data_clean.csv: {e}")
-        return []
+    """Load teams from the shared team data (loaded on first use)"""
+    return data_utils.get_team_names()
 
 def render(app: Dash) -> html.Div:
     """Render the teams dropdown component"""
-    all_teams = load_teams()
+    # Options are filled by update_teams_dropdown on initial load, so rendering
+    # the layout does not touch the data
     
     # Main callback to update dropdown based on filtering
     @callback(
         [Output(ids.TEAMS_DROPDOWN, "options"),
          Output(ids.TEAMS_DROPDOWN, "value")],
         [Input(ids.FILTERED_TEAMS_STORE, "data"),
-         Input(ids.DESELECT_ALL_TEAMS, "n_clicks"),
-         Input(ids.CLEAR_PCP_BUTTON, "n_clicks")],
+         Input(ids.DESELECT_ALL_TEAMS, "n_clicks")],
         [State(ids.TEAMS_DROPDOWN, "value")]
     )
-    def update_teams_dropdown(filtered_teams, deselect_all_clicks, clear_clicks, current_selection):
+    def update_teams_dropdown(filtered_teams, deselect_all_clicks, current_selection):
         global previous_filtered_teams
+        all_teams = load_teams()
         
         # Get the ID of what triggered this callback
         trigger = callback_context.triggered[0]['prop_id'].split('.')[0] if callback_context.triggered else None
         
         # Always update options to show current filtered teams 
-        # (or all teams if no filter)
-        teams_to_show = filtered_teams if filtered_teams else all_teams
+        # (or all teams if no filter; an empty list means no team matches)
+        if filtered_teams is None:
+            filtered_teams = all_teams
+        teams_to_show = filtered_teams
         options = [{"label": team, "value": team} for team in teams_to_show]
         
         # If this was triggered by the filter changing
@@ -78,12 +74,12 @@ def render(app: Dash) -> html.Div:
                 return options, valid_selection
         
         # Handle button actions
-        elif trigger == ids.DESELECT_ALL_TEAMS or trigger == ids.CLEAR_PCP_BUTTON:
-            previous_filtered_teams = filtered_teams.copy() if filtered_teams else all_teams.copy()
+        elif trigger == ids.DESELECT_ALL_TEAMS:
+            previous_filtered_teams = filtered_teams.copy()
             return options, []
         
         # Initial load or other trigger
-        previous_filtered_teams = filtered_teams.copy() if filtered_teams else all_teams.copy()
+        previous_filtered_teams = filtered_teams.copy()
         valid_selection = [team for team in (current_selection or []) if team in teams_to_show]
         return options, valid_selection
     
@@ -95,7 +91,7 @@ def render(app: Dash) -> html.Div:
         prevent_initial_call=True
     )
     def handle_select_all(n_clicks):
-        return 0, all_teams
+        return 0, load_teams()
     
     return html.Div(
         children=[
@@ -103,7 +99,7 @@ def render(app: Dash) -> html.Div:
                 dbc.Col([
                     dcc.Dropdown(
                         id=ids.TEAMS_DROPDOWN,
-                        options=[{"label": team, "value": team} for team in all_teams],
+                        options=[],
                         multi=True,
                         placeholder="Select teams to display in the scatter plot and other visualizations",
                         value=[],
@@ -0,0 +1,266 @@
+"""
+Timeline ("as of matchday") Engine for FIFA Visual Analysis
+
+This module answers "what did the team metrics look like after kickoff X?"
+without re-aggregating matches. From the long-form match table it builds:
+- per-team cumulative prefix sums of every match stat, shaped
+  (teams, max_matches + 1, stats), plus prefix counts of non-null values
+- a (kickoffs, teams) table with the number of matches each team had
+  started by each distinct kickoff time
+
+An as-of query is then one lookup of the kickoff index and one gather from
+the prefix arrays, O(1) per team. Team metrics that can be derived from match
+stats (see DERIVED_METRICS) are overlaid on the team data; the others keep
+their end-of-tournament values.
+
+Matches settled on penalties have no score in the match data. They count
+as 120 minutes played, and their (level) score is recovered from the goal
+totals of the team data. Goals exclude own goals by the opponent, as in the
+team data, so per-90 rates agree with the team data at the end.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import data_utils
+from . import figure_cache
+from . import matches
+
+# Match stats accumulated in the prefix sums
+TIMELINE_STATS = (
+    ['goals_for', 'goals_against', 'minutes_90s']
+    + matches.PAIRED_STATS + [f'opp_{s}' for s in matches.PAIRED_STATS]
+)
+
+# Matches without a score went to extra time (30 minutes) and penalties
+EXTRA_TIME_90S = 1 / 3
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, scale * numerator / denominator, np.nan)
+
+
+# Team data column -> function of (sums, counts, games) per team, all arrays.
+# `sums`/`counts` map a match stat to its cumulative sum / non-null count.
+# Per-90 rates are over the minutes played, extra time included.
+DERIVED_METRICS = {
+    'games': lambda sums, counts, games: games.astype(float),
+    'minutes_90s': lambda sums, counts, games: sums['minutes_90s'],
+    'minutes': lambda sums, counts, games: 90 * sums['minutes_90s'],
+    'possession': lambda sums, counts, games: _ratio(sums['possession'], counts['possession']),
+    'goals': lambda sums, counts, games: sums['goals_for'],
+    'goals_per90': lambda sums, counts, games: _ratio(sums['goals_for'], sums['minutes_90s']),
+    'xg_per90': lambda sums, counts, games: _ratio(sums['xg'], sums['minutes_90s']),
+    'xg_net': lambda sums, counts, games: sums['goals_for'] - sums['xg'],
+    'shots_per90': lambda sums, counts, games: _ratio(sums['total_shots'], sums['minutes_90s']),
+    'shots_on_target_per90': lambda sums, counts, games: _ratio(sums['sot'], sums['minutes_90s']),
+    'passes_pct': lambda sums, counts, games: _ratio(sums['completed_passes'], sums['attempted_passes'], 100.0),
+    'tackles': lambda sums, counts, games: sums['tackles'],
+    'interceptions': lambda sums, counts, games: sums['interceptions'],
+    'tackles_interceptions': lambda sums, counts, games: sums['tackles'] + sums['interceptions'],
+    'fouls': lambda sums, counts, games: sums['fouls'],
+    'crosses': lambda sums, counts, games: sums['crosses'],
+    'touches': lambda sums, counts, games: sums['touches'],
+    'gk_save_pct': lambda sums, counts, games: _ratio(sums['saves'], sums['opp_sot'], 100.0),
+}
+
+# Derived metrics defined differently in the team data, with their bounds: the
+# team data's save % leaves out penalty goals (not in the match data) and
+# takes shots on target from another source. The gap at the end of the
+# tournament is kept as a per-team offset, so the series ends at the team data.
+CALIBRATED_METRICS = {
+    'gk_save_pct': (0.0, 100.0),
+}
+
+
+def shootout_goals(frame, team_goals):
+    """Get the goals of each team row in matches settled on penalties (NaN elsewhere)
+
+    Both teams scored the same number of goals in such a match, so with the
+    total goals of every team (`team_goals`, team -> goals) the missing scores
+    solve one linear system. Rows stay NaN when the totals do not determine
+    them.
+    """
+    missing = frame['goals_for'].isna().to_numpy()
+    goals = pd.Series(np.nan, index=frame.index)
+    if not missing.any():
+        return goals
+
+    # Only the teams with unscored matches (their totals exclude own goals for)
+    known = frame['goals_for'].fillna(0).groupby(frame['team']).sum()
+    teams = [team for team in dict.fromkeys(frame['team'].to_numpy()[missing]) if team in team_goals]
+    residual = np.array([team_goals[team] - known[team] for team in teams], dtype=float)
+    match_ids, match_index = np.unique(frame['match'].to_numpy()[missing], return_inverse=True)
+
+    # incidence[t, m] = 1 when team t played unscored match m
+    team_index = {team: i for i, team in enumerate(teams)}
+    incidence = np.zeros((len(teams), len(match_ids)))
+    rows = frame['team'].to_numpy()[missing]
+    for team, m in zip(rows, match_index):
+        if team in team_index:
+            incidence[team_index[team], m] = 1
+    solution = np.round(np.linalg.lstsq(incidence, residual, rcond=None)[0])
+    if not np.allclose(incidence @ solution, residual) or (solution < 0).any():
+        return goals
+
+    goals[missing] = solution[match_index]
+    return goals
+
+
+def own_goals(frame, goals_for, team_goals, own_goals_against):
+    """Get the own goals by the opponent in each team row's goals (0 where none)
+
+    A team's goals beyond its total in the team data (`team_goals`) are own
+    goals; they are placed on its matches against teams that conceded own
+    goals (`own_goals_against`, team -> count), earliest first.
+    """
+    credited = pd.Series(0.0, index=frame.index)
+    surplus = goals_for.fillna(0).groupby(frame['team']).sum()
+    conceded = dict(own_goals_against)
+    for team, extra in surplus.items():
+        extra = int(round(extra - team_goals.get(team, extra)))
+        for row in frame.index[frame['team'] == team]:
+            if extra <= 0:
+                break
+            opponent = frame.at[row, 'opponent']
+            if conceded.get(opponent, 0) > 0 and goals_for[row] > 0:
+                credited[row] = 1
+                conceded[opponent] -= 1
+                extra -= 1
+    return credited
+
+
+class Timeline:
+    """Prefix-sum arrays of the per-team match stats"""
+
+    def __init__(self, table, team_data=None):
+        frame = table.frame
+        team_goals, own_goals_against = {}, {}
+        if team_data is not None:
+            if 'goals' in team_data.columns:
+                team_goals = team_data.dropna(subset=['goals']).set_index('team')['goals'].to_dict()
+            if 'gk_own_goals_against' in team_data.columns:
+                own_goals_against = team_data.set_index('team')['gk_own_goals_against'].fillna(0).to_dict()
+
+        recovered = shootout_goals(frame, team_goals)
+        goals_for = frame['goals_for'].fillna(recovered)
+        long = frame.assign(
+            goals_for=goals_for - own_goals(frame, goals_for, team_goals, own_goals_against),
+            goals_against=frame['goals_against'].fillna(recovered),
+            minutes_90s=np.where(frame['goals_for'].isna(), 1 + EXTRA_TIME_90S, 1.0),
+        )
+        self.teams = list(table.teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.stats = [s for s in TIMELINE_STATS if s in long.columns]
+        self.stat_index = {stat: i for i, stat in enumerate(self.stats)}
+
+        n_teams = len(self.teams)
+        max_matches = max(table.match_counts().values(), default=0)
+        values = long[self.stats].to_numpy(dtype=float)
+
+        # Rows are sorted by team then kickoff: position within the team's slice
+        team_ids = np.empty(len(long), dtype=int)
+        positions = np.empty(len(long), dtype=int)
+        for team, rows in table.team_slices.items():
+            team_ids[rows] = self.team_index[team]
+            positions[rows] = np.arange(rows.stop - rows.start)
+
+        per_match = np.zeros((n_teams, max_matches, len(self.stats)))
+        per_match[team_ids, positions] = np.nan_to_num(values)
+        present = np.zeros((n_teams, max_matches, len(self.stats)))
+        present[team_ids, positions] = ~np.isnan(values)
+
+        # prefix[t, k] = totals of team t's first k matches
+        self.prefix = np.zeros((n_teams, max_matches + 1, len(self.stats)))
+        self.prefix[:, 1:] = np.cumsum(per_match, axis=1)
+        self.prefix_counts = np.zeros((n_teams, max_matches + 1, len(self.stats)))
+        self.prefix_counts[:, 1:] = np.cumsum(present, axis=1)
+
+        # played[i, t] = matches of team t kicked off up to the i-th distinct kickoff
+        kickoffs = long['match_time'].to_numpy()
+        self.kickoffs = np.unique(kickoffs)
+        started = np.zeros((len(self.kickoffs), n_teams), dtype=int)
+        np.add.at(started, (np.searchsorted(self.kickoffs, kickoffs), team_ids), 1)
+        self.played = np.cumsum(started, axis=0)
+
+    def totals(self, kickoff_index):
+        """Get (sums, counts, games) per team as of a kickoff index
+
+        `sums` and `counts` map each stat to an array over `self.teams`.
+        """
+        if kickoff_index < 0:
+            games = np.zeros(len(self.teams), dtype=int)
+        else:
+            games = self.played[kickoff_index]
+        rows = np.arange(len(self.teams))
+        sums = self.prefix[rows, games]
+        counts = self.prefix_counts[rows, games]
+        return (
+            {stat: sums[:, i] for stat, i in self.stat_index.items()},
+            {stat: counts[:, i] for stat, i in self.stat_index.items()},
+            games,
+        )
+
+    def kickoff_index(self, when):
+        """Get the index of the last kickoff at or before a time (-1 if before the first)"""
+        return int(np.searchsorted(self.kickoffs, np.datetime64(pd.Timestamp(when)), side="right")) - 1
+
+    def is_final(self, kickoff_index):
+        """Check whether a kickoff index covers the whole tournament"""
+        return kickoff_index is None or kickoff_index >= len(self.kickoffs) - 1
+
+
+@figure_cache.per_version()
+def get_timeline():
+    """Get the timeline of the current dataset version (shared, read-only)"""
+    return Timeline(matches.get_match_table(), data_utils.get_dataset("team_data"))
+
+
+def _derive(timeline, kickoff_index):
+    """Get {column: values over timeline.teams} of the derived metrics as of a kickoff index"""
+    sums, counts, games = timeline.totals(kickoff_index)
+    return {column: derive(sums, counts, games) for column, derive in DERIVED_METRICS.items()}
+
+
+@figure_cache.per_version()
+def _calibration():
+    timeline = get_timeline()
+    final = _derive(timeline, len(timeline.kickoffs) - 1)
+    df = data_utils.get_dataset("team_data").drop_duplicates('team').set_index('team')
+    offsets = {}
+    for column in CALIBRATED_METRICS:
+        if column in df.columns:
+            target = df[column].reindex(timeline.teams).to_numpy(dtype=float)
+            offsets[column] = np.nan_to_num(target - final[column])
+    return offsets
+
+
+@figure_cache.per_version(maxsize=128)
+def _team_data_as_of(kickoff_index):
+    timeline = get_timeline()
+    derived = _derive(timeline, kickoff_index)
+    for column, offset in _calibration().items():
+        derived[column] = np.clip(derived[column] + offset, *CALIBRATED_METRICS[column])
+
+    df = data_utils.get_dataset("team_data").copy()
+    rows = df['team'].map(timeline.team_index)
+    known = rows.notna().to_numpy()
+    positions = rows[known].astype(int).to_numpy()
+    for column, values in derived.items():
+        if column in df.columns:
+            column_values = np.full(len(df), np.nan)
+            column_values[known] = values[positions]
+            df[column] = column_values
+    return df
+
+
+def team_data_as_of(kickoff_index=None):
+    """Get the team data as of a kickoff index, or the final data for None/the last kickoff
+
+    Derivable metrics are recomputed from the matches started by then; the
+    frame is shared between callers and must not be modified.
+    """
+    if kickoff_index is None or get_timeline().is_final(kickoff_index):
+        return data_utils.get_dataset("team_data")
+    return _team_data_as_of(int(kickoff_index))
@@ -0,0 +1,68 @@
+"""
+Timeline Slider Component
+
+This component picks the kickoff the team views are shown "as of". The
+slider steps through every distinct kickoff time; its last position is the
+end of the tournament. It is configured by a callback when mounted, so the
+match data is not read while the layout is built.
+"""
+
+import pandas as pd
+from dash import Dash, dcc, html, Input, Output
+
+from . import ids
+from . import timeline
+
+
+def render(app: Dash) -> html.Div:
+    """Create the as-of-matchday timeline slider"""
+
+    layout = html.Div([
+        html.Div(id=ids.TIMELINE_LABEL, className="small text-muted text-center mb-1"),
+        dcc.Slider(
+            id=ids.TIMELINE_SLIDER,
+            min=0, max=0, step=1, value=None,
+            marks={},
+            included=True,
+            updatemode="mouseup"
+        )
+    ], className="px-2")
+
+    @app.callback(
+        Output(ids.TIMELINE_SLIDER, 'max'),
+        Output(ids.TIMELINE_SLIDER, 'marks'),
+        Output(ids.TIMELINE_SLIDER, 'value'),
+        Input(ids.TIMELINE_SLIDER, 'id')
+    )
+    def configure_slider(_):
+        kickoffs = pd.to_datetime(timeline.get_timeline().kickoffs)
+        last = len(kickoffs) - 1
+
+        # Mark the first kickoff of every third day, plus the last one
+        marks = {}
+        seen_days = []
+        for i, kickoff in enumerate(kickoffs):
+            day = kickoff.normalize()
+            if day not in seen_days:
+                seen_days.append(day)
+                if (len(seen_days) - 1) % 3 == 0:
+                    marks[i] = kickoff.strftime("%b %d")
+        marks[last] = "End"
+        return last, marks, last
+
+    @app.callback(
+        Output(ids.TIMELINE_LABEL, 'children'),
+        Input(ids.TIMELINE_SLIDER, 'value')
+    )
+    def update_label(kickoff_index):
+        data = timeline.get_timeline()
+        if kickoff_index is None or data.is_final(kickoff_index):
+            return "Showing end-of-tournament data"
+        kickoff = pd.Timestamp(data.kickoffs[kickoff_index])
+        played = int(data.played[kickoff_index].sum() // 2)
+        return (
+            f"As of {kickoff.strftime('%a %d %b %Y, %H:%M')} ({played} matches played); "
+            "metrics not derivable from match stats keep their end-of-tournament values"
+        )
+
+    return layout
@@ -1,5 +1,6 @@
 from dash import Dash, html, dcc
 from . import ids
+from . import head_to_head
 
 def render(app: Dash) -> html.Div:
     # Define options with user-friendly labels
@@ -22,7 +23,7 @@ def render(app: Dash) -> html.Div:
         {"label": "Dribble Success %", "value": "dribbles_completed_pct"},
         {"label": "Aerial Duels Won %", "value": "aerials_won_pct"},
         {"label": "Penalty Save %", "value": "gk_pens_save_pct"}
-    ]
+    ] + head_to_head.axis_options()  # opponent-adjusted metrics
     
     return html.Div([
         dcc.Dropdown(
@@ -0,0 +1,97 @@
+"""
+HTTP Middleware for the FIFA World Cup 2022 Visualization Dashboard
+
+This module adds response compression and ETags to the Flask server behind
+the Dash app (the `server` object exposed by wsgi.py):
+- JSON responses (callback outputs, `_dash-layout`, `_dash-dependencies`) above
+  a size threshold are compressed with brotli when available, else gzip
+- every JSON response gets a content-hash ETag, and conditional GET/HEAD
+  requests whose If-None-Match matches are answered with 304 Not Modified
+- content-hashed assets built by scripts/build_assets.py are served with
+  long-lived cache headers
+"""
+
+import gzip
+import hashlib
+import os
+
+from flask import request
+
+from app.asset_manifest import HASHED_ASSET
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get("FIFA_COMPRESS_MIN_BYTES", 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Good ratio while staying fast enough for per-request use
+
+
+def _choose_encoding():
+    """Pick the best content encoding accepted by the client"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(body, encoding):
+    """Compress a response body with the given encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def compress_and_tag(response):
+    """Attach an ETag to JSON responses, answer 304s and compress large bodies"""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.mimetype != "application/json"
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    body = response.get_data()
+
+    # Weak ETag: the same content is served with different encodings
+    etag = hashlib.sha1(body).hexdigest()
+    response.set_etag(etag, weak=True)
+    if request.method in ("GET", "HEAD") and request.if_none_match.contains_weak(etag):
+        response.status_code = 304
+        response.set_data(b"")
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(_compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def cache_hashed_assets(response):
+    """Let browsers cache content-hashed assets for a year"""
+    if (
+        request.path.startswith("/assets/")
+        and response.status_code in (200, 304)
+        and HASHED_ASSET.search(request.path)
+    ):
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+def init_app(server):
+    """Register the middleware on a Flask server"""
+    server.after_request(compress_and_tag)
+    server.after_request(cache_hashed_assets)
+    return server
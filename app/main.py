@@ -7,17 +7,34 @@ import os
 from dash import dcc, html
 from dash.dependencies import Input, Output
 from app.components.layout import create_layout
+from app.components import data_utils, scoring, serialization
+from app import asset_manifest, http_middleware
 
 # Initialize the Dash app with Bootstrap styling
+# (local copies from scripts/build_assets.py are used when built, CDNs otherwise)
 app = dash.Dash(
     __name__,
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        "https://use.fontawesome.com/releases/v5.15.4/css/all.css"
-    ],
+    external_stylesheets=asset_manifest.stylesheets(),
+    assets_ignore=asset_manifest.VENDOR_CSS_IGNORE,
     suppress_callback_exceptions=True
 )
 
+# Compress JSON responses and answer conditional requests on the Flask server
+http_middleware.init_app(app.server)
+
+# Use the faster JSON encoder for callback responses when enabled
+serialization.enable_fast_encoder()
+
+# Radar scores are read from the CSVs; FIFA_COMPUTE_SCORES=1 computes them
+# from the cleaned data instead (see app/components/scoring.py)
+if os.environ.get("FIFA_COMPUTE_SCORES", "0") == "1":
+    scoring.use_computed_scores()
+
+# Datasets load on first use; FIFA_PRELOAD_DATA=1 loads them at startup instead
+# (e.g. with `gunicorn --preload` so forked workers share them)
+if os.environ.get("FIFA_PRELOAD_DATA", "0") == "1":
+    data_utils.preload_datasets()
+
 # Set the app title
 app.title = "FIFA World Cup 2022 Dashboard"
 
@@ -1,33 +1,17 @@
-import pandas as pd
+"""
+Regenerate data/cleaned/team_performance_scores.csv
 
-# Load the cleaned team data
-team_df = pd.read_csv("C:/Users/zoli/Documents/Vis RESIT/Clean Data/team_data_clean.csv")
+Run from the project root:  python "scripts/Create team performance.py"
 
-# Define metric groups for each dimension
-categories = {
-    'Offensive': ['goals_per90', 'xg_per90'],
-    'Defensive': ['tackles', 'interceptions'],
-    'Cohesion': ['possession', 'passes_pct'],
-    'Efficiency': ['xg_net', 'xg_assist_per90'],
-    'Discipline': ['cards_yellow', 'fouls', 'avg_age']
-}
+The scores are computed by app/components/scoring.py (see TEAM_CATEGORIES).
+"""
 
-# Create a new DataFrame to store scores
-team_scores = pd.DataFrame()
-team_scores['team'] = team_df['team']
+import os
+import sys
 
-# Normalize metrics and compute average score per dimension
-for category, metrics in categories.items():
-    normalized = team_df[metrics].copy()
-    for col in normalized.columns:
-        col_min = team_df[col].min()
-        col_max = team_df[col].max()
-        if col_max > col_min:
-            normalized[col] = (team_df[col] - col_min) / (col_max - col_min)
-        else:
-            normalized[col] = 0.5  # fallback if no variation
-    team_scores[category] = normalized.mean(axis=1) * 9 + 1  # scale to 1–10
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Save the result
-team_scores.to_csv("C:/Users/zoli/Documents/Vis RESIT/Clean Data/team_performance_scores.csv", index=False)
-print("✅ team_performance_scores.csv has been created.")
+from app.components import scoring
+
+if __name__ == "__main__":
+    scoring.main(["--kind", "team"])
@@ -0,0 +1,104 @@
+"""
+Startup benchmark for the FIFA World Cup 2022 Visualization Dashboard
+
+Run from the project root:  python scripts/benchmark_startup.py
+
+Imports the app in a fresh interpreter with `python -X importtime`, reports
+the slowest modules, checks that no dataset was loaded during import, and
+compares the total import time against a recorded baseline.
+
+Options:
+  --update-baseline   record the current timing as the new baseline
+  --tolerance PCT     allowed slowdown before failing (default 25%)
+  --repeat N          number of runs; the fastest one is used (default 3)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "scripts", "startup_baseline.json")
+TARGET = "app.main"
+
+# Print which datasets were loaded while importing the app
+PROBE = (
+    f"import {TARGET}; "
+    "from app.components import data_utils; "
+    "print('LOADED_DATASETS=' + ','.join(data_utils.loaded_datasets()))"
+)
+
+
+def run_once():
+    """Import the app once and return (timings per module in us, loaded datasets)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(f"Importing {TARGET} failed")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        timings[module.strip()] = (int(self_us), int(cumulative_us))
+
+    loaded = []
+    for line in result.stdout.splitlines():
+        if line.startswith("LOADED_DATASETS="):
+            loaded = [name for name in line.split("=", 1)[1].split(",") if name]
+    return timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=25.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.repeat)]
+    timings, loaded = min(runs, key=lambda run: run[0][TARGET][1])
+    total_ms = timings[TARGET][1] / 1000
+
+    print(f"Import of {TARGET}: {total_ms:.1f} ms (best of {args.repeat})")
+    print("\nSlowest modules (cumulative):")
+    top = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:15]
+    for module, (self_us, cumulative_us) in top:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  (self {self_us / 1000:>6.1f} ms)  {module}")
+    print("\nApp modules (self time):")
+    for module, (self_us, cumulative_us) in sorted(timings.items()):
+        if module.startswith("app"):
+            print(f"  {self_us / 1000:>8.1f} ms  {module}")
+
+    failed = False
+    if loaded:
+        print(f"\nFAIL: datasets loaded during import: {', '.join(loaded)}")
+        failed = True
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as fh:
+            json.dump({"total_ms": total_ms}, fh, indent=2)
+        print(f"\nBaseline updated: {total_ms:.1f} ms")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as fh:
+            baseline_ms = json.load(fh)["total_ms"]
+        limit_ms = baseline_ms * (1 + args.tolerance / 100)
+        change = 100 * (total_ms - baseline_ms) / baseline_ms
+        print(f"\nBaseline: {baseline_ms:.1f} ms, current: {total_ms:.1f} ms ({change:+.0f}%)")
+        if total_ms > limit_ms:
+            print(f"FAIL: startup regressed beyond the {args.tolerance:.0f}% tolerance")
+            failed = True
+    else:
+        print("\nNo baseline recorded yet; run with --update-baseline")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
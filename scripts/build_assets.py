@@ -0,0 +1,134 @@
+"""
+Asset build step for the FIFA World Cup 2022 Visualization Dashboard
+
+Run from the project root:  python scripts/build_assets.py
+
+- Resizes app/assets/fifa_logo.png into PNG and WebP variants
+- Downloads Bootstrap and FontAwesome (stylesheet + webfonts) so they can be
+  served from app/assets on offline deployments
+- Gives every output a content-hashed filename (served with long cache headers)
+  and records them in app/assets/build/manifest.json
+- Prints the first-load bytes saved compared to the original assets
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import urllib.request
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from app.asset_manifest import ASSETS_FOLDER, CDN_STYLESHEETS, MANIFEST_PATH
+
+LOGO_PATH = os.path.join(ASSETS_FOLDER, "fifa_logo.png")
+LOGO_WIDTHS = [64, 128, 256, 512]
+BUILD_DIR = os.path.join(ASSETS_FOLDER, "build")
+VENDOR_DIR = os.path.join(ASSETS_FOLDER, "vendor")
+FONTAWESOME_WEBFONTS = "https://use.fontawesome.com/releases/v5.15.4/webfonts/"
+
+
+def content_hash(data):
+    """Get the 10-character content hash used in built filenames"""
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def write_hashed(folder, stem, ext, data):
+    """Write data as <stem>.<hash>.<ext> and return its path relative to app/assets"""
+    os.makedirs(folder, exist_ok=True)
+    filename = f"{stem}.{content_hash(data)}.{ext}"
+    with open(os.path.join(folder, filename), "wb") as fh:
+        fh.write(data)
+    return os.path.relpath(os.path.join(folder, filename), ASSETS_FOLDER).replace(os.sep, "/")
+
+
+def download(url):
+    """Download a URL and return its bytes"""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def build_logo(manifest, report):
+    """Build resized PNG/WebP variants of the FIFA logo"""
+    with open(LOGO_PATH, "rb") as fh:
+        original = fh.read()
+    image = Image.open(BytesIO(original)).convert("RGBA")
+
+    for width in LOGO_WIDTHS:
+        if width > image.width:
+            continue
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+        for fmt, ext, options in [("PNG", "png", dict(optimize=True)), ("WEBP", "webp", dict(quality=85, method=6))]:
+            buffer = BytesIO()
+            resized.save(buffer, fmt, **options)
+            manifest[f"fifa_logo-{width}.{ext}"] = write_hashed(BUILD_DIR, f"fifa_logo-{width}", ext, buffer.getvalue())
+
+    # Even the largest WebP variant replaces the original PNG on first load
+    largest_webp = max(w for w in LOGO_WIDTHS if w <= image.width)
+    built = os.path.getsize(os.path.join(ASSETS_FOLDER, manifest[f"fifa_logo-{largest_webp}.webp"]))
+    report.append(("fifa_logo.png", len(original), built))
+
+
+def build_stylesheets(manifest, report):
+    """Download local copies of the CDN stylesheets (and FontAwesome webfonts)"""
+    css_dir = os.path.join(VENDOR_DIR, "css")
+    font_dir = os.path.join(VENDOR_DIR, "webfonts")
+
+    for name, url in CDN_STYLESHEETS.items():
+        try:
+            css = download(url).decode("utf-8")
+        except OSError as e:
+            print(f"Skipping {name}: could not download {url} ({e})")
+            continue
+        cdn_bytes = len(css.encode("utf-8"))
+
+        # Rewrite font references to hashed local copies
+        for font in sorted(set(re.findall(r"\.\./webfonts/([^)\"'?#]+)", css))):
+            try:
+                data = download(FONTAWESOME_WEBFONTS + font)
+            except OSError as e:
+                print(f"Could not download webfont {font} ({e})")
+                continue
+            stem, ext = font.rsplit(".", 1)
+            hashed = write_hashed(font_dir, stem, ext, data)
+            css = css.replace(f"../webfonts/{font}", f"../webfonts/{os.path.basename(hashed)}")
+
+        stem = name.rsplit(".", 1)[0]
+        manifest[name] = write_hashed(css_dir, stem, "vendor.css", css.encode("utf-8"))
+        report.append((name, cdn_bytes, len(css.encode("utf-8"))))
+
+
+def main():
+    # Start from a clean output so stale hashed files do not pile up
+    for folder in (BUILD_DIR, VENDOR_DIR):
+        shutil.rmtree(folder, ignore_errors=True)
+
+    manifest = {}
+    report = []
+    build_logo(manifest, report)
+    build_stylesheets(manifest, report)
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    print(f"Wrote {len(manifest)} assets to {MANIFEST_PATH}")
+
+    print("\nFirst-load bytes:")
+    total_before = total_after = 0
+    for name, before, after in report:
+        total_before += before
+        total_after += after
+        print(f"  {name:<20} {before / 1024:>9.1f} KB -> {after / 1024:>9.1f} KB")
+    print(f"  {'total':<20} {total_before / 1024:>9.1f} KB -> {total_after / 1024:>9.1f} KB "
+          f"({(total_before - total_after) / 1024:.1f} KB saved)")
+    print("Local stylesheets also remove the external CDN requests on first paint.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Shared test setup: the app reads data/cleaned relative to the repository root."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
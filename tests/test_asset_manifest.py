@@ -0,0 +1,14 @@
+from app import asset_manifest
+
+
+def test_image_srcset_orders_the_built_widths():
+    manifest = {
+        "fifa_logo-128.webp": "build/fifa_logo-128.bbbbbbbbbb.webp",
+        "fifa_logo-64.webp": "build/fifa_logo-64.aaaaaaaaaa.webp",
+        "fifa_logo-64.png": "build/fifa_logo-64.cccccccccc.png",
+        "bootstrap.css": "vendor/css/bootstrap.dddddddddd.vendor.css",
+    }
+    assert asset_manifest.image_srcset("fifa_logo", "webp", manifest) == (
+        "/assets/build/fifa_logo-64.aaaaaaaaaa.webp 64w, /assets/build/fifa_logo-128.bbbbbbbbbb.webp 128w"
+    )
+    assert asset_manifest.image_srcset("fifa_logo", "png", {}) == ""
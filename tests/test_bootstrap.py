@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from app.components import bootstrap, scoring
+
+
+def band_widths(kind):
+    weights = scoring.equal_weights(scoring.DEFAULT_CATEGORIES[kind])
+    offsets = bootstrap.band_offsets(kind, weights, resamples=100)
+    keys, metrics, values, _ = scoring.metric_pool(kind)
+    metric, divisor = bootstrap.EXPOSURE_METRICS[kind]
+    exposure = values[:, metrics.index(metric)] / divisor
+    pairs = zip(keys['player'].astype(str), keys['team'].astype(str))
+    widths = np.array([np.nanmean(offsets[pair][1] - offsets[pair][0]) for pair in pairs])
+    return widths, exposure
+
+
+def test_bands_narrow_with_playing_time():
+    widths, minutes = band_widths("player")
+    quartiles = pd.Series(widths).groupby(pd.qcut(pd.Series(minutes).rank(method='first'), 4)).mean()
+    assert quartiles.is_monotonic_decreasing
+    assert widths[minutes == 0].mean() > widths.mean()
+    assert (widths > 0).all()
+
+
+def test_fixed_metrics_are_not_resampled():
+    metrics = ['passes_pct', 'tackles', 'goals_per90']
+    values = np.array([[80.0, 3.0, 0.5], [60.0, 0.0, np.nan]])
+    replicates = bootstrap.resample_values(values, np.array([2.0, 0.0]), metrics, 50, np.random.default_rng(0))
+    assert replicates.shape == (50, 2, 3)
+    assert (replicates[:, :, 0] == values[:, 0]).all()
+    assert np.isnan(replicates[:, 1, 2]).all()
+    # No playing time leaves the rate to the prior, which still varies
+    assert replicates[:, 1, 1].std() > 0
@@ -0,0 +1,32 @@
+import itertools
+
+import numpy as np
+
+from app.components import correlations
+
+
+def path_weight(weights, order):
+    return sum(weights[i, j] for i, j in zip(order, order[1:]))
+
+
+def test_best_path_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for n in range(3, 8):
+        weights = np.abs(rng.normal(size=(n, n)))
+        weights = (weights + weights.T) / 2
+        best = max(path_weight(weights, order) for order in itertools.permutations(range(n)))
+        order = correlations.best_path(weights)
+        assert sorted(order) == list(range(n))
+        assert np.isclose(path_weight(weights, order), best)
+
+
+def test_greedy_path_visits_every_axis():
+    n = correlations.MAX_EXACT_AXES + 2
+    rng = np.random.default_rng(1)
+    weights = rng.random((n, n))
+    assert sorted(correlations.best_path((weights + weights.T) / 2)) == list(range(n))
+
+
+def test_axis_order_keeps_the_metrics():
+    metrics = ['possession', 'shots_per90', 'goals_per90', 'passes_pct']
+    assert sorted(correlations.axis_order(metrics)) == sorted(metrics)
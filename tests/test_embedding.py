@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from app.components import embedding, figure_cache, similarity
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(figure_cache, "CACHE_DIR", str(tmp_path))
+    embedding.get_projection.cache_clear()
+    embedding.get_coordinates.cache_clear()
+    yield tmp_path
+    embedding.get_projection.cache_clear()
+    embedding.get_coordinates.cache_clear()
+
+
+def test_every_player_is_on_the_map(cache_dir):
+    coordinates = embedding.get_coordinates("player")
+    assert len(coordinates) == len(similarity.load_player_profiles())
+    assert np.isfinite(coordinates[['x', 'y']].to_numpy()).all()
+
+
+def test_projection_is_kept_across_dataset_versions(cache_dir, monkeypatch):
+    fitted = embedding.get_projection("team")
+    assert (cache_dir / "projection-team.npz").exists()
+
+    # A new dataset version loads the stored axes instead of refitting
+    embedding.get_projection.cache_clear()
+    monkeypatch.setattr(figure_cache, "dataset_hash", lambda: "another-version")
+    monkeypatch.setattr(embedding.Projection, "fit", classmethod(lambda cls, *args: pytest.fail("refitted")))
+    loaded = embedding.get_projection("team")
+    np.testing.assert_allclose(loaded.components, fitted.components)
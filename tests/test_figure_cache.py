@@ -0,0 +1,26 @@
+from app.components import data_utils, figure_cache
+
+
+def test_per_version_recomputes_when_the_data_changes(monkeypatch):
+    calls = []
+
+    @figure_cache.per_version()
+    def build(value):
+        calls.append(value)
+        return [value]
+
+    monkeypatch.setattr(figure_cache, "dataset_hash", lambda: "v1")
+    assert build(1) is build(1)
+    monkeypatch.setattr(figure_cache, "dataset_hash", lambda: "v2")
+    assert build(1) == [1]
+    assert calls == [1, 1]
+
+
+def test_datasets_reload_when_the_data_changes(monkeypatch):
+    loads = []
+    monkeypatch.setitem(data_utils.DATASET_LOADERS, "test_data", lambda: loads.append(1) or len(loads))
+    monkeypatch.setattr(figure_cache, "dataset_hash", lambda: "v1")
+    assert data_utils.get_dataset("test_data") == 1
+    assert data_utils.get_dataset("test_data") == 1
+    monkeypatch.setattr(figure_cache, "dataset_hash", lambda: "v2")
+    assert data_utils.get_dataset("test_data") == 2
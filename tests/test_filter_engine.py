@@ -0,0 +1,46 @@
+import operator
+
+import numpy as np
+import pytest
+
+from app.components import data_utils, filter_engine
+
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq}
+
+
+def pandas_filter(predicates):
+    df = data_utils.get_dataset("team_data")
+    mask = np.ones(len(df), dtype=bool)
+    for metric, op, value in predicates:
+        mask &= OPERATORS[op](df[metric], value).to_numpy()
+    return sorted(df.loc[mask, 'team'])
+
+
+@pytest.mark.parametrize("predicates", [
+    (('possession', '>', 55.0),),
+    (('possession', '>=', 50.0), ('gk_save_pct', '<', 70.0)),
+    (('goals_per90', '<=', 1.0), ('shots_per90', '>', 10.0)),
+    (('games', '==', 7.0),),
+    (('possession', '>', 100.0),),
+])
+def test_filter_teams_matches_pandas(predicates):
+    assert sorted(filter_engine.filter_teams(predicates)) == pandas_filter(predicates)
+
+
+def test_boundaries_match_pandas_on_every_value():
+    df = data_utils.get_dataset("team_data")
+    for value in df['possession'].dropna().unique()[:10]:
+        for op in OPERATORS:
+            predicates = (('possession', op, float(value)),)
+            assert sorted(filter_engine.filter_teams(predicates)) == pandas_filter(predicates)
+
+
+def test_parse_expression():
+    assert filter_engine.parse_expression("possession > 55 and gk_save_pct <= 70.5") == (
+        ('possession', '>', 55.0), ('gk_save_pct', '<=', 70.5)
+    )
+    assert filter_engine.parse_expression("  ") == ()
+    with pytest.raises(ValueError):
+        filter_engine.parse_expression("not_a_metric > 1")
+    with pytest.raises(ValueError):
+        filter_engine.parse_expression("possession >> 1")
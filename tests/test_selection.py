@@ -0,0 +1,36 @@
+from app.components import radar_engine, selection
+from app.components.pcp import range_pairs
+
+
+def test_bitset_round_trips():
+    universe = selection.Universe(["a", "b", "c", "d", "e", "f", "g", "h", "i"])
+    bits = universe.bits(["b", "i", "unknown"])
+    assert universe.names(bits) == ["b", "i"]
+    assert universe.from_mask(universe.mask(bits)) == bits
+    assert universe.from_ids(universe.ids(bits)) == bits
+    assert selection.decode(selection.encode(bits)) == bits
+    assert selection.intersect(None, bits, universe.bits(["i"])) == universe.bits(["i"])
+    assert selection.intersect(None, None) is None
+
+
+def test_players_of_teams():
+    teams = selection.get_universe("team")
+    players = selection.get_universe("player")
+    names = players.names(selection.players_of(teams.bits(["Argentina", "France"])))
+    assert names
+    assert {team for _, team in names} == {"Argentina", "France"}
+    assert len(names) == sum(team in ("Argentina", "France") for _, team in players.keys)
+
+
+def test_every_radar_row_has_a_player_id():
+    for kind in ("player", "player_position", "goalkeeper"):
+        engine = radar_engine.get_engine(kind)
+        assert (engine.player_ids >= 0).all()
+        everyone = selection.rows_in(engine.player_ids, selection.get_universe("player").all)
+        assert everyone.all()
+
+
+def test_brush_range_pairs():
+    assert range_pairs(None) == []
+    assert range_pairs([1, 2]) == [[1, 2]]
+    assert range_pairs([[1, 2], [3.5, 4]]) == [[1, 2], [3.5, 4]]
@@ -0,0 +1,44 @@
+import math
+
+import plotly.graph_objects as go
+
+from app.components import serialization
+
+
+def test_significant_digits_follow_the_tick_format():
+    guard = serialization.GUARD_DIGITS
+    assert serialization.significant_digits(".1f", [12.34, 56.78]) == 3 + guard
+    assert serialization.significant_digits(".2f", [0.051, 0.12]) == 2 + guard
+    assert serialization.significant_digits(".3s", [123456.0]) == 3 + guard
+    assert serialization.significant_digits(".1%", [0.523]) == 3 + guard
+
+
+def test_round_keeps_significant_digits_and_gaps():
+    rounded = serialization._round([123.456, 0.0123456, 0.0, None], 3)
+    assert rounded[:3] == [123.0, 0.0123, 0.0]
+    assert math.isnan(rounded[3])
+
+
+def test_trim_figure_skips_non_string_meta():
+    fig = go.Figure([
+        go.Scatterpolar(r=[12.3456, 45.6789], meta="score"),
+        go.Scatter(y=[1.23456], meta=["score", "extra"]),
+    ])
+    serialization.trim_figure(fig, {"score": ".1f"})
+    digits = serialization.significant_digits(".1f", [45.6789])
+    assert list(fig.data[0].r) == [round(12.3456, digits - 2), round(45.6789, digits - 2)]
+    assert list(fig.data[1].y) == [1.23456]
+
+
+def test_radar_patch_traces_are_trimmed(monkeypatch):
+    from app.components import radar_engine
+
+    monkeypatch.setattr(serialization, "FAST_SERIALIZE", True)
+    engine = radar_engine.get_engine("team")
+    patch = engine.patch_traces([0], [0, 1], {"score": ".1f"})
+    inserted = [op["params"]["value"] for op in patch.to_plotly_json()["operations"] if op["operation"] == "Insert"]
+    assert inserted
+    for trace in inserted:
+        if trace.get("meta") == "score":
+            r = [v for v in trace["r"] if v is not None]
+            assert r == serialization._round(r, serialization.significant_digits(".1f", r))
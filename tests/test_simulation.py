@@ -0,0 +1,33 @@
+import numpy as np
+
+from app.components import simulation
+
+
+def test_format_is_inferred_from_the_matches():
+    model = simulation.get_model()
+    assert [len(group) for group in model.groups] == [4] * 8
+    assert sorted(np.concatenate(model.groups).tolist()) == list(range(len(model.teams)))
+
+    stages = [stage for _, stage, _, _ in model.knockout]
+    assert stages == [2] * 8 + [3] * 4 + [4] * 2 + [5, 6]
+    # The round of 16 pairs every group winner with a runner-up
+    feeders = [feeder for _, stage, *pair in model.knockout if stage == 2 for feeder in pair]
+    assert sorted(key for _, key in feeders) == sorted((g, p) for g in range(8) for p in range(2))
+    # The third-place match is between the semi-final losers
+    _, _, home, away = model.knockout[-2]
+    assert home[0] == away[0] == 'loser'
+
+
+def test_stage_probabilities_add_up():
+    probabilities = simulation.simulate(runs=2000, seed=1)
+    totals = probabilities.drop(columns='team').sum()
+    expected = {'round_of_16': 16, 'quarter_finals': 8, 'semi_finals': 4, 'third_place': 4, 'final': 2, 'champion': 1}
+    for column, total in expected.items():
+        assert np.isclose(totals[column], total)
+    assert (probabilities['champion'] <= probabilities['final']).all()
+
+
+def test_results_only_depend_on_the_seed():
+    first = simulation.simulate(runs=3000, seed=7)
+    second = simulation.simulate(runs=3000, seed=7)
+    assert first.equals(second)
@@ -0,0 +1,4 @@
+def test_app_imports():
+    import app.main
+
+    assert app.main.app.layout is not None
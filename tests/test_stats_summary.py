@@ -0,0 +1,35 @@
+import numpy as np
+
+from app.components import data_utils, selection, stats_summary, timeline
+
+
+def test_box_selection_points_carry_team_ids():
+    points = {"points": [{"customdata": [0]}, {"customdata": 26}, {"x": 1}]}
+    assert selection.point_ids(points) == [0, 26]
+    assert selection.point_ids(None) == []
+
+
+def test_team_rows_are_indexed_by_team_id():
+    metrics, cells = stats_summary.get_team_rows()
+    universe = selection.get_universe("team")
+    df = data_utils.get_dataset("team_data").set_index("team")
+    i = universe.index["Spain"]
+    for metric, column in zip(metrics, cells):
+        value = df.loc["Spain", metric]
+        text = column[i][0]
+        if np.isnan(value):
+            assert text == "N/A"
+        else:
+            assert float(text.rstrip("%")) == round(value, 1 if "pct" in metric else 2)
+
+
+def test_team_rows_follow_the_timeline():
+    as_of = 20
+    metrics, cells = stats_summary.get_team_rows(as_of)
+    df = timeline.team_data_as_of(as_of).set_index("team")
+    i = selection.get_universe("team").index["Spain"]
+    column = cells[metrics.index("goals_per90")]
+    assert float(column[i][0]) == round(df.loc["Spain", "goals_per90"], 2)
+
+    last = len(timeline.get_timeline().kickoffs) - 1
+    assert stats_summary.get_team_rows(last) is stats_summary.get_team_rows()
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.components import data_utils, timeline
+
+# Largest difference from the team CSV at the last kickoff. The CSV rounds
+# xG to 0.1 per team and minutes_90s to 0.1, which the per-90 rates do not use.
+TOLERANCES = {
+    'games': 0.0,
+    'minutes': 0.0,
+    'goals': 0.0,
+    'crosses': 0.0,
+    'possession': 0.1,
+    'goals_per90': 0.01,
+    'xg_per90': 0.05,
+    'xg_net': 0.25,
+    'shots_per90': 0.01,
+    'shots_on_target_per90': 0.01,
+    'gk_save_pct': 0.01,
+}
+
+
+@pytest.fixture(scope="module")
+def final_frames():
+    last = len(timeline.get_timeline().kickoffs) - 1
+    derived = timeline._team_data_as_of(last).set_index('team')
+    return derived, data_utils.get_dataset("team_data").set_index('team')
+
+
+@pytest.mark.parametrize("column", sorted(TOLERANCES))
+def test_last_kickoff_matches_team_csv(final_frames, column):
+    derived, csv = final_frames
+    difference = (derived[column] - csv.loc[derived.index, column]).abs()
+    assert difference.max() <= TOLERANCES[column]
+
+
+def test_shootout_matches_count_goals_and_extra_time():
+    table = timeline.get_timeline()
+    sums, counts, games = table.totals(len(table.kickoffs) - 1)
+    i = table.team_index["Argentina"]
+    # 2-2 with the Netherlands and 3-3 with France went to penalties
+    assert sums['goals_for'][i] == 15
+    assert np.isclose(sums['minutes_90s'][i], 7 + 2 * timeline.EXTRA_TIME_90S)
+
+
+def test_rates_hold_after_a_team_is_knocked_out():
+    table = timeline.get_timeline()
+    last = len(table.kickoffs) - 1
+    knocked_out = table.kickoff_index(timeline.matches.get_match_table().frame.query("team == 'Spain'")['match_time'].max())
+    values = [timeline.team_data_as_of(k).set_index('team').loc['Spain', 'goals_per90'] for k in (knocked_out, last - 1, last)]
+    assert np.allclose(values, values[-1], atol=0.01)
+
+
+def test_before_first_kickoff_is_empty():
+    sums, counts, games = timeline.get_timeline().totals(-1)
+    assert not games.any()
+    assert not np.any(sums['goals_for'])
@@ -5,7 +5,8 @@ Deployment entry point for the FIFA World Cup 2022 Visualization Dashboard
 # Import the Dash app from the app package
 from app.main import app
 
-# This is used by gunicorn in production
+# This is used by gunicorn in production (compression/ETag middleware is
+# registered on it in app/main.py)
 server = app.server
 
 # For local development